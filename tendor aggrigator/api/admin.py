@@ -0,0 +1,19 @@
+"""
+Admin token shared by the /admin endpoints and the request profiler.
+
+Set ADMIN_TOKEN and send it as `X-Admin-Token: <token>` (`X-Profile: <token>`
+for profiling). Without ADMIN_TOKEN the admin endpoints answer 404, as if they
+did not exist, and profiling stays off.
+"""
+import hmac
+import os
+from typing import Optional
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+def admin_authorized(supplied: Optional[str], token: str) -> bool:
+    """Compare a supplied token with the admin token in constant time."""
+    if not token or not supplied:
+        return False
+    # Bytes: compare_digest rejects non-ASCII str arguments with a TypeError
+    return hmac.compare_digest(supplied.encode(), token.encode())
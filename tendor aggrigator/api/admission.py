@@ -0,0 +1,151 @@
+"""
+Admission control per route class.
+
+Requests are grouped into classes (interactive reads, heavy exports, dataset
+statistics), each with its own concurrency limit and a short bounded queue.
+A request that finds the queue full is rejected with 429; one that waits
+longer than the queue timeout is rejected with 503. Both carry Retry-After.
+This keeps a pile of exports from taking every threadpool thread and
+database connection that /tenders/search needs.
+
+Each class is configured with ADMISSION_<CLASS>_LIMIT, _QUEUE, _TIMEOUT and
+_RETRY_AFTER (seconds); ADMISSION_ENABLED=0 turns the middleware off.
+Limits apply per worker process.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from metrics import ADMISSION_ACTIVE, ADMISSION_LIMIT, ADMISSION_QUEUED, ADMISSION_REJECTED, ADMISSION_WAIT
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# (limit, queue size, queue timeout seconds, Retry-After seconds)
+DEFAULT_LIMITS = {
+    "interactive": (64, 128, 2.0, 1),
+    "stats": (4, 16, 5.0, 5),
+    "export": (2, 4, 30.0, 30),
+}
+
+def classify(method: str, path: str) -> Optional[str]:
+    """
+    Map a request to its route class.
+
+    Returns:
+        'interactive', 'stats', 'export', or None for unlimited routes
+        (health, metrics, admin, job polling)
+    """
+    if path in ("/export", "/export/big") or (path.startswith("/export/jobs/") and path.endswith("/download")):
+        return "export"
+    if path in ("/stats", "/tenders/facets"):
+        return "stats"
+    if path == "/tenders" or path.startswith("/tenders/"):
+        return "interactive"
+    return None
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded, time-limited wait queue."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        ADMISSION_LIMIT.set(limit, route_class=name)
+
+    @classmethod
+    def from_env(cls, name: str) -> "AdmissionLimiter":
+        limit, queue_size, queue_timeout, retry_after = DEFAULT_LIMITS[name]
+        prefix = f"ADMISSION_{name.upper()}_"
+        return cls(
+            name,
+            int(os.getenv(prefix + "LIMIT", str(limit))),
+            int(os.getenv(prefix + "QUEUE", str(queue_size))),
+            float(os.getenv(prefix + "TIMEOUT", str(queue_timeout))),
+            int(os.getenv(prefix + "RETRY_AFTER", str(retry_after))),
+        )
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Wait for a slot.
+
+        Returns:
+            None once admitted, otherwise the rejection reason
+            ('queue_full' or 'timeout')
+        """
+        if self._semaphore is None:
+            # Created on first use so it binds to the server's event loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                return "queue_full"
+            self.waiting += 1
+            ADMISSION_QUEUED.inc(route_class=self.name)
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                return "timeout"
+            finally:
+                self.waiting -= 1
+                ADMISSION_QUEUED.dec(route_class=self.name)
+            ADMISSION_WAIT.observe(time.perf_counter() - started, route_class=self.name)
+        else:
+            await self._semaphore.acquire()
+            ADMISSION_WAIT.observe(0.0, route_class=self.name)
+        self.active += 1
+        ADMISSION_ACTIVE.inc(route_class=self.name)
+        return None
+
+    def release(self):
+        self.active -= 1
+        ADMISSION_ACTIVE.dec(route_class=self.name)
+        self._semaphore.release()
+
+class AdmissionMiddleware:
+    """ASGI middleware applying AdmissionLimiter per route class."""
+
+    def __init__(self, app, limiters: Optional[Dict[str, AdmissionLimiter]] = None):
+        self.app = app
+        self.limiters = limiters if limiters is not None else {
+            name: AdmissionLimiter.from_env(name) for name in DEFAULT_LIMITS
+        }
+
+    async def __call__(self, scope, receive, send):
+        route_class = classify(scope.get("method", ""), scope.get("path", "")) if scope["type"] == "http" else None
+        limiter = self.limiters.get(route_class) if route_class else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await limiter.acquire()
+        if reason is not None:
+            ADMISSION_REJECTED.inc(route_class=route_class, reason=reason)
+            await self._reject(send, limiter, reason)
+            return
+        try:
+            # The slot is held until the response body (streams included) is sent
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    @staticmethod
+    async def _reject(send, limiter: AdmissionLimiter, reason: str):
+        status = 429 if reason == "queue_full" else 503
+        body = json.dumps({"detail": f"Server busy ({limiter.name} requests); retry later"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(limiter.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,174 @@
+"""
+In-process result cache for tender search responses.
+
+Entries are evicted least-recently-used first once the total size passes a
+byte cap, expire after a TTL, and are all dropped when the ingest generation
+changes.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from db.query import TEXT_FILTER_FIELDS, parse_deadline
+from api.search_index import tokenize
+
+class ResultCache:
+    """LRU + TTL cache bounded by the approximate encoded size of its values."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Upper bound on the summed size of cached values
+            ttl: Seconds an entry stays valid
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _sync_generation(self, generation: int):
+        # Caller holds the lock
+        if generation != self._generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._generation = generation
+
+    def get(self, key: Hashable, generation: int) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+            generation: Current ingest generation
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            self._sync_generation(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: int, size: Optional[int] = None):
+        """
+        Store a value, evicting least-recently-used entries to stay under max_bytes.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            generation: Ingest generation the value was computed from
+            size: Size of the value in bytes, if the caller already knows it
+        """
+        if size is None:
+            size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if self._generation is not None and generation < self._generation:
+                # Computed from data that has since been re-ingested
+                return
+            self._sync_generation(generation)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and configuration for the admin endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "policy": "lru+ttl",
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "generation": self._generation,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+def make_search_key(filters: Dict[str, Any], query: Optional[str] = None, **extra: Any) -> Tuple:
+    """
+    Normalize a search request into a hashable cache key.
+
+    Text filters are case-folded (matching is case-insensitive), the query
+    is tokenized like the keyword search index, numbers are
+    coerced to float and deadlines to datetimes, so equivalent requests
+    share an entry.
+
+    Args:
+        filters: Search filters (same keys as filter_tenders)
+        query: Optional keyword query
+        **extra: Other parameters that change the response (limit, cursor, ...)
+
+    Returns:
+        Tuple usable as a cache key
+    """
+    normalized = {}
+    for name, value in filters.items():
+        if value is None or value == "":
+            continue
+        if name in TEXT_FILTER_FIELDS:
+            normalized[name] = str(value).lower()
+        elif name in ("min_value", "max_value"):
+            normalized[name] = float(value)
+        elif name in ("deadline_from", "deadline_to"):
+            # Unparseable deadlines are ignored by the search, so key them as absent
+            deadline = parse_deadline(value)
+            if deadline is not None:
+                normalized[name] = deadline
+        else:
+            normalized[name] = value
+    if query:
+        normalized["query"] = " ".join(tokenize(query))
+    for name, value in extra.items():
+        if value is not None:
+            normalized[name] = value
+    return tuple(sorted(normalized.items()))
+
+search_cache = ResultCache(
+    max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", "300")),
+)
@@ -0,0 +1,282 @@
+"""
+Content-encoding negotiation for API responses and export downloads.
+
+JSON / NDJSON responses are compressed on the fly by CompressionMiddleware
+(gzip always; brotli and zstd when the optional `brotli` / `zstandard`
+packages are installed). Export files are compressed once on disk next to
+the original and served from there by precompressed_file_response.
+"""
+import os
+import tempfile
+import threading
+import zlib
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Server preference when the client ranks several encodings equally
+ENCODING_PREFERENCE = ["br", "zstd", "gzip"]
+
+# File suffix for pre-compressed export artifacts
+ENCODING_SUFFIXES = {"gzip": ".gz", "br": ".br", "zstd": ".zst"}
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# Responses smaller than this are sent uncompressed
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# On-the-fly levels favour speed; pre-compressed files are written once, so favour ratio
+DYNAMIC_LEVELS = {
+    "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    "br": int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5")),
+    "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+}
+STATIC_LEVELS = {
+    "gzip": int(os.getenv("COMPRESSION_STATIC_GZIP_LEVEL", "9")),
+    "br": int(os.getenv("COMPRESSION_STATIC_BROTLI_QUALITY", "9")),
+    "zstd": int(os.getenv("COMPRESSION_STATIC_ZSTD_LEVEL", "19")),
+}
+
+def available_encodings():
+    """Encodings this process can produce, in server preference order."""
+    encodings = []
+    for encoding in ENCODING_PREFERENCE:
+        if encoding == "br" and brotli is None:
+            continue
+        if encoding == "zstd" and zstandard is None:
+            continue
+        encodings.append(encoding)
+    return encodings
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best content-encoding for an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        'br', 'zstd' or 'gzip', or None to send the response uncompressed
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+def is_compressible(media_type: Optional[str]) -> bool:
+    """Check whether a media type benefits from compression."""
+    return bool(media_type) and media_type.startswith(COMPRESSIBLE_TYPES)
+
+class Encoder:
+    """Incremental compressor with a common interface across codecs."""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """
+        Compress a chunk.
+
+        Args:
+            data: Uncompressed bytes
+            flush: Emit everything buffered so far (for streamed responses)
+
+        Returns:
+            Compressed bytes (may be empty)
+        """
+        if self.encoding == "gzip":
+            out = self._compressor.compress(data)
+            return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            return out + self._compressor.flush() if flush else out
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else out
+
+    def finish(self) -> bytes:
+        """Terminate the compressed stream."""
+        if self.encoding == "gzip":
+            return self._compressor.flush()
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses JSON and NDJSON responses."""
+
+    def __init__(self, app, min_size: int = MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, encoding, self.min_size)(scope, receive, send)
+
+class _CompressionResponder:
+    def __init__(self, app, encoding: str, min_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.min_size = min_size
+        self.start_message = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk tells us the size
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if ("content-encoding" in headers
+                    or self.start_message["status"] in (204, 304)
+                    or not is_compressible(headers.get("content-type"))
+                    or (not more_body and len(body) < self.min_size)):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.encoder = Encoder(self.encoding, DYNAMIC_LEVELS[self.encoding])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["content-length"]
+            data = self.encoder.compress(body, flush=more_body)
+            if not more_body:
+                data += self.encoder.finish()
+                headers["Content-Length"] = str(len(data))
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        data = self.encoder.compress(body, flush=more_body)
+        if not more_body:
+            data += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+_precompress_locks: Dict[str, threading.Lock] = {}
+_precompress_locks_guard = threading.Lock()
+
+def ensure_precompressed(filepath: str, encoding: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compress a file once next to the original (e.g. export.json.gz).
+    The copy is rebuilt only when the original is newer.
+
+    Args:
+        filepath: Path of the uncompressed file
+        encoding: 'gzip', 'br' or 'zstd'
+        chunk_size: Bytes read per compression step
+
+    Returns:
+        Path of the compressed file
+    """
+    target = filepath + ENCODING_SUFFIXES[encoding]
+    with _precompress_locks_guard:
+        lock = _precompress_locks.setdefault(target, threading.Lock())
+    with lock:
+        if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(filepath):
+            return target
+        encoder = Encoder(encoding, STATIC_LEVELS[encoding])
+        # Unique temp name: other worker processes may compress the same file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target) or ".", suffix=".tmp")
+        try:
+            with open(filepath, "rb") as source, os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    out.write(encoder.compress(chunk))
+                out.write(encoder.finish())
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return target
+
+def remove_export(filepath: str):
+    """Delete an export file together with its pre-compressed copies."""
+    for path in [filepath] + [filepath + suffix for suffix in ENCODING_SUFFIXES.values()]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def precompressed_file_response(request: Request, filepath: str, media_type: str, filename: str) -> FileResponse:
+    """
+    Serve a file, using a pre-compressed copy when the client accepts one.
+
+    Args:
+        request: Incoming request (for Accept-Encoding)
+        filepath: Path of the uncompressed file
+        media_type: Media type of the uncompressed content
+        filename: Download filename
+
+    Returns:
+        FileResponse for the original or the compressed copy
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None or not is_compressible(media_type) or os.path.getsize(filepath) < MIN_SIZE:
+        return FileResponse(filepath, media_type=media_type, filename=filename)
+    compressed_path = ensure_precompressed(filepath, encoding)
+    return FileResponse(
+        compressed_path,
+        media_type=media_type,
+        filename=filename,
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+    )
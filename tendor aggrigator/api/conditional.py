@@ -0,0 +1,73 @@
+"""
+Conditional request handling (ETag / Last-Modified) tied to the ingest generation.
+
+Tender data only changes when main.py re-ingests, so every read endpoint can
+be validated against the dataset generation alone.
+"""
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict
+
+from fastapi import Request, Response
+
+from db.generation import DatasetVersion
+
+def validator_headers(version: DatasetVersion) -> Dict[str, str]:
+    """
+    Build the ETag / Last-Modified headers for a dataset version.
+
+    Args:
+        version: Current dataset version
+
+    Returns:
+        Dictionary of response headers
+    """
+    headers = {"ETag": f'W/"tenders-{version.generation}"'}
+    if version.updated_at is not None:
+        headers["Last-Modified"] = format_datetime(version.updated_at.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def is_not_modified(request: Request, version: DatasetVersion) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the dataset version.
+    If-Modified-Since is only consulted when If-None-Match is absent.
+
+    Args:
+        request: Incoming request
+        version: Current dataset version
+
+    Returns:
+        True if the client's copy is still current
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return _etag_matches(if_none_match, validator_headers(version)["ETag"])
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and version.updated_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return version.updated_at.replace(microsecond=0) <= since
+    return False
+
+def not_modified_response(version: DatasetVersion) -> Response:
+    """Empty 304 response carrying the current validators."""
+    return Response(status_code=304, headers=validator_headers(version))
@@ -1,98 +1,205 @@
 """
 Filter and ranking logic for tenders.
 """
-from typing import List, Dict, Any
+import functools
+import heapq
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
 from datetime import datetime
 from db.models import Tender
+from db.query import TEXT_FILTER_FIELDS
+from metrics import STAGE_DURATION
+from api.search_index import InvertedIndex
 
-def filter_tenders(tenders: List[Dict], filters: Dict[str, Any]) -> List[Dict]:
+# Distinct field values whose lowercased / parsed form is memoized
+FIELD_CACHE_SIZE = 65536
+
+DEADLINE_FILTERS = ("deadline_from", "deadline_to")
+
+@functools.lru_cache(maxsize=FIELD_CACHE_SIZE)
+def _folded(text: str) -> str:
+    return text.lower()
+
+@functools.lru_cache(maxsize=FIELD_CACHE_SIZE)
+def _parsed_deadline(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+def _tender_deadline(tender: Dict) -> datetime:
+    deadline = tender["deadline"]
+    return _parsed_deadline(deadline) if isinstance(deadline, str) else deadline
+
+def _text_predicate(field: str, needle: str) -> Callable[[Dict], bool]:
+    return lambda t: needle in _folded(t[field])
+
+def _range_predicate(value_of: Callable[[Dict], Any], lower: Any, upper: Any) -> Callable[[Dict], bool]:
+    if lower is not None and upper is not None:
+        return lambda t: lower <= value_of(t) <= upper
+    if lower is not None:
+        return lambda t: value_of(t) >= lower
+    return lambda t: value_of(t) <= upper
+
+def compile_filters(filters: Dict[str, Any]) -> List[Callable[[Dict], bool]]:
     """
-    Filter tenders based on provided criteria.
+    Compile filter criteria into predicates, most selective first.
+    
+    Bounds are converted once here instead of once per tender. Substring
+    filters usually narrow the results most (longer strings more so), then
+    the deadline window, then the value range. Each range becomes a single
+    check, so a tender's deadline is parsed once for both bounds.
     
     Args:
-        tenders: List of tender dictionaries
         filters: Dictionary containing filter criteria
         
     Returns:
-        Filtered list of tenders
+        Predicates a tender must all satisfy
     """
-    filtered = tenders
+    text = []
+    for field in TEXT_FILTER_FIELDS:
+        if field in filters:
+            needle = filters[field].lower()
+            if needle:
+                text.append((len(needle), _text_predicate(field, needle)))
+    predicates = [predicate for _, predicate in sorted(text, key=lambda item: -item[0])]
     
-    # Filter by organization
-    if "organization" in filters:
-        org_filter = filters["organization"].lower()
-        filtered = [t for t in filtered if org_filter in t["organization"].lower()]
+    # Invalid date formats skip that bound, as before
+    bounds = []
+    for name in DEADLINE_FILTERS:
+        try:
+            bounds.append(datetime.fromisoformat(filters[name]) if name in filters else None)
+        except ValueError:
+            bounds.append(None)
+    if bounds != [None, None]:
+        predicates.append(_range_predicate(_tender_deadline, *bounds))
     
-    # Filter by category
-    if "category" in filters:
-        cat_filter = filters["category"].lower()
-        filtered = [t for t in filtered if cat_filter in t["category"].lower()]
+    min_val = float(filters["min_value"]) if "min_value" in filters else None
+    max_val = float(filters["max_value"]) if "max_value" in filters else None
+    if min_val is not None or max_val is not None:
+        predicates.append(_range_predicate(lambda t: t["value"], min_val, max_val))
     
-    # Filter by location
-    if "location" in filters:
-        loc_filter = filters["location"].lower()
-        filtered = [t for t in filtered if loc_filter in t["location"].lower()]
+    return predicates
+
+def _matches(tender: Dict, predicates: List[Callable[[Dict], bool]]) -> bool:
+    for predicate in predicates:
+        if not predicate(tender):
+            return False
+    return True
+
+@STAGE_DURATION.timed(stage="filter")
+def filter_tenders(tenders: List[Dict], filters: Dict[str, Any],
+                   indexes: Optional[List[Any]] = None) -> List[Dict]:
+    """
+    Filter tenders based on provided criteria, in a single pass.
     
-    # Filter by value range
-    if "min_value" in filters:
-        min_val = float(filters["min_value"])
-        filtered = [t for t in filtered if t["value"] >= min_val]
+    Args:
+        tenders: List of tender dictionaries
+        filters: Dictionary containing filter criteria
+        indexes: Indexes over `tenders` (row numbers are list positions),
+            e.g. MockCollection.indexes. The filters an index answers are
+            resolved to candidate rows, which are intersected, with the
+            database semantics: tenders without a parseable deadline or a
+            value never match a range on it, and missing text never matches.
+        
+    Returns:
+        Filtered list of tenders
+    """
+    rows, answered = None, set()
+    for index in indexes or ():
+        candidates = index.candidate_rows(filters)
+        if candidates is None:
+            continue
+        answered.update(index.FILTERS)
+        if rows is None:
+            rows = candidates
+        else:
+            keep = set(candidates)
+            rows = [row for row in rows if row in keep]
+    if rows is not None:
+        tenders = [tenders[row] for row in rows]
+        filters = {name: value for name, value in filters.items() if name not in answered}
     
-    if "max_value" in filters:
-        max_val = float(filters["max_value"])
-        filtered = [t for t in filtered if t["value"] <= max_val]
+    predicates = compile_filters(filters)
+    if not predicates:
+        return list(tenders)
     
-    # Filter by deadline
-    if "deadline_from" in filters:
+    filtered = []
+    for tender in tenders:
         try:
-            deadline_from = datetime.fromisoformat(filters["deadline_from"])
-            filtered = [t for t in filtered if datetime.fromisoformat(t["deadline"]) >= deadline_from]
+            if _matches(tender, predicates):
+                filtered.append(tender)
         except ValueError:
-            pass  # Invalid date format, skip filter
+            # A tender deadline that does not parse disables the deadline
+            # filters, but only if the tender passes the other filters
+            remaining = {name: value for name, value in filters.items() if name not in DEADLINE_FILTERS}
+            if _matches(tender, compile_filters(remaining)):
+                return filter_tenders(tenders, remaining)
+    return filtered
+
+def get_deadline(tender: Dict) -> datetime:
+    """Return a tender's deadline as a datetime (handles both strings and datetimes)."""
+    return _tender_deadline(tender)
+
+def ranking_key(tender: Dict, score: Optional[float] = None) -> Tuple:
+    """
+    Total ordering key matching rank_tenders, with tender_id as tie-breaker.
+    Used to build keyset pagination cursors over ranked results.
     
-    if "deadline_to" in filters:
-        try:
-            deadline_to = datetime.fromisoformat(filters["deadline_to"])
-            filtered = [t for t in filtered if datetime.fromisoformat(t["deadline"]) <= deadline_to]
-        except ValueError:
-            pass  # Invalid date format, skip filter
+    Args:
+        tender: Tender dictionary
+        score: BM25 score of the tender for a keyword query, if any
+        
+    Returns:
+        (deadline, tender_id), or (-score, deadline, tender_id) with a score
+    """
+    key = (get_deadline(tender), str(tender.get("tender_id", "")))
+    if score is not None:
+        return (-score,) + key
+    return key
+
+def top_k(tenders: Iterable[Dict], key: Callable[[Dict], Tuple], limit: Optional[int] = None,
+          after: Optional[Tuple] = None) -> List[Dict]:
+    """
+    Order tenders by key, computing each tender's key once.
     
-    return filtered
+    With a limit only the first `limit` tenders are kept, using a bounded
+    heap: O(n log k) instead of sorting all n.
+    
+    Args:
+        tenders: Tenders to order
+        key: Sort key (ascending)
+        limit: Maximum number of tenders to return
+        after: Only tenders whose key is greater than this (keyset cursor)
+        
+    Returns:
+        Ordered list of tenders
+    """
+    # The position breaks ties between equal keys so dicts are never compared
+    decorated = ((key(tender), position, tender) for position, tender in enumerate(tenders))
+    if after is not None:
+        decorated = (item for item in decorated if item[0] > after)
+    if limit is None:
+        return [tender for _, _, tender in sorted(decorated)]
+    return [tender for _, _, tender in heapq.nsmallest(limit, decorated)]
 
-def rank_tenders(tenders: List[Dict], query: str = "") -> List[Dict]:
+@STAGE_DURATION.timed(stage="rank")
+def rank_tenders(tenders: List[Dict], query: str = "", index: Optional[InvertedIndex] = None,
+                 limit: Optional[int] = None) -> List[Dict]:
     """
     Rank tenders by deadline (soonest first) and optionally by keyword match.
     
     Args:
         tenders: List of tender dictionaries
-        query: Optional search query for keyword matching
+        query: Optional search query, scored with BM25
+        index: Search index to score against; built from `tenders` if omitted
+        limit: Only return the top `limit` tenders
         
     Returns:
         Ranked list of tenders
     """
-    # Sort by deadline (soonest first)
-    # Handle both string and datetime objects
-    def get_deadline(tender):
-        deadline = tender["deadline"]
-        if isinstance(deadline, str):
-            return datetime.fromisoformat(deadline)
-        return deadline
-    
-    ranked = sorted(tenders, key=get_deadline)
+    if not query:
+        return top_k(tenders, ranking_key, limit)
     
-    # If query provided, rank by keyword match
-    if query:
-        query_words = query.lower().split()
-        
-        def keyword_score(tender):
-            score = 0
-            text = f"{tender['organization']} {tender['category']} {tender['location']} {tender['description']}".lower()
-            for word in query_words:
-                if word in text:
-                    score += 1
-            return score
-        
-        # Sort by keyword score (higher first), then by deadline
-        ranked = sorted(ranked, key=lambda t: (-keyword_score(t), get_deadline(t)))
+    if index is None:
+        index = InvertedIndex.build(tenders)
+    scores = index.scores(query)
     
-    return ranked
\ No newline at end of file
+    # Higher score first, then by deadline
+    return top_k(tenders, lambda t: ranking_key(t, scores.get(str(t.get("tender_id", "")), 0.0)), limit)
@@ -0,0 +1,193 @@
+"""
+Columnar in-memory copy of the tenders for fast filtering.
+
+TenderFrame keeps the tenders sorted by (deadline, tender_id) next to a few
+NumPy columns: value as float64, deadline as int64 microseconds since the
+epoch, and organization, category and location dictionary-encoded as integer
+codes into their distinct values. A search becomes a handful of vectorized
+boolean masks; substring filters are checked once per distinct value and
+then broadcast to the rows through the codes.
+
+The frame is loaded from the database once per ingest generation and serves
+/tenders/search and /stats, so those requests do not touch the database.
+It needs the optional `numpy` package; without it (or above
+TENDER_FRAME_MAX_ROWS tenders) requests go to the database as before.
+"""
+import asyncio
+import bisect
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from db.query import TEXT_FILTER_FIELDS, epoch_micros, keyset_key, parse_deadline, project_tender
+
+TENDER_FRAME_ENABLED = os.getenv("TENDER_FRAME_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# Larger datasets are not copied into every worker's memory
+TENDER_FRAME_MAX_ROWS = int(os.getenv("TENDER_FRAME_MAX_ROWS", "200000"))
+
+def frame_enabled() -> bool:
+    """The frame is used when switched on and NumPy is installed."""
+    return TENDER_FRAME_ENABLED and np is not None
+
+class TenderFrame:
+    """Tenders in (deadline, tender_id) order with columnar filter data."""
+
+    def __init__(self, tenders: List[Dict[str, Any]], generation: Optional[int] = None):
+        """
+        Build the columns.
+
+        Args:
+            tenders: Full tender documents
+            generation: Ingest generation the tenders were read at
+        """
+        self.generation = generation
+        # First document as returned by the database, for the /stats field list
+        self.sample = tenders[0] if tenders else None
+        self.records = sorted(tenders, key=keyset_key)
+        self.keys = [keyset_key(tender) for tender in self.records]
+
+        values = [tender.get("value") for tender in self.records]
+        self.value = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+        deadlines = [parse_deadline(tender.get("deadline")) for tender in self.records]
+        self.deadline_valid = np.array([d is not None for d in deadlines], dtype=bool)
+        self.deadline = np.array([epoch_micros(d) if d is not None else 0 for d in deadlines], dtype=np.int64)
+
+        # Dictionary encoding: distinct values plus one code per row
+        self.dictionaries: Dict[str, List[str]] = {}
+        self.codes: Dict[str, Any] = {}
+        for field in TEXT_FILTER_FIELDS:
+            column = [str(tender.get(field) or "") for tender in self.records]
+            dictionary, codes = np.unique(np.array(column, dtype=object), return_inverse=True)
+            self.dictionaries[field] = list(dictionary)
+            self.codes[field] = codes.astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def mask(self, filters: Dict[str, Any]) -> Any:
+        """
+        Boolean row mask for the filters, with the same semantics as the
+        database query builders: case-insensitive substrings, inclusive
+        bounds, unparseable filter deadlines ignored.
+
+        Args:
+            filters: Search filters (same keys as filter_tenders)
+
+        Returns:
+            NumPy boolean array, one entry per row
+        """
+        mask = np.ones(len(self.records), dtype=bool)
+        for field in TEXT_FILTER_FIELDS:
+            needle = filters.get(field)
+            if needle:
+                needle = str(needle).lower()
+                matches = np.fromiter((needle in value.lower() for value in self.dictionaries[field]),
+                                      dtype=bool, count=len(self.dictionaries[field]))
+                mask &= matches[self.codes[field]]
+
+        if filters.get("min_value") is not None:
+            mask &= self.value >= float(filters["min_value"])
+        if filters.get("max_value") is not None:
+            mask &= self.value <= float(filters["max_value"])
+
+        deadline_from = parse_deadline(filters.get("deadline_from"))
+        deadline_to = parse_deadline(filters.get("deadline_to"))
+        if deadline_from is not None or deadline_to is not None:
+            mask &= self.deadline_valid
+            if deadline_from is not None:
+                mask &= self.deadline >= epoch_micros(deadline_from)
+            if deadline_to is not None:
+                mask &= self.deadline <= epoch_micros(deadline_to)
+        return mask
+
+    def search(self, filters: Dict[str, Any], limit: Optional[int] = None, after: Optional[Tuple] = None,
+               fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Matching tenders in (deadline, tender_id) order, like repository.search.
+
+        Args:
+            filters: Search filters
+            limit: Maximum number of tenders
+            after: Keyset cursor; only tenders after this (deadline, tender_id)
+            fields: Fields to keep in each tender
+
+        Returns:
+            List of tenders
+        """
+        mask = self.mask(filters)
+        if after is not None:
+            mask[:bisect.bisect_right(self.keys, tuple(after))] = False
+        rows = np.flatnonzero(mask)
+        if limit is not None:
+            rows = rows[:limit]
+        return [project_tender(self.records[row], fields) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Dataset statistics shaped like repository.stats()."""
+        present = self.value[~np.isnan(self.value)]
+        return {
+            "total_records": len(self.records),
+            "unique_organizations": len(self.dictionaries["organization"]),
+            "unique_categories": len(self.dictionaries["category"]),
+            "unique_locations": len(self.dictionaries["location"]),
+            "max_tender_value": float(present.max()) if present.size else 0,
+            "min_tender_value": float(present.min()) if present.size else 0,
+            "avg_tender_value": float(present.mean()) if present.size else 0,
+            "fields": list(self.sample.keys()) if self.sample else []
+        }
+
+# Process-wide frame, replaced whole on each new generation so readers never
+# see a half-built one
+_frame: Optional[TenderFrame] = None
+_frame_generation: Optional[int] = None
+_load_lock = asyncio.Lock()
+
+async def current_tender_frame(generation: int) -> Optional[TenderFrame]:
+    """
+    Return the frame for the given ingest generation, loading it through the
+    async repository when it is out of date.
+
+    Args:
+        generation: Current ingest generation
+
+    Returns:
+        The TenderFrame, or None if the frame is disabled, the dataset is too
+        large or it could not be loaded (callers then query the database)
+    """
+    global _frame, _frame_generation
+    if not frame_enabled():
+        return None
+    if _frame_generation == generation:
+        return _frame
+    async with _load_lock:
+        if _frame_generation == generation:
+            return _frame
+        from db.async_repository import get_repository
+        repository = await get_repository()
+        if repository is None:
+            return None
+        started = time.perf_counter()
+        tenders = []
+        try:
+            async for tender in repository.iter_search({}):
+                tenders.append(tender)
+                if len(tenders) > TENDER_FRAME_MAX_ROWS:
+                    print(f"Tender frame disabled: more than {TENDER_FRAME_MAX_ROWS} tenders")
+                    tenders = None
+                    break
+        except Exception as e:
+            print(f"Error loading the tender frame: {e}")
+            return None
+        frame = await asyncio.to_thread(TenderFrame, tenders, generation) if tenders is not None else None
+        _frame, _frame_generation = frame, generation
+        if frame is not None:
+            print(f"Tender frame loaded for generation {generation}: {len(frame)} tenders "
+                  f"in {time.perf_counter() - started:.2f}s")
+    return _frame
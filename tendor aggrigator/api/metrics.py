@@ -0,0 +1,43 @@
+"""
+Metrics for the API: re-exports the registry from the top-level `metrics`
+module and adds the ASGI middleware that records per-route HTTP metrics.
+"""
+import time
+
+from metrics import (
+    ADMISSION_ACTIVE, ADMISSION_LIMIT, ADMISSION_QUEUED, ADMISSION_REJECTED, ADMISSION_WAIT, CONTENT_TYPE,
+    DB_CALL_DURATION, DB_CALL_ERRORS, DEFAULT_BUCKETS, EXPORT_BYTES, EXPORT_RECORDS, HTTP_IN_FLIGHT,
+    HTTP_REQUEST_DURATION, HTTP_REQUESTS, REGISTRY, SEARCH_ROWS_RETURNED, SEARCH_ROWS_SCANNED, STAGE_DURATION,
+    Counter, Gauge, Histogram, MetricsRegistry, db_call, render_metrics
+)
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status codes and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # Label by route template (/tenders/{tender_id}), never the raw path
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope.get("method", "")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, route=path, method=method)
+            HTTP_REQUESTS.inc(route=path, method=method, status=str(status["code"]))
@@ -0,0 +1,145 @@
+"""
+Opt-in per-request profiling for the API.
+
+Set PROFILING_ENABLED=1 and ADMIN_TOKEN, then send a request with
+`X-Profile: <token>` (or `?profile=<token>`). A sampling profiler records the
+stacks of every busy thread (the event loop and the threadpool running sync
+handlers and ranking) while that request is served, and writes them to
+PROFILING_DIR in the collapsed-stack format read by flamegraph.pl and
+speedscope. The file name is returned in the X-Profile-File header.
+
+When profiling is disabled the middleware is not installed at all.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+from api.admin import ADMIN_TOKEN, admin_authorized
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0").lower() in ("1", "true", "yes")
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL_MS", "1")) / 1000.0
+
+# Innermost frames of threads that are waiting, not working
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+def profiling_enabled() -> bool:
+    """Profiling needs both the switch and the admin token."""
+    return PROFILING_ENABLED and bool(ADMIN_TOKEN)
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler:
+    """Background thread that samples the stacks of all other threads."""
+
+    def __init__(self, interval: float = PROFILING_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def folded(self) -> str:
+        """Collapsed stacks, one `frame;frame;... count` line each."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def profile_requested(scope: Dict, token: str) -> bool:
+    """Check the X-Profile header or the `profile` query parameter against the admin token."""
+    if not token:
+        return False
+    supplied = ""
+    for name, value in scope.get("headers", []):
+        if name == b"x-profile":
+            supplied = value.decode("latin-1")
+            break
+    if not supplied:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        supplied = query.get("profile", [""])[0]
+    return admin_authorized(supplied, token)
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling one request at a time on demand."""
+
+    def __init__(self, app, token: str = ADMIN_TOKEN, directory: str = PROFILING_DIR,
+                 interval: float = PROFILING_INTERVAL):
+        self.app = app
+        self.token = token
+        self.directory = directory
+        self.interval = interval
+        # Samples cover every thread, so overlapping profiles would mix
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or not profile_requested(scope, self.token)
+                or not self._busy.acquire(blocking=False)):
+            await self.app(scope, receive, send)
+            return
+
+        route = scope.get("path", "").strip("/").replace("/", "_") or "root"
+        filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{route}.folded"
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-file", filename.encode())]
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            sampler.stop()
+            self._busy.release()
+            self._write(filename, sampler)
+
+    def _write(self, filename: str, sampler: StackSampler) -> Optional[str]:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filepath = os.path.join(self.directory, filename)
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(sampler.folded())
+            print(f"Profile written to {filepath} ({sampler.samples} samples)")
+            return filepath
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+            return None
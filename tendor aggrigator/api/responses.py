@@ -0,0 +1,103 @@
+"""
+Response helpers for the Tender Aggregator API.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def json_default(value: Any) -> Any:
+    """JSON fallback for values the encoder cannot handle (ObjectId, Decimal, ...)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact JSON with orjson.
+
+    datetimes are written natively as ISO 8601; ObjectIds become strings.
+
+    Args:
+        value: JSON-serializable value (tenders straight from the database)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(value, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+class TenderJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Returning it directly from a handler skips FastAPI's jsonable_encoder and
+    response_model validation, so rows from the database are encoded as-is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def wants_ndjson(request: Request, stream: Optional[bool] = None) -> bool:
+    """
+    Check whether the client asked for newline-delimited JSON.
+
+    Args:
+        request: Incoming request
+        stream: Value of the `stream` query parameter
+
+    Returns:
+        True for `?stream=1` or an `Accept: application/x-ndjson` header
+    """
+    if stream:
+        return True
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+def ndjson_lines(tenders: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Serialize tenders one per line as they are read from the database.
+
+    Args:
+        tenders: Iterable of tender dictionaries (e.g. a database cursor)
+
+    Yields:
+        One encoded JSON line per tender
+    """
+    for tender in tenders:
+        yield dumps(tender) + b"\n"
+
+async def ndjson_lines_async(tenders: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Async variant of ndjson_lines for async database cursors."""
+    async for tender in tenders:
+        yield dumps(tender) + b"\n"
+
+async def prime_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Pull the first chunk of a stream before the response starts, so errors
+    opening the database cursor still become regular HTTP errors.
+
+    Args:
+        chunks: Async iterator of response chunks
+
+    Returns:
+        Async iterator yielding the same chunks
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def replay():
+        if first is None:
+            return
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return replay()
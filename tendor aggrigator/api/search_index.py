@@ -0,0 +1,205 @@
+"""
+BM25 keyword index for tender search.
+
+An inverted index over the organization, category, location and description
+of every tender maps each token to the tenders containing it and how often.
+A query only reads the posting lists of its own terms, and tokens are whole
+words, so "rail" no longer matches "trail".
+
+The index is synced to the ingest generation: when the generation changes,
+the text fields are re-read and only tenders whose text changed are
+re-tokenized, new tenders are added and removed ones dropped.
+"""
+import asyncio
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from db.query import RANKING_FIELDS
+
+# BM25 term-frequency saturation and document-length normalization
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens (letters and digits)."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+def tender_text(tender: Dict) -> str:
+    """The searchable text of a tender."""
+    return " ".join(str(tender.get(name) or "") for name in RANKING_FIELDS)
+
+class InvertedIndex:
+    """Token -> {tender_id: term frequency} postings with BM25 scoring."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.generation: Optional[int] = None
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_hashes: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, tenders: Iterable[Dict], **kwargs: Any) -> "InvertedIndex":
+        """Build an index over the given tenders."""
+        index = cls(**kwargs)
+        for tender in tenders:
+            index.add(tender)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, tender_id: str) -> bool:
+        return tender_id in self._doc_lengths
+
+    def add(self, tender: Dict):
+        """Index a tender, replacing any earlier version with the same tender_id."""
+        with self._lock:
+            self._add(str(tender.get("tender_id", "")), tender_text(tender))
+
+    def remove(self, tender_id: str):
+        """Drop a tender from the index (no-op if it is not indexed)."""
+        with self._lock:
+            self._remove(tender_id)
+
+    def _add(self, tender_id: str, text: str):
+        # Caller holds the lock
+        self._remove(tender_id)
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, frequency in counts.items():
+            self._postings.setdefault(term, {})[tender_id] = frequency
+        self._doc_terms[tender_id] = tuple(counts)
+        self._doc_lengths[tender_id] = len(tokens)
+        self._doc_hashes[tender_id] = hash(text)
+        self._total_length += len(tokens)
+
+    def _remove(self, tender_id: str):
+        # Caller holds the lock
+        if tender_id not in self._doc_lengths:
+            return
+        for term in self._doc_terms.pop(tender_id):
+            posting = self._postings[term]
+            del posting[tender_id]
+            if not posting:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(tender_id)
+        del self._doc_hashes[tender_id]
+
+    def sync(self, tenders: Iterable[Dict], generation: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Bring the index in line with the current set of tenders. Unchanged
+        tenders keep their postings; only new or edited ones are tokenized.
+
+        Args:
+            tenders: Every tender (at least tender_id and the text fields)
+            generation: Ingest generation the tenders were read at
+
+        Returns:
+            (tenders added or re-indexed, tenders removed)
+        """
+        added = 0
+        with self._lock:
+            seen = set()
+            for tender in tenders:
+                tender_id = str(tender.get("tender_id", ""))
+                text = tender_text(tender)
+                seen.add(tender_id)
+                if self._doc_hashes.get(tender_id) != hash(text):
+                    self._add(tender_id, text)
+                    added += 1
+            stale = [tender_id for tender_id in self._doc_lengths if tender_id not in seen]
+            for tender_id in stale:
+                self._remove(tender_id)
+            self.generation = generation
+        return added, len(stale)
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """
+        BM25 score of every tender matching at least one query term.
+
+        Args:
+            query: Free-text search query
+
+        Returns:
+            Dictionary of tender_id -> score; tenders without a match are absent
+        """
+        scores: Dict[str, float] = {}
+        with self._lock:
+            count = len(self._doc_lengths)
+            if not count:
+                return scores
+            average_length = self._total_length / count or 1.0
+            for term in set(tokenize(query)):
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for tender_id, frequency in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[tender_id] / average_length)
+                    scores[tender_id] = scores.get(tender_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the index, for diagnostics."""
+        with self._lock:
+            return {
+                "generation": self.generation,
+                "documents": len(self._doc_lengths),
+                "terms": len(self._postings),
+                "postings": sum(len(terms) for terms in self._doc_terms.values()),
+            }
+
+# Process-wide index used by /tenders/search
+search_index = InvertedIndex()
+_sync_lock = asyncio.Lock()
+# monotonic() before which a failed sync is not retried
+_retry_at = 0.0
+
+async def current_search_index(generation: int) -> InvertedIndex:
+    """
+    Return the search index synced to the given ingest generation, reading
+    the tenders' text through the async repository when it is out of date.
+
+    After a failed sync the stale index is returned without retrying for
+    DB_RETRY_INTERVAL seconds; callers can tell by its generation.
+
+    Args:
+        generation: Current ingest generation
+
+    Returns:
+        The process-wide InvertedIndex
+    """
+    global _retry_at
+    if search_index.generation == generation or time.monotonic() < _retry_at:
+        return search_index
+    async with _sync_lock:
+        if search_index.generation == generation or time.monotonic() < _retry_at:
+            return search_index
+        from db.async_repository import DB_RETRY_INTERVAL, get_repository
+        repository = await get_repository()
+        if repository is None:
+            _retry_at = time.monotonic() + DB_RETRY_INTERVAL
+            return search_index
+        started = time.perf_counter()
+        try:
+            tenders = [tender async for tender in repository.iter_search({}, fields=["tender_id", *RANKING_FIELDS])]
+        except Exception as e:
+            print(f"Error loading tenders for the search index: {e}")
+            _retry_at = time.monotonic() + DB_RETRY_INTERVAL
+            return search_index
+        added, removed = await asyncio.to_thread(search_index.sync, tenders, generation)
+        print(f"Search index synced to generation {generation}: {added} indexed, {removed} removed, "
+              f"{len(search_index)} tenders in {time.perf_counter() - started:.2f}s")
+    return search_index
@@ -1,100 +1,220 @@
 """
 FastAPI server for Tender Aggregator.
 """
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
+from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from typing import List, Optional, Any
 import os
-from db.connection import get_db, MockMongoDB
+import time
+from db.pool import get_manager
+from db.async_repository import close_repository, get_repository
+from db.indexes import ensure_indexes
+from db.query import (
+    decode_cursor, encode_cursor, keyset_key, order_by_ids, parse_fields, project_tender,
+    KEYSET_FIELDS
+)
+from db.generation import DatasetVersion, current_generation, current_generation_async
+from big_data.export_jobs import ExportJobLimitError, export_jobs
+from nlp.extract import get_nlp
+from api.conditional import is_not_modified, not_modified_response, validator_headers
+from api.admin import ADMIN_TOKEN, admin_authorized
+from api.admission import ADMISSION_ENABLED, AdmissionMiddleware
+from api.cache import make_search_key, search_cache
+from api.compression import CompressionMiddleware, precompressed_file_response, remove_export
+from api.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, SEARCH_ROWS_RETURNED, SEARCH_ROWS_SCANNED,
+    STAGE_DURATION, db_call, render_metrics
+)
+from api.profiling import ProfilingMiddleware, profiling_enabled
+from api.search_index import current_search_index
+from api.frame import current_tender_frame
+from api.responses import NDJSON_MEDIA_TYPE, TenderJSONResponse, dumps, ndjson_lines_async, prime_stream, wants_ndjson
 import uvicorn
 
-app = FastAPI(title="Tender Aggregator API", version="1.0.0")
+# Page sizes for cursor pagination on /tenders and /tenders/search
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 
-def get_tenders_from_db():
-    """Helper function to get tenders from database with proper error handling."""
-    db = get_db()
-    if db is None:
+# Warm caches (and optionally the NLP model) in the lifespan, before serving
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1").lower() in ("1", "true", "yes")
+WARMUP_NLP = os.getenv("WARMUP_NLP", "0").lower() in ("1", "true", "yes")
+
+# Values listed per text facet on /tenders/facets
+DEFAULT_FACET_LIMIT = 50
+
+# Most IDs accepted by one POST /tenders/batch request
+MAX_BATCH_SIZE = int(os.getenv("TENDER_BATCH_MAX", "1000"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the shared database clients on startup and close them on shutdown.
+    Read endpoints use the async repository; exports use the sync pool.
+    """
+    manager = get_manager()
+    await run_in_threadpool(manager.open)
+    with manager.connection() as db:
+        await run_in_threadpool(ensure_indexes, db)
+    await get_repository()
+    if WARMUP_ENABLED:
+        await warm_up()
+    yield
+    export_jobs.shutdown()
+    await close_repository()
+    manager.close()
+
+async def warm_up():
+    """
+    Prime this worker before it accepts traffic: open a connection on the
+    async pool, cache the ingest generation and the unfiltered facets (the
+    search page's first call), build the keyword search index and the
+    tender frame and, with WARMUP_NLP=1, load the spaCy model.
+    """
+    started = time.perf_counter()
+    try:
+        await get_facets_body({}, DEFAULT_FACET_LIMIT)
+        generation = (await current_generation_async()).generation
+        await current_search_index(generation)
+        await current_tender_frame(generation)
+    except Exception as e:
+        print(f"Warmup: could not prime caches: {e}")
+    if WARMUP_NLP:
+        await run_in_threadpool(get_nlp)
+    print(f"Warmup completed in {time.perf_counter() - started:.2f}s")
+
+app = FastAPI(title="Tender Aggregator API", version="1.0.0", lifespan=lifespan,
+              default_response_class=TenderJSONResponse)
+app.add_middleware(CompressionMiddleware)
+# Per route-class concurrency limits, so exports cannot starve interactive reads
+if ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+# Outermost, so latency includes compression
+app.add_middleware(MetricsMiddleware)
+# Only installed when PROFILING_ENABLED and ADMIN_TOKEN are set
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
+async def get_repository_or_500():
+    """Return the async repository, or fail the request if no database is reachable."""
+    repository = await get_repository()
+    if repository is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
+    return repository
+
+async def get_tenders_from_db(limit: Optional[int] = None, after: Optional[tuple] = None,
+                              fields: Optional[List[str]] = None):
+    """Helper function to get tenders from database with proper error handling."""
+    return await search_tenders_in_db({}, limit=limit, after=after, fields=fields)
+
+async def search_tenders_in_db(filters: dict, limit: Optional[int] = None, after: Optional[tuple] = None,
+                               fields: Optional[List[str]] = None, count_scanned: bool = False):
+    """
+    Helper function to get only the tenders matching the filters.
+    Filters are pushed down into MongoDB / PostgreSQL; the Python
+    filter_tenders path is only used for the MockMongoDB fallback.
+    
+    When limit or after is given, results are ordered by (deadline, tender_id)
+    and start strictly after the `after` key, so each page is an index range scan.
+    
+    When fields is given, only those columns are read from the database.
+    
+    While the columnar TenderFrame is loaded for the current generation the
+    search runs on it instead of the database.
+    
+    With count_scanned, SEARCH_ROWS_SCANNED counts the rows examined: every
+    row of the frame, or the rows read from the database.
+    """
+    frame = await current_tender_frame((await current_generation_async()).generation)
+    if frame is not None:
+        with STAGE_DURATION.time(stage="frame"):
+            tenders = frame.search(filters, limit=limit, after=after, fields=fields)
+        if count_scanned:
+            SEARCH_ROWS_SCANNED.inc(len(frame))
+        return tenders
     
+    repository = await get_repository_or_500()
     try:
-        # Handle different database types
-        if isinstance(db, MockMongoDB):
-            # MockMongoDB
-            return list(db.tenders.find())
-        elif hasattr(db, 'tenders') and db.tenders is not None:
-            # Real MongoDB
-            return list(db.tenders.find())
-        elif hasattr(db, 'cursor') and callable(getattr(db, 'cursor')):
-            # PostgreSQL
-            with db.cursor() as cursor:
-                cursor.execute("SELECT * FROM tenders")
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
-        else:
-            raise HTTPException(status_code=500, detail="Unsupported database type")
+        with db_call("search"):
+            tenders = await repository.search(filters, limit=limit, after=after, fields=fields)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving tenders: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error searching tenders: {str(e)}")
+    if count_scanned:
+        SEARCH_ROWS_SCANNED.inc(len(tenders))
+    return tenders
 
-def get_tender_by_id_from_db(tender_id: str):
+async def iter_tenders_from_db(filters: dict, limit: Optional[int] = None, after: Optional[tuple] = None,
+                               fields: Optional[List[str]] = None):
+    """
+    Async generator version of search_tenders_in_db that reads tenders off
+    the database cursor in batches. The pooled connection is held until the
+    generator is exhausted or closed.
+    """
+    repository = await get_repository_or_500()
+    try:
+        async for tender in repository.iter_search(filters, limit=limit, after=after, fields=fields):
+            yield tender
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching tenders: {str(e)}")
+
+def parse_cursor_param(after: Optional[str], length: int = 2) -> Optional[tuple]:
+    """Decode the `after` query parameter, rejecting malformed cursors with 400."""
+    if not after:
+        return None
+    try:
+        return decode_cursor(after, length)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def parse_fields_param(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse the `fields` query parameter, rejecting unknown fields with 400."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def with_fields(fields: Optional[List[str]], *required) -> Optional[List[str]]:
+    """Add the fields the endpoint itself needs to the client's projection."""
+    if fields is None:
+        return None
+    combined = list(fields)
+    for group in required:
+        combined.extend(name for name in group if name not in combined)
+    return combined
+
+def set_next_cursor(request: Request, response: Response, next_key: Optional[tuple]):
+    """Expose the next-page cursor through X-Next-Cursor and a Link header."""
+    if next_key is None:
+        return
+    next_cursor = encode_cursor(next_key)
+    response.headers["X-Next-Cursor"] = next_cursor
+    next_url = request.url.include_query_params(after=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+async def get_tender_by_id_from_db(tender_id: str, fields: Optional[List[str]] = None):
     """Helper function to get a specific tender by ID with proper error handling."""
-    db = get_db()
-    if db is None:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
+    repository = await get_repository_or_500()
     try:
-        # Handle different database types
-        if isinstance(db, MockMongoDB):
-            # MockMongoDB
-            return db.tenders.find_one({"tender_id": tender_id})
-        elif hasattr(db, 'tenders') and db.tenders is not None:
-            # Real MongoDB
-            return db.tenders.find_one({"tender_id": tender_id})
-        elif hasattr(db, 'cursor') and callable(getattr(db, 'cursor')):
-            # PostgreSQL
-            with db.cursor() as cursor:
-                cursor.execute("SELECT * FROM tenders WHERE tender_id = %s", (tender_id,))
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                row = cursor.fetchone()
-                return dict(zip(columns, row)) if row else None
-        else:
-            raise HTTPException(status_code=500, detail="Unsupported database type")
+        with db_call("get"):
+            return await repository.get(tender_id, fields=fields)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving tender: {str(e)}")
 
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to Tender Aggregator API"}
-
-@app.get("/tenders", response_model=List[dict])
-def get_tenders():
-    """Get all tenders."""
-    tenders = get_tenders_from_db()
-    # Convert ObjectId to string for JSON serialization (MongoDB only)
-    for tender in tenders:
-        if "_id" in tender:
-            tender["_id"] = str(tender["_id"])
-    return tenders
+async def get_tenders_by_ids_from_db(tender_ids: List[str], fields: Optional[List[str]] = None):
+    """Helper function to fetch many tenders in one query with proper error handling."""
+    repository = await get_repository_or_500()
+    try:
+        with db_call("get_many"):
+            return await repository.get_many(tender_ids, fields=fields)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving tenders: {str(e)}")
 
-@app.get("/tenders/search", response_model=List[dict])
-def search_tenders(
-    organization: Optional[str] = None,
-    category: Optional[str] = None,
-    location: Optional[str] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    deadline_from: Optional[str] = None,
-    deadline_to: Optional[str] = None,
-    query: Optional[str] = None
-):
-    """Search tenders with filters."""
-    # Get all tenders
-    tenders = get_tenders_from_db()
-    # Convert ObjectId to string for JSON serialization (MongoDB only)
-    for tender in tenders:
-        if "_id" in tender:
-            tender["_id"] = str(tender["_id"])
-    
-    # Apply filters
+def build_filters(organization: Optional[str] = None, category: Optional[str] = None,
+                  location: Optional[str] = None, min_value: Optional[float] = None,
+                  max_value: Optional[float] = None, deadline_from: Optional[str] = None,
+                  deadline_to: Optional[str] = None) -> dict:
+    """Build the filters dictionary shared by /tenders/search and /tenders/facets."""
     filters = {}
     if organization:
         filters["organization"] = organization
@@ -110,23 +230,270 @@ def search_tenders(
         filters["deadline_from"] = deadline_from
     if deadline_to:
         filters["deadline_to"] = deadline_to
+    return filters
+
+async def get_facets_body(filters: dict, limit: int) -> bytes:
+    """Encoded facet counts for the filters, served from the search cache when possible."""
+    generation = (await current_generation_async()).generation
+    cache_key = make_search_key(filters, None, facets=limit)
+    cached = search_cache.get(cache_key, generation)
+    if cached is not None:
+        return cached
+    
+    repository = await get_repository_or_500()
+    try:
+        with db_call("facets"):
+            facets = await repository.facets(filters, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error counting facets: {str(e)}")
+    
+    body = dumps(facets)
+    search_cache.put(cache_key, body, generation, size=len(body))
+    return body
+
+async def check_not_modified(request: Request, response: Response, version: Optional[DatasetVersion] = None,
+                             vary: Optional[str] = None) -> Optional[Response]:
+    """
+    Answer conditional requests from the ingest generation alone.
+    
+    Returns a 304 response when the client's copy is current; otherwise sets
+    ETag / Last-Modified on the outgoing response and returns None.
+    
+    Pass `version` when it was read before the data, and `vary` (e.g.
+    "Accept") when the representation depends on a request header; it is
+    sent on both the 304 and the full response.
+    """
+    if version is None:
+        version = await current_generation_async()
+    if is_not_modified(request, version):
+        not_modified = not_modified_response(version)
+        if vary:
+            not_modified.headers.add_vary_header(vary)
+        return not_modified
+    response.headers.update(validator_headers(version))
+    if vary:
+        response.headers.add_vary_header(vary)
+    return None
+
+@app.get("/")
+def read_root():
+    return {"message": "Welcome to Tender Aggregator API"}
+
+@app.get("/tenders", response_class=TenderJSONResponse)
+async def get_tenders(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: Optional[bool] = None,
+    fields: Optional[str] = None
+):
+    """
+    Get all tenders.
+    
+    Pass `limit` (and the `after` cursor from the previous page's
+    X-Next-Cursor header) to walk the table page by page.
+    
+    With `Accept: application/x-ndjson` or `?stream=1` the tenders are
+    streamed one JSON document per line straight off the database cursor.
+    
+    Pass `fields` (e.g. `tender_id,organization,deadline`) to receive only
+    those fields; the others are not read from the database.
+    """
+    after_key = parse_cursor_param(after)
+    field_list = parse_fields_param(fields)
+    
+    # JSON and NDJSON share the ETag, so caches must key on Accept too
+    not_modified = await check_not_modified(request, response, vary="Accept")
+    if not_modified is not None:
+        return not_modified
+    
+    if wants_ndjson(request, stream):
+        # Pull the first line here so connection errors still become HTTP errors
+        body = await prime_stream(ndjson_lines_async(iter_tenders_from_db({}, limit=limit, after=after_key,
+                                fields=tuple(field_list) if field_list else None)))
+        return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE, headers=dict(response.headers))
+    
+    if after_key is not None and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    
+    # Fetch one extra row to know whether there is a next page
+    tenders = await get_tenders_from_db(limit=limit + 1 if limit else None, after=after_key,
+                                        fields=with_fields(field_list, KEYSET_FIELDS))
+    next_key = None
+    if limit is not None and len(tenders) > limit:
+        tenders = tenders[:limit]
+        next_key = keyset_key(tenders[-1])
+    if field_list is not None:
+        tenders = [project_tender(tender, field_list) for tender in tenders]
+    
+    # Rows are encoded as-is (ObjectId and datetime included), without
+    # jsonable_encoder or response_model validation
+    set_next_cursor(request, response, next_key)
+    return TenderJSONResponse(tenders, headers=dict(response.headers))
+
+@app.get("/tenders/search", response_class=TenderJSONResponse)
+async def search_tenders(
+    request: Request,
+    response: Response,
+    organization: Optional[str] = None,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    deadline_from: Optional[str] = None,
+    deadline_to: Optional[str] = None,
+    query: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Search tenders with filters.
+    
+    Supports the same `limit` / `after` cursor pagination and `fields`
+    projection as /tenders. With a keyword `query`, `limit` also bounds the
+    ranking work: only the top `limit` matches are selected, not all sorted.
+    """
+    field_list = parse_fields_param(fields)
+    
+    not_modified = await check_not_modified(request, response)
+    if not_modified is not None:
+        return not_modified
+    
+    filters = build_filters(organization, category, location, min_value, max_value, deadline_from, deadline_to)
+    
+    from api.filter import rank_tenders, ranking_key, top_k
+    
+    # Keyword ranking reorders results, so its cursor also carries the score
+    after_key = parse_cursor_param(after, length=3 if query else 2)
+    if after_key is not None and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    
+    # Identical searches are served from the cache until the next ingest
+    generation = (await current_generation_async()).generation
+    cache_key = make_search_key(filters, query, limit=limit, after=after_key,
+                                fields=tuple(field_list) if field_list else None)
+    cached = search_cache.get(cache_key, generation)
+    if cached is not None:
+        body, next_key = cached
+        set_next_cursor(request, response, next_key)
+        return Response(body, media_type=TenderJSONResponse.media_type, headers=dict(response.headers))
+    
+    scores = None
+    stale_index = False
+    if query:
+        # Only matching tenders leave the database; they are scored against
+        # the BM25 index, which reads just the posting lists of the query terms
+        tenders = await search_tenders_in_db(filters, fields=with_fields(field_list, KEYSET_FIELDS),
+                                             count_scanned=True)
+        index = await current_search_index(generation)
+        # An index that failed to sync scores newer tenders 0: say so, and do not cache
+        stale_index = index.generation != generation
+        if stale_index:
+            response.headers["X-Search-Index-Stale"] = "1"
+        
+        def rank_page():
+            nonlocal scores
+            with STAGE_DURATION.time(stage="rank"):
+                scores = index.scores(query)
+                # Only the requested page (plus one row to detect the next) is
+                # selected from the matches: O(n log limit)
+                return top_k(tenders, lambda t: ranking_key(t, scores.get(str(t["tender_id"]), 0.0)),
+                             limit + 1 if limit is not None else None, after_key)
+        
+        # Ranking is CPU-bound; keep it off the event loop
+        ranked_tenders = await run_in_threadpool(rank_page)
+    else:
+        # Pages come straight off the (deadline, tender_id) index
+        tenders = await search_tenders_in_db(filters, limit=limit + 1 if limit else None, after=after_key,
+                                             fields=with_fields(field_list, KEYSET_FIELDS), count_scanned=True)
+        ranked_tenders = rank_tenders(tenders)
+    
+    next_key = None
+    if limit is not None and len(ranked_tenders) > limit:
+        ranked_tenders = ranked_tenders[:limit]
+        last = ranked_tenders[-1]
+        next_key = ranking_key(last, scores.get(str(last["tender_id"]), 0.0) if scores is not None else None)
+    if field_list is not None:
+        ranked_tenders = [project_tender(tender, field_list) for tender in ranked_tenders]
+    
+    SEARCH_ROWS_RETURNED.inc(len(ranked_tenders))
     
-    from api.filter import filter_tenders, rank_tenders
-    filtered_tenders = filter_tenders(tenders, filters)
+    # Cache the encoded body so hits skip serialization as well
+    with STAGE_DURATION.time(stage="encode"):
+        body = dumps(ranked_tenders)
+    if not stale_index:
+        search_cache.put(cache_key, (body, next_key), generation, size=len(body))
+    set_next_cursor(request, response, next_key)
+    return Response(body, media_type=TenderJSONResponse.media_type, headers=dict(response.headers))
+
+@app.get("/tenders/facets", response_class=TenderJSONResponse)
+async def get_tender_facets(
+    request: Request,
+    response: Response,
+    organization: Optional[str] = None,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    deadline_from: Optional[str] = None,
+    deadline_to: Optional[str] = None,
+    limit: int = Query(DEFAULT_FACET_LIMIT, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    Count tenders per organization, category, location and value range
+    under the same filters as /tenders/search.
     
-    # Apply ranking
-    ranked_tenders = rank_tenders(filtered_tenders, query or "")
+    Computed in one database query ($facet / GROUPING SETS) and cached
+    until the next ingest. `limit` caps the values listed per text facet.
+    """
+    not_modified = await check_not_modified(request, response)
+    if not_modified is not None:
+        return not_modified
     
-    return ranked_tenders
+    filters = build_filters(organization, category, location, min_value, max_value, deadline_from, deadline_to)
+    body = await get_facets_body(filters, limit)
+    return Response(body, media_type=TenderJSONResponse.media_type, headers=dict(response.headers))
+
+@app.post("/tenders/batch", response_class=TenderJSONResponse)
+async def get_tenders_batch(tender_ids: List[str] = Body(..., embed=True), fields: Optional[str] = None):
+    """
+    Look up many tenders by ID in a single database query.
+    
+    Body: `{"tender_ids": ["T1", "T2", ...]}`. Found tenders are returned in
+    request order; IDs with no matching tender are listed under `missing`.
+    """
+    field_list = parse_fields_param(fields)
+    if len(tender_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} tender IDs per request")
+    
+    unique_ids = list(dict.fromkeys(tender_ids))
+    tenders = []
+    if unique_ids:
+        tenders = await get_tenders_by_ids_from_db(unique_ids, fields=with_fields(field_list, ("tender_id",)))
+    found, missing = order_by_ids(tenders, unique_ids)
+    if field_list is not None:
+        found = [project_tender(tender, field_list) for tender in found]
+    return TenderJSONResponse({"tenders": found, "missing": missing})
 
 @app.get("/tenders/{tender_id}", response_model=dict)
-def get_tender(tender_id: str):
-    """Get a specific tender by ID."""
-    tender = get_tender_by_id_from_db(tender_id)
+async def get_tender(tender_id: str, request: Request, response: Response, fields: Optional[str] = None):
+    """Get a specific tender by ID, optionally limited to `fields`."""
+    field_list = parse_fields_param(fields)
+    
+    # Read the generation before the tender so the ETag never runs ahead of the data
+    version = await current_generation_async()
+    tender = await get_tender_by_id_from_db(tender_id, fields=field_list)
     
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
     
+    # Only after the lookup: If-None-Match: * must not turn a missing tender into a 304
+    not_modified = await check_not_modified(request, response, version=version)
+    if not_modified is not None:
+        return not_modified
+    
     # Convert ObjectId to string for JSON serialization (MongoDB only)
     if "_id" in tender:
         tender["_id"] = str(tender["_id"])
@@ -134,7 +501,7 @@ def get_tender(tender_id: str):
     return tender
 
 @app.get("/export")
-def export_tenders(format: str = "json"):
+def export_tenders(request: Request, format: str = "json"):
     """
     Export all tenders to JSON or Excel format.
     
@@ -146,8 +513,17 @@ def export_tenders(format: str = "json"):
     """
     from export.data_exporter import get_all_tenders_from_db, export_to_json, export_to_excel
     
+    if format.lower() != "excel":
+        # The JSON export (and its compressed copies) is kept per ingest
+        # generation and reused until the next ingest
+        generation = current_generation().generation
+        filepath = json_export_path(generation)
+        if os.path.exists(filepath):
+            return precompressed_file_response(request, filepath, 'application/json', "tenders_export.json")
+    
     # Get all tenders from database
-    tenders = get_all_tenders_from_db()
+    with get_manager().connection() as db:
+        tenders = get_all_tenders_from_db(db)
     
     if not tenders:
         raise HTTPException(status_code=404, detail="No tenders found to export")
@@ -157,14 +533,42 @@ def export_tenders(format: str = "json"):
         filepath = export_to_excel(tenders, "tenders_export")
         return FileResponse(filepath, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', filename="tenders_export.xlsx")
     else:
-        filepath = export_to_json(tenders, "tenders_export")
-        return FileResponse(filepath, media_type='application/json', filename="tenders_export.json")
+        export_to_json(tenders, os.path.basename(filepath))
+        remove_stale_json_exports(generation)
+        return precompressed_file_response(request, filepath, 'application/json', "tenders_export.json")
+
+# GET /export keeps the JSON exports of the current and previous ingest generation here
+EXPORTS_DIR = "exports"
+JSON_EXPORT_PREFIX = "tenders_export_gen"
+
+def json_export_path(generation: int) -> str:
+    """Path of the cached JSON export for an ingest generation."""
+    return os.path.join(EXPORTS_DIR, f"{JSON_EXPORT_PREFIX}{generation}.json")
+
+def remove_stale_json_exports(generation: int):
+    """
+    Delete the cached JSON exports of earlier generations, except the newest
+    one before `generation`: a download of it may still be streaming.
+    """
+    if not os.path.isdir(EXPORTS_DIR):
+        return
+    older = []
+    for name in os.listdir(EXPORTS_DIR):
+        number = name[len(JSON_EXPORT_PREFIX):-len(".json")]
+        if name.startswith(JSON_EXPORT_PREFIX) and name.endswith(".json") and number.isdigit():
+            if int(number) < generation:
+                older.append(int(number))
+    for number in sorted(older)[:-1]:
+        remove_export(json_export_path(number))
 
 @app.get("/export/big")
 def export_big_dataset(format: str = "json", batch_size: int = 1000):
     """
     Export large datasets efficiently using batch processing.
     
+    This runs the whole export inside the request; prefer POST /export/jobs
+    for anything that takes more than a few seconds.
+    
     Args:
         format: Export format ('json' or 'excel')
         batch_size: Number of records per batch
@@ -175,39 +579,150 @@ def export_big_dataset(format: str = "json", batch_size: int = 1000):
     from big_data.data_processor import BigDataProcessor
     
     try:
-        # Initialize processor
-        processor = BigDataProcessor(batch_size=batch_size)
-        
-        # Export based on format
-        if format.lower() == "excel":
-            filepath = processor.export_large_dataset_to_excel(batch_size=batch_size)
-            return FileResponse(filepath, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', filename=os.path.basename(filepath))
-        else:
-            filepath = processor.export_large_dataset_to_json(batch_size=batch_size)
-            return FileResponse(filepath, media_type='application/json', filename=os.path.basename(filepath))
+        with get_manager().connection() as db:
+            # Initialize processor
+            processor = BigDataProcessor(batch_size=batch_size, db=db)
+            
+            # Export based on format
+            if format.lower() == "excel":
+                filepath = processor.export_large_dataset_to_excel(batch_size=batch_size)
+                return FileResponse(filepath, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', filename=os.path.basename(filepath))
+            else:
+                # A fresh file per call: leave compression to the middleware rather
+                # than writing compressed copies nobody will download again
+                filepath = processor.export_large_dataset_to_json(batch_size=batch_size)
+                return FileResponse(filepath, media_type='application/json', filename=os.path.basename(filepath))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error exporting dataset: {str(e)}")
 
+EXCEL_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+def get_export_job_or_404(job_id: str):
+    """Return an export job, or fail with 404 if it is unknown or expired."""
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+@app.post("/export/jobs", status_code=202)
+def create_export_job(response: Response, format: str = "json", batch_size: int = Query(1000, ge=1)):
+    """
+    Start a large export in the background.
+    
+    Args:
+        format: Export format ('json' or 'excel')
+        batch_size: Number of records per batch
+        
+    Returns:
+        Job status; poll GET /export/jobs/{id} until it is "completed"
+    """
+    try:
+        job = export_jobs.create(format.lower(), batch_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExportJobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    response.headers["Location"] = f"/export/jobs/{job.id}"
+    return job.to_dict()
+
+@app.get("/export/jobs")
+def list_export_jobs():
+    """List export jobs, newest first."""
+    return [job.to_dict() for job in export_jobs.list()]
+
+@app.get("/export/jobs/{job_id}")
+def get_export_job(job_id: str):
+    """
+    Get an export job's status.
+    
+    Returns:
+        Status with records processed, bytes written, total records and ETA
+    """
+    return get_export_job_or_404(job_id).to_dict()
+
+@app.get("/export/jobs/{job_id}/download")
+def download_export_job(job_id: str, request: Request):
+    """Download the file produced by a completed export job."""
+    job = get_export_job_or_404(job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    if job.format == "excel":
+        return FileResponse(job.filepath, media_type=EXCEL_MEDIA_TYPE, filename=os.path.basename(job.filepath))
+    return precompressed_file_response(request, job.filepath, 'application/json', os.path.basename(job.filepath))
+
+@app.delete("/export/jobs/{job_id}")
+def cancel_export_job(job_id: str):
+    """Cancel a queued or running export job."""
+    job = export_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job.to_dict()
+
 @app.get("/stats")
-def get_dataset_statistics():
+async def get_dataset_statistics(request: Request, response: Response):
     """
     Get statistics about the tender dataset.
     
     Returns:
         Dataset statistics
     """
-    from big_data.data_processor import BigDataProcessor
+    not_modified = await check_not_modified(request, response)
+    if not_modified is not None:
+        return not_modified
+    
+    frame = await current_tender_frame((await current_generation_async()).generation)
+    if frame is not None:
+        return frame.stats()
     
+    repository = await get_repository_or_500()
     try:
-        # Initialize processor
-        processor = BigDataProcessor()
-        
-        # Get statistics
-        stats = processor.get_data_statistics()
-        
-        return stats
+        with db_call("stats"):
+            return await repository.stats()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting dataset statistics: {str(e)}")
 
+@app.get("/metrics")
+def get_metrics():
+    """Request, database, search and export metrics in the Prometheus text format."""
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+def require_admin(request: Request):
+    """Dependency rejecting requests without the X-Admin-Token header (404 when ADMIN_TOKEN is unset)."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not admin_authorized(request.headers.get("x-admin-token"), ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/pool", dependencies=[Depends(require_admin)])
+async def get_pool_statistics():
+    """
+    Get database pool configuration and checkout wait statistics.
+    Useful for sizing DB_POOL_MIN / DB_POOL_MAX. Requires the X-Admin-Token header.
+    
+    Returns:
+        Sync pool statistics (exports), with the async read pool under "async"
+    """
+    stats = get_manager().stats()
+    repository = await get_repository()
+    if repository is not None:
+        stats["async"] = {"backend": repository.backend, **repository.pool_stats()}
+    return stats
+
+@app.get("/admin/cache", dependencies=[Depends(require_admin)])
+def get_cache_statistics():
+    """
+    Get search result cache statistics. Requires the X-Admin-Token header.
+    
+    Returns:
+        Hit/miss counters, size and eviction policy of the search cache
+    """
+    return search_cache.stats()
+
+@app.delete("/admin/cache", dependencies=[Depends(require_admin)])
+def clear_cache():
+    """Drop every cached search result. Requires the X-Admin-Token header."""
+    search_cache.clear()
+    return search_cache.stats()
+
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8001)
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Concurrency benchmark for the Tender Aggregator API.
+
+Fires concurrent /tenders/search requests at increasing concurrency levels
+while a fixed number of background clients keep /export/big busy, and reports
+search throughput and latency percentiles for each level.
+
+Usage (with the server running):
+    python benchmarks/bench_concurrency.py --levels 1 4 16 64 --exporters 2
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import requests
+
+SEARCH_PARAMS = [
+    {"category": "IT"},
+    {"location": "Delhi"},
+    {"organization": "Ministry", "query": "software"},
+    {"min_value": 100000, "max_value": 5000000},
+    {"query": "construction road"},
+]
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of the samples (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+def export_load(base_url: str, stop: threading.Event, counter: Dict[str, int]):
+    """Keep requesting /export/big until stopped."""
+    session = requests.Session()
+    while not stop.is_set():
+        try:
+            session.get(f"{base_url}/export/big", params={"format": "json"}, timeout=600)
+            counter["exports"] += 1
+        except requests.exceptions.RequestException:
+            counter["export_errors"] += 1
+
+def search_worker(base_url: str, deadline: float) -> List[float]:
+    """Issue searches until the deadline; return per-request latencies in seconds."""
+    session = requests.Session()
+    latencies = []
+    while time.perf_counter() < deadline:
+        params = random.choice(SEARCH_PARAMS)
+        started = time.perf_counter()
+        try:
+            response = session.get(f"{base_url}/tenders/search", params=params, timeout=60)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            continue
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def run_level(base_url: str, concurrency: int, duration: float) -> Dict[str, float]:
+    """Run one concurrency level and summarize the search latencies."""
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: search_worker(base_url, deadline), range(concurrency)))
+    latencies = [latency for worker in results for latency in worker]
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (statistics.mean(latencies) * 1000) if latencies else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed search/export concurrency benchmark")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--exporters", type=int, default=2, help="Background /export/big clients")
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    counter = {"exports": 0, "export_errors": 0}
+    exporters = [
+        threading.Thread(target=export_load, args=(args.base_url, stop, counter), daemon=True)
+        for _ in range(args.exporters)
+    ]
+    for thread in exporters:
+        thread.start()
+
+    print(f"{'conc':>5} {'reqs':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    try:
+        for level in args.levels:
+            result = run_level(args.base_url, level, args.duration)
+            print(f"{result['concurrency']:>5} {result['requests']:>7} {result['throughput_rps']:>9.1f} "
+                  f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f}")
+    finally:
+        stop.set()
+
+    print(f"Background exports completed: {counter['exports']} (errors: {counter['export_errors']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Import-time budget for the application's entry points.
+
+Imports each entry point in a fresh interpreter with `python -X importtime`,
+reports the total and the heaviest modules, and exits with status 1 when an
+entry point takes longer than its budget. Heavy dependencies (pymongo,
+psycopg2, pandas, spaCy and its model) are imported on first use, so they
+should not show up here; when one does, the report shows who pulled it in.
+
+Budgets are in milliseconds and can be overridden per entry point with
+IMPORT_BUDGET_<NAME>_MS, e.g. IMPORT_BUDGET_API_SERVER_MS=2000.
+
+Usage:
+    python benchmarks/bench_importtime.py
+    python benchmarks/bench_importtime.py --entry main api.server --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point module -> default budget in ms
+BUDGETS_MS = {
+    "main": 800,
+    "export_tenders": 300,
+    "process_big_data": 300,
+    "api.server": 1500,
+}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def budget_ms(entry: str) -> float:
+    """Budget for an entry point, from IMPORT_BUDGET_<NAME>_MS or the default."""
+    env_name = "IMPORT_BUDGET_" + re.sub(r"\W", "_", entry).upper() + "_MS"
+    return float(os.getenv(env_name, BUDGETS_MS.get(entry, 1000)))
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Standard error of the interpreter
+
+    Returns:
+        (module, self µs, cumulative µs, nesting depth) per imported module
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+def measure(entry: str, runs: int = 3) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    """
+    Import an entry point in fresh interpreters and keep the fastest run.
+
+    Args:
+        entry: Module name to import
+        runs: Number of interpreters to start
+
+    Returns:
+        (total ms, parsed rows of the fastest run)
+
+    Raises:
+        Exception: If the entry point cannot be imported
+    """
+    best_total, best_rows = float("inf"), []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {entry}"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            raise Exception(f"Importing {entry} failed: {error}")
+        rows = parse_importtime(result.stderr)
+        total = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000.0
+        if total < best_total:
+            best_total, best_rows = total, rows
+    return best_total, best_rows
+
+def heaviest(rows: List[Tuple[str, int, int, int]], top: int) -> List[Tuple[str, int]]:
+    """Top-level packages by cumulative import time."""
+    packages: Dict[str, int] = {}
+    for module, _, cumulative, depth in rows:
+        if depth == 0:
+            package = module.split(".")[0]
+            packages[package] = packages.get(package, 0) + cumulative
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description="Check entry point import times against their budgets")
+    parser.add_argument("--entry", nargs="+", default=list(BUDGETS_MS))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    failed = []
+    for entry in args.entry:
+        budget = budget_ms(entry)
+        try:
+            total, rows = measure(entry, args.runs)
+        except Exception as e:
+            print(f"{entry}: {e}")
+            failed.append(entry)
+            continue
+        status = "ok" if total <= budget else "OVER BUDGET"
+        print(f"\n{entry}: {total:.1f} ms (budget {budget:.0f} ms) {status}")
+        for package, cumulative in heaviest(rows, args.top):
+            print(f"  {cumulative / 1000.0:>9.1f} ms  {package}")
+        if total > budget:
+            failed.append(entry)
+
+    if failed:
+        print(f"\nFailed: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Serialization micro-benchmark for tender list responses.
+
+Compares FastAPI's default path (per-row `_id` fixup, response_model
+validation, jsonable_encoder and stdlib json) with the orjson path used by
+TenderJSONResponse, on synthetic tenders shaped like MongoDB documents.
+
+Usage:
+    python benchmarks/bench_serialization.py --rows 100 1000 10000
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from api.responses import TenderJSONResponse
+
+RESPONSE_MODEL = TypeAdapter(List[dict])
+
+def make_tenders(count: int) -> List[Dict[str, Any]]:
+    """Build tenders the way they come back from MongoDB."""
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "tender_id": f"T{i:07d}",
+            "organization": f"Ministry of Department {i % 50}",
+            "category": ["IT Services", "Construction", "Medical Equipment"][i % 3],
+            "location": ["Delhi", "Mumbai", "Chennai", "Kolkata"][i % 4],
+            "value": 10000.0 + i * 37.5,
+            "deadline": start + timedelta(hours=i),
+            "description": "Supply, installation and maintenance of equipment " * 4,
+            "link": f"https://example.gov.in/tenders/{i}",
+        }
+        for i in range(count)
+    ]
+
+def default_path(tenders: List[Dict[str, Any]]) -> bytes:
+    """What the handlers did before: fix `_id`, validate, jsonable_encoder, json.dumps."""
+    for tender in tenders:
+        if "_id" in tender:
+            tender["_id"] = str(tender["_id"])
+    validated = RESPONSE_MODEL.validate_python(tenders)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+def orjson_path(tenders: List[Dict[str, Any]]) -> bytes:
+    """Encode database rows directly with orjson."""
+    return TenderJSONResponse(tenders).body
+
+def time_path(path: Callable[[List[Dict[str, Any]]], bytes], tenders: List[Dict[str, Any]],
+              repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds; each run gets fresh rows."""
+    best = float("inf")
+    for _ in range(repeat):
+        rows = copy.deepcopy(tenders)
+        started = time.perf_counter()
+        path(rows)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON encoding paths for tender lists")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'default ms':>11} {'orjson ms':>10} {'speedup':>8} {'bytes':>10}")
+    for count in args.rows:
+        tenders = make_tenders(count)
+        default_time = time_path(default_path, tenders, args.repeat)
+        orjson_time = time_path(orjson_path, tenders, args.repeat)
+        size = len(orjson_path(copy.deepcopy(tenders)))
+        print(f"{count:>7} {default_time * 1000:>11.2f} {orjson_time * 1000:>10.2f} "
+              f"{default_time / orjson_time:>7.1f}x {size:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,27 @@
 """
 Module for processing large amounts of tender data efficiently.
 """
-import pandas as pd
-from typing import List, Dict, Generator, Optional, Any
+from typing import List, Dict, Generator, Optional, Any, Callable
 import json
 from datetime import datetime
 import os
-from db.connection import get_db, MockMongoDB
+from db.connection import get_db, MockMongoDB, fetch_dicts
+from metrics import EXPORT_BYTES, EXPORT_RECORDS
 
 class BigDataProcessor:
     """Processor for handling large volumes of tender data."""
     
-    def __init__(self, batch_size: int = 1000):
+    def __init__(self, batch_size: int = 1000, db: Any = None):
         """
         Initialize the big data processor.
         
         Args:
             batch_size: Number of records to process in each batch
+            db: Optional database handle (e.g. checked out from the shared pool).
+                A new connection is opened with get_db() when omitted.
         """
         self.batch_size = batch_size
-        self.db = get_db()
+        self.db = db if db is not None else get_db()
         if self.db is None:
             raise Exception("Failed to connect to database")
     
@@ -83,8 +85,7 @@ class BigDataProcessor:
                 while True:
                     with self.db.cursor() as cursor:
                         cursor.execute("SELECT * FROM tenders LIMIT %s OFFSET %s", (batch_size, offset))
-                        columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                        tenders = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                        tenders = fetch_dicts(cursor)
                         
                         if not tenders:
                             break
@@ -97,13 +98,35 @@ class BigDataProcessor:
             print(f"Error retrieving tenders in batches: {e}")
             yield []
     
-    def export_large_dataset_to_json(self, filename: Optional[str] = None, batch_size: Optional[int] = None) -> str:
+    def count_tenders(self) -> int:
+        """
+        Count the tenders an export will write (used for progress and ETA).
+        
+        Returns:
+            Number of tenders in the database
+        """
+        if isinstance(self.db, MockMongoDB):
+            return len(self.db.tenders.data)
+        elif hasattr(self.db, 'tenders') and self.db.tenders is not None:
+            return self.db.tenders.count_documents({})
+        elif hasattr(self.db, 'cursor') and callable(getattr(self.db, 'cursor')):
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) AS count FROM tenders")
+                rows = fetch_dicts(cursor)
+                return rows[0]["count"] if rows else 0
+        else:
+            raise Exception("Unsupported database type")
+    
+    def export_large_dataset_to_json(self, filename: Optional[str] = None, batch_size: Optional[int] = None,
+                                     progress: Optional[Callable[[int, int], None]] = None) -> str:
         """
         Export large dataset to JSON format using streaming to handle memory efficiently.
         
         Args:
             filename: Output filename (without extension)
             batch_size: Batch size for processing
+            progress: Optional callback called after each batch with
+                (records written, bytes written); it may raise to abort the export
             
         Returns:
             Path to the exported file
@@ -133,6 +156,7 @@ class BigDataProcessor:
         # Process batches and write to file
         first_record = True
         batch_count = 0
+        total_records = 0
         
         for batch in self.get_tenders_batch(batch_size):
             if not batch:
@@ -147,26 +171,38 @@ class BigDataProcessor:
                     first_record = False
                     
             batch_count += 1
+            total_records += len(batch)
             print(f"Processed batch {batch_count} ({len(batch)} records)")
+            if progress is not None:
+                progress(total_records, os.path.getsize(filepath))
         
         # Close JSON array
         with open(filepath, 'a', encoding='utf-8') as f:
             f.write('\n]')
-            
+        
+        EXPORT_RECORDS.inc(total_records, format="json")
+        EXPORT_BYTES.inc(os.path.getsize(filepath), format="json")
         print(f"Export completed. Total batches: {batch_count}")
         return filepath
     
-    def export_large_dataset_to_excel(self, filename: Optional[str] = None, batch_size: Optional[int] = None) -> str:
+    def export_large_dataset_to_excel(self, filename: Optional[str] = None, batch_size: Optional[int] = None,
+                                      progress: Optional[Callable[[int, int], None]] = None) -> str:
         """
         Export large dataset to Excel format with multiple sheets for better organization.
         
         Args:
             filename: Output filename (without extension)
             batch_size: Batch size for processing
+            progress: Optional callback called after each batch with
+                (records written, bytes written); the workbook is only written
+                to disk when it is closed, so bytes stay 0 until then
             
         Returns:
             Path to the exported file
         """
+        # pandas takes most of this module's import time; only Excel needs it
+        import pandas as pd
+
         if batch_size is None:
             batch_size = self.batch_size
             
@@ -214,6 +250,8 @@ class BigDataProcessor:
                 batch_count += 1
                 total_records += len(batch)
                 print(f"Processed batch {batch_count} ({len(batch)} records)")
+                if progress is not None:
+                    progress(total_records, 0)
             
             # Create summary sheet
             summary_data = {
@@ -223,6 +261,8 @@ class BigDataProcessor:
             summary_df = pd.DataFrame(summary_data)
             summary_df.to_excel(writer, sheet_name="Summary", index=False)
             
+        EXPORT_RECORDS.inc(total_records, format="excel")
+        EXPORT_BYTES.inc(os.path.getsize(filepath), format="excel")
         print(f"Excel export completed. Total batches: {batch_count}, Total records: {total_records}")
         return filepath
     
@@ -0,0 +1,380 @@
+"""
+Background export jobs for large datasets.
+
+POST /export/jobs hands a BigDataProcessor export to a process pool instead
+of running it inside the request. The worker process opens its own database
+connection and reports progress (records, bytes, total) through a small JSON
+file next to the export, which the API reads when a client polls the job.
+Cancelling a running job drops a marker file that the worker checks after
+every batch.
+
+Job state (format, status, output file, timestamps) is kept in a JSON file
+per job under exports/jobs as well, so with several API workers any of them
+can report, download, cancel or purge a job, and EXPORT_MAX_JOBS caps the
+active jobs across all of them. Updates are serialized with a file lock.
+
+Workers are separate processes, so the in-memory MockMongoDB fallback is not
+shared with them: jobs need MongoDB or PostgreSQL to export any data.
+"""
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from metrics import EXPORT_BYTES, EXPORT_RECORDS
+
+# Jobs running at the same time (= worker processes); further requests are rejected
+EXPORT_MAX_JOBS = int(os.getenv("EXPORT_MAX_JOBS", "2"))
+
+# Seconds a finished job (and its file) stays available for download
+EXPORT_JOB_TTL = float(os.getenv("EXPORT_JOB_TTL", "3600"))
+
+EXPORT_JOBS_DIR = os.path.join("exports", "jobs")
+
+EXPORT_FORMATS = ("json", "excel")
+
+ACTIVE_STATES = ("queued", "running", "cancelling")
+
+class ExportCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+class ExportJobLimitError(Exception):
+    """Raised when EXPORT_MAX_JOBS jobs are already active."""
+
+def _progress_path(job_id: str) -> str:
+    return os.path.join(EXPORT_JOBS_DIR, f"{job_id}.progress.json")
+
+def _cancel_path(job_id: str) -> str:
+    return os.path.join(EXPORT_JOBS_DIR, f"{job_id}.cancel")
+
+def _job_path(job_id: str) -> str:
+    return os.path.join(EXPORT_JOBS_DIR, f"{job_id}.job.json")
+
+def _write_json(path: str, data: Dict[str, Any]):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+def _read_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_progress(job_id: str, progress: Dict[str, Any]):
+    _write_json(_progress_path(job_id), progress)
+
+def _read_progress(job_id: str) -> Dict[str, Any]:
+    return _read_json(_progress_path(job_id))
+
+_thread_lock = threading.Lock()
+
+@contextmanager
+def _jobs_lock() -> Iterator[None]:
+    """Serialize job file updates across threads and processes."""
+    os.makedirs(EXPORT_JOBS_DIR, exist_ok=True)
+    with _thread_lock, open(os.path.join(EXPORT_JOBS_DIR, ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+def _update_job(job_id: str, **changes: Any):
+    """Apply changes to a job file; finished jobs are never reopened."""
+    with _jobs_lock():
+        state = _read_json(_job_path(job_id))
+        if not state or state.get("status") not in ACTIVE_STATES:
+            return
+        state.update(changes)
+        _write_json(_job_path(job_id), state)
+
+def run_export_job(job_id: str, format: str, batch_size: int) -> Dict[str, Any]:
+    """
+    Run one export in a worker process.
+
+    Args:
+        job_id: Job identifier (names the output and progress files)
+        format: 'json' or 'excel'
+        batch_size: Records per batch
+
+    Returns:
+        Dictionary with filepath, records and bytes of the finished export
+
+    Raises:
+        ExportCancelled: If the job was cancelled while running
+    """
+    if os.path.exists(_cancel_path(job_id)):
+        _update_job(job_id, status="cancelled", finished_at=time.time())
+        raise ExportCancelled(job_id)
+    _update_job(job_id, status="running", pid=os.getpid())
+
+    try:
+        result = _export(job_id, format, batch_size)
+    except ExportCancelled:
+        _update_job(job_id, status="cancelled", finished_at=time.time())
+        raise
+    except Exception as e:
+        _update_job(job_id, status="failed", error=str(e), finished_at=time.time())
+        raise
+    _update_job(job_id, status="completed", finished_at=time.time(), **result)
+    return result
+
+def _export(job_id: str, format: str, batch_size: int) -> Dict[str, Any]:
+    from big_data.data_processor import BigDataProcessor
+
+    processor = BigDataProcessor(batch_size=batch_size)
+    total = processor.count_tenders()
+    started_at = time.time()
+    _write_progress(job_id, {"records": 0, "bytes": 0, "total": total, "started_at": started_at})
+
+    def report(records: int, bytes_written: int):
+        if os.path.exists(_cancel_path(job_id)):
+            raise ExportCancelled(job_id)
+        _write_progress(job_id, {"records": records, "bytes": bytes_written, "total": total,
+                                 "started_at": started_at})
+
+    filename = f"export_job_{job_id}"
+    try:
+        if format == "excel":
+            filepath = processor.export_large_dataset_to_excel(filename=filename, batch_size=batch_size,
+                                                               progress=report)
+        else:
+            filepath = processor.export_large_dataset_to_json(filename=filename, batch_size=batch_size,
+                                                              progress=report)
+    except ExportCancelled:
+        for suffix in (".json", ".xlsx"):
+            partial = os.path.join("exports", filename + suffix)
+            if os.path.exists(partial):
+                os.remove(partial)
+        raise
+
+    records = _read_progress(job_id).get("records", 0)
+    return {"filepath": filepath, "records": records, "bytes": os.path.getsize(filepath)}
+
+@dataclass
+class ExportJob:
+    """State of one export job, as stored in its job file."""
+
+    id: str
+    format: str
+    batch_size: int
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    filepath: Optional[str] = None
+    records: int = 0
+    bytes: int = 0
+    error: Optional[str] = None
+    # Process running (or, while queued, submitting) the job
+    pid: Optional[int] = None
+
+    @classmethod
+    def load(cls, job_id: str) -> Optional["ExportJob"]:
+        """Read a job file (None if it does not exist)."""
+        state = _read_json(_job_path(job_id))
+        if not state:
+            return None
+        return cls(**{name: value for name, value in state.items() if name in cls.__dataclass_fields__})
+
+    def save(self):
+        _write_json(_job_path(self.id), asdict(self))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Status document for GET /export/jobs/{id}, including live progress and ETA."""
+        records, bytes_written, total, eta = self.records, self.bytes, None, None
+        progress = _read_progress(self.id)
+        if progress:
+            total = progress.get("total")
+            if self.status in ACTIVE_STATES:
+                records = progress.get("records", 0)
+                bytes_written = progress.get("bytes", 0)
+                elapsed = time.time() - progress.get("started_at", time.time())
+                if records and total and total > records:
+                    eta = round(elapsed / records * (total - records), 1)
+        return {
+            "id": self.id,
+            "format": self.format,
+            "batch_size": self.batch_size,
+            "status": self.status,
+            "records_processed": records,
+            "bytes_written": bytes_written,
+            "total_records": total,
+            "percent": round(100.0 * records / total, 1) if total else None,
+            "eta_seconds": eta,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+class ExportJobManager:
+    """Submits export jobs to a process pool and tracks their state in job files."""
+
+    def __init__(self, max_jobs: int = EXPORT_MAX_JOBS, job_ttl: float = EXPORT_JOB_TTL):
+        """
+        Initialize the job manager. The process pool starts on the first job.
+
+        Args:
+            max_jobs: Jobs allowed to be active at once, across all API workers
+            job_ttl: Seconds finished jobs are kept before being purged
+        """
+        self.max_jobs = max_jobs
+        self.job_ttl = job_ttl
+        self._lock = threading.Lock()
+        # Futures of the jobs submitted by this process
+        self._futures: Dict[str, Future] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Spawn, because forking a threaded server is unsafe
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_jobs,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _load_all(self) -> List[ExportJob]:
+        # Caller holds the jobs lock
+        jobs = []
+        for name in os.listdir(EXPORT_JOBS_DIR):
+            if name.endswith(".job.json"):
+                job = ExportJob.load(name[:-len(".job.json")])
+                if job is not None:
+                    jobs.append(self._reap(job))
+        return jobs
+
+    def _reap(self, job: ExportJob) -> ExportJob:
+        # Caller holds the jobs lock. An active job whose process is gone never finishes.
+        if job.status in ACTIVE_STATES and not _pid_alive(job.pid):
+            job.status = "failed"
+            job.error = "Export process exited"
+            job.finished_at = time.time()
+            job.save()
+        return job
+
+    def create(self, format: str, batch_size: int) -> ExportJob:
+        """
+        Queue a new export job.
+
+        Args:
+            format: 'json' or 'excel'
+            batch_size: Records per batch
+
+        Returns:
+            The new job
+
+        Raises:
+            ValueError: If the format is not supported
+            ExportJobLimitError: If max_jobs jobs are already active
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        with _jobs_lock():
+            self._purge()
+            active = sum(1 for job in self._load_all() if job.status in ACTIVE_STATES)
+            if active >= self.max_jobs:
+                raise ExportJobLimitError(f"{active} export jobs already running (limit {self.max_jobs})")
+            job = ExportJob(id=uuid.uuid4().hex, format=format, batch_size=batch_size, pid=os.getpid())
+            job.save()
+        future = self._get_executor().submit(run_export_job, job.id, format, batch_size)
+        with self._lock:
+            self._futures[job.id] = future
+        future.add_done_callback(lambda future: self._finish(job.id, future))
+        return job
+
+    def _finish(self, job_id: str, future: Future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        # The export process records its own outcome; this covers jobs that never ran
+        if future.cancelled():
+            _update_job(job_id, status="cancelled", finished_at=time.time())
+        elif future.exception() is not None:
+            _update_job(job_id, status="failed", error=str(future.exception()), finished_at=time.time())
+        else:
+            result = future.result()
+            # Worker processes keep their own counters; record the export here
+            job = ExportJob.load(job_id)
+            if job is not None:
+                EXPORT_RECORDS.inc(result["records"], format=job.format)
+                EXPORT_BYTES.inc(result["bytes"], format=job.format)
+        if os.path.exists(_cancel_path(job_id)):
+            os.remove(_cancel_path(job_id))
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """Return a job by ID (None if unknown or purged)."""
+        with _jobs_lock():
+            self._purge()
+            job = ExportJob.load(job_id)
+            return self._reap(job) if job is not None else None
+
+    def list(self) -> List[ExportJob]:
+        """All known jobs, newest first."""
+        with _jobs_lock():
+            self._purge()
+            return sorted(self._load_all(), key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[ExportJob]:
+        """
+        Cancel a job. Queued jobs submitted by this process are dropped at once;
+        other jobs stop when they start or after their current batch.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        # Outside the jobs lock: a cancelled future runs _finish right away
+        if future is not None and future.cancel():
+            return ExportJob.load(job_id)
+        with _jobs_lock():
+            job = ExportJob.load(job_id)
+            if job is None or job.status not in ACTIVE_STATES:
+                return job
+            job.status = "cancelling"
+            with open(_cancel_path(job_id), "w") as f:
+                f.write("cancel")
+            job.save()
+        return job
+
+    def _purge(self):
+        # Caller holds the jobs lock
+        cutoff = time.time() - self.job_ttl
+        for job in self._load_all():
+            if job.finished_at is not None and job.finished_at < cutoff:
+                for path in (job.filepath, _progress_path(job.id), _cancel_path(job.id), _job_path(job.id)):
+                    if path and os.path.exists(path):
+                        os.remove(path)
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+export_jobs = ExportJobManager()
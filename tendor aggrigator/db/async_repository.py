@@ -0,0 +1,357 @@
+"""
+Async data-access layer for the Tender Aggregator API.
+
+Read endpoints go through one of these repositories so they never block the
+event loop: motor for MongoDB, psycopg 3's async connection pool for
+PostgreSQL, and a thin wrapper around the shared MockMongoDB for local runs
+without a database. Every repository takes the same filters / keyset
+arguments as the sync query builders in db.query.
+"""
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from db.connection import MockMongoDB
+from db.generation import DATASET_NAME, DatasetVersion, as_utc, get_generation
+from db.query import (
+    build_mongo_facet_pipeline, build_mongo_filter, build_mongo_projection, build_sql_columns,
+    build_sql_facets, build_sql_where, count_facets, format_facets, keyset_key, project_tender,
+    MONGO_KEYSET_SORT, SQL_KEYSET_ORDER
+)
+
+# Rows fetched per database round trip when iterating a cursor
+STREAM_BATCH_SIZE = int(os.getenv("DB_STREAM_BATCH_SIZE", "1000"))
+
+# Seconds to wait after a failed connect before trying again; requests in
+# between fail fast instead of queueing behind another connect timeout
+DB_RETRY_INTERVAL = float(os.getenv("DB_RETRY_INTERVAL", "10"))
+
+def _stats_result(total_count, organizations, categories, locations,
+                  max_value, min_value, avg_value, sample_tender) -> Dict[str, Any]:
+    """Shape dataset statistics like BigDataProcessor.get_data_statistics."""
+    return {
+        "total_records": total_count,
+        "unique_organizations": organizations,
+        "unique_categories": categories,
+        "unique_locations": locations,
+        "max_tender_value": max_value if max_value is not None else 0,
+        "min_tender_value": min_value if min_value is not None else 0,
+        "avg_tender_value": avg_value if avg_value is not None else 0,
+        "fields": list(sample_tender.keys()) if sample_tender else []
+    }
+
+class MongoAsyncRepository:
+    """Tender reads through motor."""
+
+    backend = "mongodb"
+
+    def __init__(self, client: Any, wait_stats: Any = None):
+        self.client = client
+        self.db = client.tender_aggregator
+        self.wait_stats = wait_stats
+
+    def _find(self, filters: Dict[str, Any], limit: Optional[int], after: Optional[Tuple],
+              fields: Optional[List[str]]):
+        cursor = self.db.tenders.find(build_mongo_filter(filters, after), build_mongo_projection(fields),
+                                      batch_size=STREAM_BATCH_SIZE)
+        if limit is not None or after is not None:
+            cursor = cursor.sort(MONGO_KEYSET_SORT)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    async def search(self, filters: Dict[str, Any], limit: Optional[int] = None,
+                     after: Optional[Tuple] = None, fields: Optional[List[str]] = None) -> List[Dict]:
+        return await self._find(filters, limit, after, fields).to_list(length=None)
+
+    async def iter_search(self, filters: Dict[str, Any], limit: Optional[int] = None,
+                          after: Optional[Tuple] = None, fields: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+        cursor = self._find(filters, limit, after, fields)
+        try:
+            async for tender in cursor:
+                yield tender
+        finally:
+            cursor.close()
+
+    async def get(self, tender_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        return await self.db.tenders.find_one({"tender_id": tender_id}, build_mongo_projection(fields))
+
+    async def get_many(self, tender_ids: List[str], fields: Optional[List[str]] = None) -> List[Dict]:
+        cursor = self.db.tenders.find({"tender_id": {"$in": tender_ids}}, build_mongo_projection(fields))
+        return await cursor.to_list(length=None)
+
+    async def facets(self, filters: Dict[str, Any], limit: int) -> Dict[str, List[Dict[str, Any]]]:
+        docs = await self.db.tenders.aggregate(build_mongo_facet_pipeline(filters, limit)).to_list(length=1)
+        result = docs[0] if docs else {}
+        counts = {facet: {doc["_id"]: doc["count"] for doc in groups} for facet, groups in result.items()}
+        return format_facets(counts, limit)
+
+    async def generation(self) -> DatasetVersion:
+        meta = await self.db.dataset_meta.find_one({"_id": DATASET_NAME})
+        if not meta:
+            return DatasetVersion(0, None)
+        return DatasetVersion(meta.get("generation", 0), as_utc(meta.get("updated_at")))
+
+    async def stats(self) -> Dict[str, Any]:
+        tenders = self.db.tenders
+        total_count, sample_tender, organizations, categories, locations, value_stats = await asyncio.gather(
+            tenders.count_documents({}),
+            tenders.find_one(),
+            tenders.distinct("organization"),
+            tenders.distinct("category"),
+            tenders.distinct("location"),
+            tenders.aggregate([
+                {"$group": {
+                    "_id": None,
+                    "max_value": {"$max": "$value"},
+                    "min_value": {"$min": "$value"},
+                    "avg_value": {"$avg": "$value"}
+                }}
+            ]).to_list(length=1),
+        )
+        values = value_stats[0] if value_stats else {}
+        return _stats_result(total_count, len(organizations), len(categories), len(locations),
+                             values.get("max_value"), values.get("min_value"), values.get("avg_value"),
+                             sample_tender)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.wait_stats.to_dict() if self.wait_stats is not None else {}
+
+    async def close(self):
+        self.client.close()
+
+class PostgresAsyncRepository:
+    """Tender reads through a psycopg 3 AsyncConnectionPool."""
+
+    backend = "postgresql"
+
+    def __init__(self, pool: Any):
+        self.pool = pool
+
+    @staticmethod
+    def _select(filters: Dict[str, Any], limit: Optional[int], after: Optional[Tuple],
+                fields: Optional[List[str]]) -> Tuple[str, List[Any]]:
+        where, params = build_sql_where(filters, after)
+        sql = f"SELECT {build_sql_columns(fields)} FROM tenders" + where
+        if limit is not None or after is not None:
+            sql += SQL_KEYSET_ORDER
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
+        return sql, params
+
+    async def _fetch(self, sql: str, params: Any = None) -> List[Dict]:
+        from psycopg.rows import dict_row
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute(sql, params)
+                return await cursor.fetchall()
+
+    async def search(self, filters: Dict[str, Any], limit: Optional[int] = None,
+                     after: Optional[Tuple] = None, fields: Optional[List[str]] = None) -> List[Dict]:
+        sql, params = self._select(filters, limit, after, fields)
+        return await self._fetch(sql, params)
+
+    async def iter_search(self, filters: Dict[str, Any], limit: Optional[int] = None,
+                          after: Optional[Tuple] = None, fields: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+        from psycopg.rows import dict_row
+        sql, params = self._select(filters, limit, after, fields)
+        async with self.pool.connection() as conn:
+            # Server-side cursor so rows arrive in batches
+            async with conn.cursor(name="tenders_read", row_factory=dict_row) as cursor:
+                cursor.itersize = STREAM_BATCH_SIZE
+                await cursor.execute(sql, params)
+                async for tender in cursor:
+                    yield tender
+
+    async def get(self, tender_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        rows = await self._fetch(f"SELECT {build_sql_columns(fields)} FROM tenders WHERE tender_id = %s", (tender_id,))
+        return rows[0] if rows else None
+
+    async def get_many(self, tender_ids: List[str], fields: Optional[List[str]] = None) -> List[Dict]:
+        return await self._fetch(f"SELECT {build_sql_columns(fields)} FROM tenders WHERE tender_id = ANY(%s)",
+                                 (list(tender_ids),))
+
+    async def facets(self, filters: Dict[str, Any], limit: int) -> Dict[str, List[Dict[str, Any]]]:
+        sql, params = build_sql_facets(filters)
+        counts: Dict[str, Dict[Any, int]] = {}
+        for row in await self._fetch(sql, params):
+            value = row["value"]
+            if row["facet"] == "value" and value is not None:
+                value = int(value)
+            counts.setdefault(row["facet"], {})[value] = row["count"]
+        return format_facets(counts, limit)
+
+    async def generation(self) -> DatasetVersion:
+        rows = await self._fetch("SELECT to_regclass('dataset_meta') IS NOT NULL AS present")
+        if not rows or not rows[0]["present"]:
+            return DatasetVersion(0, None)
+        rows = await self._fetch("SELECT generation, updated_at FROM dataset_meta WHERE name = %s", (DATASET_NAME,))
+        if not rows:
+            return DatasetVersion(0, None)
+        return DatasetVersion(rows[0]["generation"], as_utc(rows[0]["updated_at"]))
+
+    async def stats(self) -> Dict[str, Any]:
+        rows = await self._fetch("""
+            SELECT
+                COUNT(*) AS total_count,
+                COUNT(DISTINCT organization) AS organizations,
+                COUNT(DISTINCT category) AS categories,
+                COUNT(DISTINCT location) AS locations,
+                MAX(value) AS max_value,
+                MIN(value) AS min_value,
+                AVG(value) AS avg_value
+            FROM tenders
+        """)
+        sample = await self._fetch("SELECT * FROM tenders LIMIT 1")
+        row = rows[0]
+        return _stats_result(row["total_count"], row["organizations"], row["categories"], row["locations"],
+                             row["max_value"], row["min_value"], row["avg_value"],
+                             sample[0] if sample else None)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return dict(self.pool.get_stats())
+
+    async def close(self):
+        await self.pool.close()
+
+class MockAsyncRepository:
+    """Async facade over the shared in-memory MockMongoDB for local runs."""
+
+    backend = "mock"
+
+    def __init__(self, db: MockMongoDB):
+        self.db = db
+
+    async def search(self, filters: Dict[str, Any], limit: Optional[int] = None,
+                     after: Optional[Tuple] = None, fields: Optional[List[str]] = None) -> List[Dict]:
+        from api.filter import filter_tenders
+        collection = self.db.tenders
+        tenders = filter_tenders(collection.find(), filters, indexes=collection.indexes)
+        if limit is not None or after is not None:
+            tenders = sorted(tenders, key=keyset_key)
+            if after is not None:
+                tenders = [t for t in tenders if keyset_key(t) > after]
+            if limit is not None:
+                tenders = tenders[:limit]
+        return [project_tender(t, fields) for t in tenders]
+
+    async def iter_search(self, filters: Dict[str, Any], limit: Optional[int] = None,
+                          after: Optional[Tuple] = None, fields: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+        for tender in await self.search(filters, limit, after, fields):
+            yield tender
+
+    async def get(self, tender_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        tender = self.db.tenders.find_one({"tender_id": tender_id})
+        return project_tender(tender, fields) if tender is not None else None
+
+    async def get_many(self, tender_ids: List[str], fields: Optional[List[str]] = None) -> List[Dict]:
+        wanted = set(tender_ids)
+        return [project_tender(t, fields) for t in self.db.tenders.find() if t.get("tender_id") in wanted]
+
+    async def facets(self, filters: Dict[str, Any], limit: int) -> Dict[str, List[Dict[str, Any]]]:
+        from api.filter import filter_tenders
+        collection = self.db.tenders
+        return format_facets(count_facets(filter_tenders(collection.find(), filters, indexes=collection.indexes)),
+                             limit)
+
+    async def generation(self) -> DatasetVersion:
+        return get_generation(self.db)
+
+    async def stats(self) -> Dict[str, Any]:
+        from big_data.data_processor import BigDataProcessor
+        return BigDataProcessor(db=self.db).get_data_statistics()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def close(self):
+        pass
+
+async def open_repository() -> Any:
+    """
+    Open the async repository for the configured DB_TYPE.
+
+    Returns:
+        A repository, or None if PostgreSQL is configured but unreachable
+    """
+    db_type = os.getenv("DB_TYPE", "mongodb")
+    min_size = int(os.getenv("DB_POOL_MIN", "1"))
+    max_size = int(os.getenv("DB_POOL_MAX", "10"))
+    timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+    if db_type == "postgresql":
+        from psycopg_pool import AsyncConnectionPool
+        conninfo = " ".join([
+            f"host={os.getenv('POSTGRES_HOST', 'localhost')}",
+            f"port={os.getenv('POSTGRES_PORT', '5432')}",
+            f"dbname={os.getenv('POSTGRES_DB', 'tender_aggregator')}",
+            f"user={os.getenv('POSTGRES_USER', 'postgres')}",
+            f"password={os.getenv('POSTGRES_PASSWORD', 'postgres')}",
+        ])
+        pool = AsyncConnectionPool(conninfo, min_size=min_size, max_size=max_size, timeout=timeout, open=False)
+        try:
+            await pool.open(wait=True, timeout=timeout)
+            print(f"Connected to PostgreSQL successfully (async pool {min_size}-{max_size})")
+            return PostgresAsyncRepository(pool)
+        except Exception as e:
+            print(f"Error connecting to PostgreSQL: {e}")
+            await pool.close()
+            return None
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from db.pool import PoolWaitStats, MongoPoolWaitListener
+    wait_stats = PoolWaitStats()
+    client = AsyncIOMotorClient(
+        os.getenv("MONGO_URI", "mongodb://localhost:27017/tender_aggregator"),
+        minPoolSize=min_size,
+        maxPoolSize=max_size,
+        waitQueueTimeoutMS=int(timeout * 1000),
+        serverSelectionTimeoutMS=int(os.getenv("MONGO_TIMEOUT_MS", "30000")),
+        event_listeners=[MongoPoolWaitListener(wait_stats)],
+    )
+    try:
+        await client.admin.command('ping')
+        print("Connected to MongoDB successfully (async client)")
+        return MongoAsyncRepository(client, wait_stats)
+    except Exception as e:
+        print(f"Error connecting to MongoDB: {e}")
+        client.close()
+        # Share the sync manager's mock so both paths see the same data
+        from db.pool import get_manager
+        with get_manager().connection() as db:
+            mock = db if isinstance(db, MockMongoDB) else MockMongoDB()
+        return MockAsyncRepository(mock)
+
+_repository: Any = None
+_repository_lock: Optional[asyncio.Lock] = None
+_retry_at = 0.0
+
+async def get_repository() -> Any:
+    """
+    Return the process-wide async repository, opening it on first use.
+
+    Returns None without trying to connect for DB_RETRY_INTERVAL seconds
+    after a failed attempt.
+    """
+    global _repository, _repository_lock, _retry_at
+    if _repository is None:
+        if time.monotonic() < _retry_at:
+            return None
+        if _repository_lock is None:
+            _repository_lock = asyncio.Lock()
+        async with _repository_lock:
+            if _repository is None and time.monotonic() >= _retry_at:
+                _repository = await open_repository()
+                if _repository is None:
+                    _retry_at = time.monotonic() + DB_RETRY_INTERVAL
+    return _repository
+
+async def close_repository():
+    """Close the process-wide async repository."""
+    global _repository, _retry_at
+    if _repository is not None:
+        await _repository.close()
+        _repository = None
+    _retry_at = 0.0
@@ -4,9 +4,11 @@ Supports both MongoDB and PostgreSQL.
 """
 import os
 from typing import Any, Optional, Union
-from pymongo import MongoClient
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from db.range_index import TenderRangeIndex
+from db.trigram_index import TrigramIndex
+
+# pymongo and psycopg2 are imported inside the connection functions, so
+# callers only pay for the driver they actually use
 
 def get_db() -> Any:
     """
@@ -23,6 +25,7 @@ def get_db() -> Any:
 def get_mongo_connection() -> Any:
     """Get MongoDB connection."""
     try:
+        from pymongo import MongoClient
         # Try to get connection string from environment variable
         mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/tender_aggregator")
         client = MongoClient(mongo_uri)
@@ -39,6 +42,8 @@ def get_mongo_connection() -> Any:
 def get_postgres_connection() -> Any:
     """Get PostgreSQL connection."""
     try:
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
         # Try to get connection parameters from environment variables
         host = os.getenv("POSTGRES_HOST", "localhost")
         port = os.getenv("POSTGRES_PORT", "5432")
@@ -60,24 +65,44 @@ def get_postgres_connection() -> Any:
         print(f"Error connecting to PostgreSQL: {e}")
         return None
 
+def fetch_dicts(cursor) -> list:
+    """
+    Fetch all remaining rows from a PostgreSQL cursor as dictionaries.
+    Works for both RealDictCursor rows and plain tuple rows.
+    """
+    rows = cursor.fetchall()
+    if rows and isinstance(rows[0], dict):
+        return [dict(row) for row in rows]
+    columns = [desc[0] for desc in cursor.description] if cursor.description else []
+    return [dict(zip(columns, row)) for row in rows]
+
 class MockMongoDB:
     """Mock MongoDB for development when no database is available."""
     def __init__(self):
         self.tenders = MockCollection()
+        self.dataset_meta = {"generation": 0, "updated_at": None}
     
     def __getitem__(self, name):
         return self.tenders
 
 class MockCollection:
-    """Mock MongoDB collection."""
+    """Mock MongoDB collection with sorted deadline / value and trigram indexes."""
     def __init__(self):
         self.data = []
+        self.range_index = TenderRangeIndex()
+        self.text_index = TrigramIndex()
+        self.indexes = [self.range_index, self.text_index]
     
     def delete_many(self, query):
         self.data = []
+        for index in self.indexes:
+            index.clear()
     
     def insert_many(self, documents):
+        start = len(self.data)
         self.data.extend(documents)
+        for index in self.indexes:
+            index.add_many(enumerate(self.data[start:], start))
     
     def find(self, query=None):
         return self.data
@@ -0,0 +1,172 @@
+"""
+Dataset generation tracking for Tender Aggregator.
+
+Every ingest run bumps a persistent generation counter and timestamp stored
+next to the tenders (a `dataset_meta` collection / table). Readers use it to
+tell whether the data changed without touching the tenders themselves.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+from db.connection import MockMongoDB
+
+DATASET_NAME = "tenders"
+
+@dataclass
+class DatasetVersion:
+    generation: int
+    updated_at: Optional[datetime]
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a stored timestamp to an aware UTC datetime."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # MongoDB returns naive datetimes that are already in UTC
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def get_generation(db: Any) -> DatasetVersion:
+    """
+    Read the current dataset generation.
+
+    Args:
+        db: Database handle (MongoDB, MockMongoDB or PostgreSQL connection)
+
+    Returns:
+        DatasetVersion; generation 0 if nothing was ever ingested
+    """
+    if db is None:
+        return DatasetVersion(0, None)
+
+    try:
+        if isinstance(db, MockMongoDB):
+            meta = db.dataset_meta
+            return DatasetVersion(meta["generation"], meta["updated_at"])
+        elif hasattr(db, 'tenders') and db.tenders is not None:
+            # Real MongoDB
+            meta = db.dataset_meta.find_one({"_id": DATASET_NAME})
+            if not meta:
+                return DatasetVersion(0, None)
+            return DatasetVersion(meta.get("generation", 0), as_utc(meta.get("updated_at")))
+        elif hasattr(db, 'cursor') and callable(getattr(db, 'cursor')):
+            # PostgreSQL
+            with db.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('dataset_meta') IS NOT NULL AS present")
+                row = cursor.fetchone()
+                present = row["present"] if isinstance(row, dict) else row[0]
+                if not present:
+                    return DatasetVersion(0, None)
+                cursor.execute("SELECT generation, updated_at FROM dataset_meta WHERE name = %s", (DATASET_NAME,))
+                row = cursor.fetchone()
+            if not row:
+                return DatasetVersion(0, None)
+            if isinstance(row, dict):
+                return DatasetVersion(row["generation"], as_utc(row["updated_at"]))
+            return DatasetVersion(row[0], as_utc(row[1]))
+    except Exception as e:
+        print(f"Error reading dataset generation: {e}")
+    return DatasetVersion(0, None)
+
+def bump_generation(db: Any) -> DatasetVersion:
+    """
+    Increment the dataset generation after a write.
+    For PostgreSQL the update joins the caller's transaction; commit afterwards.
+
+    Args:
+        db: Database handle (MongoDB, MockMongoDB or PostgreSQL connection)
+
+    Returns:
+        The new DatasetVersion
+    """
+    now = datetime.now(timezone.utc)
+
+    if isinstance(db, MockMongoDB):
+        db.dataset_meta["generation"] += 1
+        db.dataset_meta["updated_at"] = now
+        return DatasetVersion(db.dataset_meta["generation"], now)
+    elif hasattr(db, 'tenders') and db.tenders is not None:
+        # Real MongoDB
+        meta = db.dataset_meta.find_one_and_update(
+            {"_id": DATASET_NAME},
+            {"$inc": {"generation": 1}, "$set": {"updated_at": now}},
+            upsert=True,
+            return_document=True,
+        )
+        return DatasetVersion(meta["generation"], now)
+    elif hasattr(db, 'cursor') and callable(getattr(db, 'cursor')):
+        # PostgreSQL
+        with db.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS dataset_meta (
+                    name TEXT PRIMARY KEY,
+                    generation BIGINT NOT NULL,
+                    updated_at TIMESTAMPTZ NOT NULL
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO dataset_meta (name, generation, updated_at)
+                VALUES (%s, 1, %s)
+                ON CONFLICT (name) DO UPDATE
+                SET generation = dataset_meta.generation + 1, updated_at = EXCLUDED.updated_at
+                RETURNING generation
+            """, (DATASET_NAME, now))
+            row = cursor.fetchone()
+        generation = row["generation"] if isinstance(row, dict) else row[0]
+        return DatasetVersion(generation, now)
+    raise Exception("Unsupported database type")
+
+_cached_version: Optional[DatasetVersion] = None
+_cached_at = 0.0
+_cache_lock = threading.Lock()
+
+def _cached_generation() -> Optional[DatasetVersion]:
+    interval = float(os.getenv("GENERATION_CHECK_INTERVAL", "1.0"))
+    with _cache_lock:
+        if _cached_version is not None and time.monotonic() - _cached_at < interval:
+            return _cached_version
+    return None
+
+def _remember_generation(version: DatasetVersion):
+    global _cached_version, _cached_at
+    with _cache_lock:
+        _cached_version = version
+        _cached_at = time.monotonic()
+
+def current_generation() -> DatasetVersion:
+    """
+    Dataset generation as seen by this process, read through the shared pool.
+
+    Re-read at most every GENERATION_CHECK_INTERVAL seconds (default 1) so a
+    burst of requests costs one metadata lookup.
+    """
+    version = _cached_generation()
+    if version is not None:
+        return version
+
+    from db.pool import get_manager
+    with get_manager().connection() as db:
+        version = get_generation(db)
+    _remember_generation(version)
+    return version
+
+async def current_generation_async() -> DatasetVersion:
+    """Async variant of current_generation, read through the async repository."""
+    version = _cached_generation()
+    if version is not None:
+        return version
+
+    from db.async_repository import get_repository
+    repository = await get_repository()
+    if repository is None:
+        return DatasetVersion(0, None)
+    try:
+        version = await repository.generation()
+    except Exception as e:
+        print(f"Error reading dataset generation: {e}")
+        version = DatasetVersion(0, None)
+    _remember_generation(version)
+    return version
@@ -0,0 +1,64 @@
+"""
+Index management for the tenders collection / table.
+"""
+from typing import Any
+from db.connection import MockMongoDB
+from db.query import TEXT_FILTER_FIELDS
+
+def ensure_indexes(db: Any):
+    """
+    Create the indexes the API relies on if they do not exist yet.
+
+    In PostgreSQL the substring filters (ILIKE '%...%') are backed by pg_trgm
+    GIN indexes. Creating the extension needs sufficient privileges; without
+    it those filters keep scanning the table, and everything else works.
+
+    Args:
+        db: Database handle (MongoDB, MockMongoDB or PostgreSQL connection)
+    """
+    if db is None or isinstance(db, MockMongoDB):
+        return
+
+    try:
+        if hasattr(db, 'tenders') and db.tenders is not None:
+            # Real MongoDB
+            db.tenders.create_index([("deadline", 1), ("tender_id", 1)], name="deadline_tender_id")
+            db.tenders.create_index("tender_id", name="tender_id")
+        elif hasattr(db, 'cursor') and callable(getattr(db, 'cursor')):
+            # PostgreSQL
+            with db.cursor() as cursor:
+                cursor.execute("CREATE INDEX IF NOT EXISTS tenders_deadline_tender_id_idx ON tenders (deadline, tender_id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS tenders_tender_id_idx ON tenders (tender_id)")
+            db.commit()
+            ensure_trigram_indexes(db)
+    except Exception as e:
+        print(f"Error creating indexes: {e}")
+        rollback_func = getattr(db, 'rollback', None)
+        if callable(rollback_func):
+            try:
+                rollback_func()
+            except Exception:
+                pass
+
+def ensure_trigram_indexes(db: Any):
+    """
+    Create pg_trgm GIN indexes on the PostgreSQL text filter columns.
+
+    Args:
+        db: PostgreSQL connection
+    """
+    try:
+        with db.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for field in TEXT_FILTER_FIELDS:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS tenders_{field}_trgm_idx "
+                               f"ON tenders USING GIN ({field} gin_trgm_ops)")
+        db.commit()
+    except Exception as e:
+        print(f"Error creating trigram indexes (is pg_trgm available?): {e}")
+        rollback_func = getattr(db, 'rollback', None)
+        if callable(rollback_func):
+            try:
+                rollback_func()
+            except Exception:
+                pass
@@ -0,0 +1,288 @@
+"""
+Process-wide database connection management for Tender Aggregator.
+
+The API keeps one ConnectionManager for its whole lifetime. It owns a single
+shared MongoClient (which pools sockets internally) or a psycopg2
+ThreadedConnectionPool, and hands out connections per request through
+``connection()``.
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from db.connection import MockMongoDB
+
+
+class PoolWaitStats:
+    """Thread-safe accumulator for connection checkout wait times."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.in_use = 0
+
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_checkin(self):
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "timeouts": self.timeouts,
+                "total_wait_seconds": round(self.total_wait, 6),
+                "avg_wait_seconds": round(avg_wait, 6),
+                "max_wait_seconds": round(self.max_wait, 6),
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def _mongo_pool_listener_class():
+    # pymongo only accepts subclasses of its listener base class, so the
+    # class is built when first needed instead of importing pymongo up front
+    from pymongo import monitoring
+
+    class MongoPoolWaitListener(monitoring.ConnectionPoolListener):
+        """Measures how long pymongo waits to check a socket out of its pool."""
+
+        def __init__(self, stats: PoolWaitStats):
+            self.stats = stats
+            self._local = threading.local()
+
+        def connection_check_out_started(self, event):
+            self._local.started = time.perf_counter()
+
+        def connection_checked_out(self, event):
+            started = getattr(self._local, "started", None)
+            self.stats.record_checkout(time.perf_counter() - started if started else 0.0)
+
+        def connection_check_out_failed(self, event):
+            self.stats.record_timeout()
+
+        def connection_checked_in(self, event):
+            self.stats.record_checkin()
+
+        def pool_created(self, event):
+            pass
+
+        def pool_ready(self, event):
+            pass
+
+        def pool_cleared(self, event):
+            pass
+
+        def pool_closed(self, event):
+            pass
+
+        def connection_created(self, event):
+            pass
+
+        def connection_ready(self, event):
+            pass
+
+        def connection_closed(self, event):
+            pass
+
+    return MongoPoolWaitListener
+
+def __getattr__(name: str):
+    # `from db.pool import MongoPoolWaitListener` imports pymongo at that point
+    if name == "MongoPoolWaitListener":
+        return _mongo_pool_listener_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ConnectionManager:
+    """Owns the long-lived database clients shared by every request."""
+
+    def __init__(self, db_type: Optional[str] = None, min_size: Optional[int] = None,
+                 max_size: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the connection manager.
+
+        Args:
+            db_type: 'mongodb' or 'postgresql' (defaults to the DB_TYPE env var)
+            min_size: Minimum number of pooled connections (DB_POOL_MIN)
+            max_size: Maximum number of pooled connections (DB_POOL_MAX)
+            timeout: Seconds to wait for a free connection (DB_POOL_TIMEOUT)
+        """
+        self.db_type = db_type or os.getenv("DB_TYPE", "mongodb")
+        self.min_size = min_size if min_size is not None else int(os.getenv("DB_POOL_MIN", "1"))
+        self.max_size = max_size if max_size is not None else int(os.getenv("DB_POOL_MAX", "10"))
+        self.timeout = timeout if timeout is not None else float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.wait_stats = PoolWaitStats()
+
+        self._lock = threading.Lock()
+        self._mongo_client = None
+        self._mongo_db = None
+        self._mock_db = None
+        self._pg_pool = None
+        self._pg_slots = threading.BoundedSemaphore(self.max_size)
+
+    @property
+    def is_open(self) -> bool:
+        return any(x is not None for x in (self._mongo_db, self._mock_db, self._pg_pool))
+
+    def open(self):
+        """Create the shared clients. Safe to call more than once."""
+        with self._lock:
+            if self.is_open:
+                return
+            if self.db_type == "postgresql":
+                self._open_postgres()
+            else:
+                self._open_mongo()
+
+    def _open_mongo(self):
+        mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/tender_aggregator")
+        try:
+            from pymongo import MongoClient
+            client = MongoClient(
+                mongo_uri,
+                minPoolSize=self.min_size,
+                maxPoolSize=self.max_size,
+                waitQueueTimeoutMS=int(self.timeout * 1000),
+                serverSelectionTimeoutMS=int(os.getenv("MONGO_TIMEOUT_MS", "30000")),
+                event_listeners=[_mongo_pool_listener_class()(self.wait_stats)],
+            )
+            client.admin.command('ping')
+            self._mongo_client = client
+            self._mongo_db = client.tender_aggregator
+            print("Connected to MongoDB successfully (shared client)")
+        except Exception as e:
+            print(f"Error connecting to MongoDB: {e}")
+            # Keep a single mock for the whole process so data survives across requests
+            self._mock_db = MockMongoDB()
+
+    def _open_postgres(self):
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+        from psycopg2.pool import ThreadedConnectionPool
+        try:
+            self._pg_pool = ThreadedConnectionPool(
+                self.min_size,
+                self.max_size,
+                host=os.getenv("POSTGRES_HOST", "localhost"),
+                port=os.getenv("POSTGRES_PORT", "5432"),
+                database=os.getenv("POSTGRES_DB", "tender_aggregator"),
+                user=os.getenv("POSTGRES_USER", "postgres"),
+                password=os.getenv("POSTGRES_PASSWORD", "postgres"),
+                cursor_factory=RealDictCursor,
+            )
+            print(f"Connected to PostgreSQL successfully (pool {self.min_size}-{self.max_size})")
+        except psycopg2.Error as e:
+            print(f"Error connecting to PostgreSQL: {e}")
+            self._pg_pool = None
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            if self._mongo_client is not None:
+                self._mongo_client.close()
+            if self._pg_pool is not None:
+                self._pg_pool.closeall()
+            self._mongo_client = None
+            self._mongo_db = None
+            self._mock_db = None
+            self._pg_pool = None
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Check a database handle out for the duration of a ``with`` block.
+
+        Yields:
+            A MongoDB database, a MockMongoDB, a PostgreSQL connection, or None
+            if no database is reachable.
+        """
+        if not self.is_open:
+            self.open()
+
+        if self._pg_pool is not None:
+            with self._checkout_postgres() as conn:
+                yield conn
+        elif self._mongo_db is not None:
+            # pymongo checks sockets out per operation; the listener records the wait
+            yield self._mongo_db
+        else:
+            yield self._mock_db
+
+    @contextmanager
+    def _checkout_postgres(self) -> Iterator[Any]:
+        import psycopg2
+        started = time.perf_counter()
+        # ThreadedConnectionPool raises instead of blocking when exhausted, so
+        # the semaphore turns an exhausted pool into a bounded wait.
+        if not self._pg_slots.acquire(timeout=self.timeout):
+            self.wait_stats.record_timeout()
+            raise Exception(f"Timed out after {self.timeout}s waiting for a database connection")
+        try:
+            conn = self._pg_pool.getconn()
+        except Exception:
+            self._pg_slots.release()
+            raise
+        self.wait_stats.record_checkout(time.perf_counter() - started)
+        try:
+            yield conn
+        finally:
+            broken = bool(conn.closed)
+            if not broken:
+                try:
+                    # End any read transaction so the connection goes back idle
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            self._pg_pool.putconn(conn, close=broken)
+            self.wait_stats.record_checkin()
+            self._pg_slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and checkout wait statistics."""
+        if self._pg_pool is not None:
+            backend = "postgresql"
+        elif self._mongo_db is not None:
+            backend = "mongodb"
+        elif self._mock_db is not None:
+            backend = "mock"
+        else:
+            backend = None
+        return {
+            "backend": backend,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "timeout_seconds": self.timeout,
+            **self.wait_stats.to_dict(),
+        }
+
+
+_manager: Optional[ConnectionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> ConnectionManager:
+    """Return the process-wide ConnectionManager, creating it on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ConnectionManager()
+    return _manager
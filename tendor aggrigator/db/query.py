@@ -0,0 +1,372 @@
+"""
+Query builders that push tender search filters down into the database.
+
+The filter dictionary uses the same keys as api.filter.filter_tenders:
+organization, category, location, min_value, max_value, deadline_from and
+deadline_to. Matching semantics are kept identical to the Python path:
+text filters are case-insensitive substring matches, value and deadline
+bounds are inclusive, and unparseable deadlines are ignored.
+"""
+import base64
+import bisect
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Filters matched as case-insensitive substrings
+TEXT_FILTER_FIELDS = ("organization", "category", "location")
+
+# Columns a client may request with `fields=`
+TENDER_FIELDS = ("tender_id", "organization", "category", "location", "value", "deadline", "description", "link")
+
+# Fields the API needs internally to build cursors and keyword rankings
+KEYSET_FIELDS = ("deadline", "tender_id")
+RANKING_FIELDS = ("organization", "category", "location", "description")
+
+# Fields counted by /tenders/facets, plus value ranges split at these bounds
+FACET_FIELDS = ("organization", "category", "location")
+VALUE_BUCKET_BOUNDS = (100000, 500000, 1000000, 5000000, 10000000)
+
+# Sort order used for keyset pagination; backed by a (deadline, tender_id) index
+MONGO_KEYSET_SORT = [("deadline", 1), ("tender_id", 1)]
+SQL_KEYSET_ORDER = " ORDER BY deadline, tender_id"
+
+def parse_deadline(value: Any) -> Optional[datetime]:
+    """
+    Parse an ISO deadline filter value.
+
+    Args:
+        value: ISO date/datetime string or datetime
+
+    Returns:
+        Parsed datetime, or None if the value cannot be parsed
+    """
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+EPOCH = datetime(1970, 1, 1)
+
+def epoch_micros(value: datetime) -> int:
+    """Microseconds since the epoch; aware datetimes are converted to UTC first."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards so the value is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated `fields` parameter.
+
+    Args:
+        value: e.g. "tender_id,organization,deadline"
+
+    Returns:
+        Ordered list of unique field names, or None for all fields
+
+    Raises:
+        ValueError: If a field is not a tender column
+    """
+    if not value:
+        return None
+    fields = []
+    for name in value.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in TENDER_FIELDS:
+            raise ValueError(f"Unknown field: {name}. Allowed fields: {', '.join(TENDER_FIELDS)}")
+        if name not in fields:
+            fields.append(name)
+    return fields or None
+
+def build_mongo_projection(fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
+    """MongoDB projection for the given fields (None reads whole documents)."""
+    if fields is None:
+        return None
+    projection = {name: 1 for name in fields}
+    projection["_id"] = 0
+    return projection
+
+def build_sql_columns(fields: Optional[List[str]]) -> str:
+    """SQL select list for the given fields (validated by parse_fields)."""
+    if fields is None:
+        return "*"
+    return ", ".join(fields)
+
+def project_tender(tender: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested fields of a tender."""
+    if fields is None:
+        return tender
+    return {name: tender[name] for name in fields if name in tender}
+
+def order_by_ids(tenders: List[Dict[str, Any]], tender_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Arrange batch lookup results in request order.
+
+    Args:
+        tenders: Tenders returned by the database, in any order
+        tender_ids: Requested IDs (duplicates are answered once)
+
+    Returns:
+        Tuple of (found tenders in request order, missing IDs in request order)
+    """
+    by_id = {tender.get("tender_id"): tender for tender in tenders}
+    found, missing, seen = [], [], set()
+    for tender_id in tender_ids:
+        if tender_id in seen:
+            continue
+        seen.add(tender_id)
+        if tender_id in by_id:
+            found.append(by_id[tender_id])
+        else:
+            missing.append(tender_id)
+    return found, missing
+
+def keyset_key(tender: Dict[str, Any]) -> Tuple[datetime, str]:
+    """Sort key used for keyset pagination: (deadline, tender_id)."""
+    return parse_deadline(tender.get("deadline")) or datetime.min, str(tender.get("tender_id", ""))
+
+def encode_cursor(key: Tuple[Any, ...]) -> str:
+    """
+    Encode a sort key as an opaque, URL-safe pagination cursor.
+
+    Args:
+        key: Sort key of the last item on the current page
+
+    Returns:
+        Cursor string
+    """
+    values = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in key]
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, length: int = 2) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+        length: Expected number of values in the sort key
+
+    Returns:
+        Sort key tuple
+
+    Raises:
+        ValueError: If the cursor is malformed, including values of the wrong
+            type: the key must end in (deadline, tender_id), preceded by a
+            numeric score when length is 3
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list):
+            raise TypeError("cursor is not a list")
+        key = tuple(datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in values)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if len(key) != length or len(key) < 2:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    *scores, deadline, tender_id = key
+    if (not isinstance(deadline, datetime) or not isinstance(tender_id, str)
+            or any(isinstance(score, bool) or not isinstance(score, (int, float)) for score in scores)):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key
+
+def build_mongo_filter(filters: Dict[str, Any], after: Optional[Tuple[datetime, str]] = None) -> Dict[str, Any]:
+    """
+    Build a MongoDB filter document from search filters.
+
+    Args:
+        filters: Dictionary containing filter criteria
+        after: Optional (deadline, tender_id) key; only tenders sorting
+            after it are matched
+
+    Returns:
+        MongoDB query document
+    """
+    query: Dict[str, Any] = {}
+
+    for field in TEXT_FILTER_FIELDS:
+        if filters.get(field):
+            query[field] = {"$regex": re.escape(filters[field]), "$options": "i"}
+
+    value_range = {}
+    if filters.get("min_value") is not None:
+        value_range["$gte"] = float(filters["min_value"])
+    if filters.get("max_value") is not None:
+        value_range["$lte"] = float(filters["max_value"])
+    if value_range:
+        query["value"] = value_range
+
+    deadline_range = {}
+    deadline_from = parse_deadline(filters.get("deadline_from"))
+    if deadline_from is not None:
+        deadline_range["$gte"] = deadline_from
+    deadline_to = parse_deadline(filters.get("deadline_to"))
+    if deadline_to is not None:
+        deadline_range["$lte"] = deadline_to
+    if deadline_range:
+        query["deadline"] = deadline_range
+
+    if after is not None:
+        deadline, tender_id = after
+        keyset = {"$or": [
+            {"deadline": {"$gt": deadline}},
+            {"deadline": deadline, "tender_id": {"$gt": tender_id}},
+        ]}
+        query = {"$and": [query, keyset]} if query else keyset
+
+    return query
+
+def value_bucket(value: Any) -> Optional[int]:
+    """Index of the VALUE_BUCKET_BOUNDS range a tender value falls in (None if not numeric)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return bisect.bisect_right(VALUE_BUCKET_BOUNDS, value)
+
+def format_facets(counts: Dict[str, Dict[Any, int]], limit: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Shape raw facet counts into the /tenders/facets response.
+
+    Args:
+        counts: {facet: {value or bucket index: count}}; keys are FACET_FIELDS and "value"
+        limit: Most values returned per text facet
+
+    Returns:
+        Text facets as [{"value", "count"}] sorted by count, and value
+        buckets as [{"min", "max", "count"}] in ascending order
+    """
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    for field in FACET_FIELDS:
+        items = [(value, count) for value, count in counts.get(field, {}).items() if value is not None]
+        items.sort(key=lambda item: (-item[1], str(item[0])))
+        result[field] = [{"value": value, "count": count} for value, count in items[:limit]]
+    buckets = []
+    value_counts = counts.get("value", {})
+    for index in sorted(index for index in value_counts if index is not None):
+        count = value_counts[index]
+        buckets.append({
+            "min": VALUE_BUCKET_BOUNDS[index - 1] if index > 0 else None,
+            "max": VALUE_BUCKET_BOUNDS[index] if index < len(VALUE_BUCKET_BOUNDS) else None,
+            "count": count,
+        })
+    result["value"] = buckets
+    return result
+
+def count_facets(tenders: List[Dict[str, Any]]) -> Dict[str, Dict[Any, int]]:
+    """Facet counts over in-memory tenders (MockMongoDB fallback), for format_facets."""
+    counts: Dict[str, Dict[Any, int]] = {field: {} for field in FACET_FIELDS + ("value",)}
+    for tender in tenders:
+        for field in FACET_FIELDS:
+            value = tender.get(field)
+            counts[field][value] = counts[field].get(value, 0) + 1
+        bucket = value_bucket(tender.get("value"))
+        counts["value"][bucket] = counts["value"].get(bucket, 0) + 1
+    return counts
+
+def build_mongo_facet_pipeline(filters: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """
+    Build a single-pass $facet aggregation counting every facet under the filters.
+
+    Args:
+        filters: Dictionary containing filter criteria
+        limit: Most values returned per text facet
+
+    Returns:
+        Aggregation pipeline producing one document of {facet: [{"_id", "count"}]}
+    """
+    facets: Dict[str, Any] = {
+        field: [
+            {"$match": {field: {"$type": "string"}}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": limit},
+        ]
+        for field in FACET_FIELDS
+    }
+    branches = [
+        {"case": {"$lt": ["$value", bound]}, "then": index}
+        for index, bound in enumerate(VALUE_BUCKET_BOUNDS)
+    ]
+    facets["value"] = [
+        {"$match": {"value": {"$type": "number"}}},
+        {"$group": {
+            "_id": {"$switch": {"branches": branches, "default": len(VALUE_BUCKET_BOUNDS)}},
+            "count": {"$sum": 1},
+        }},
+    ]
+    return [{"$match": build_mongo_filter(filters)}, {"$facet": facets}]
+
+def build_sql_facets(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    Build one GROUPING SETS query counting every facet under the filters.
+
+    Returns:
+        Tuple of (sql, params). Each row has a `facet` name, its `value`
+        (bucket index for "value") and `count`.
+    """
+    where, params = build_sql_where(filters)
+    sql = (
+        "SELECT CASE WHEN GROUPING(organization) = 0 THEN 'organization'"
+        " WHEN GROUPING(category) = 0 THEN 'category'"
+        " WHEN GROUPING(location) = 0 THEN 'location' ELSE 'value' END AS facet,"
+        " COALESCE(organization, category, location, value_bucket::text) AS value, COUNT(*) AS count"
+        " FROM (SELECT organization, category, location,"
+        " width_bucket(value, %s::double precision[]) AS value_bucket FROM tenders" + where + ") AS filtered"
+        " GROUP BY GROUPING SETS ((organization), (category), (location), (value_bucket))"
+    )
+    return sql, [list(VALUE_BUCKET_BOUNDS)] + params
+
+def build_sql_where(filters: Dict[str, Any], after: Optional[Tuple[datetime, str]] = None) -> Tuple[str, List[Any]]:
+    """
+    Build a parameterized SQL WHERE clause from search filters.
+
+    Args:
+        filters: Dictionary containing filter criteria
+        after: Optional (deadline, tender_id) key; only tenders sorting
+            after it are matched
+
+    Returns:
+        Tuple of (clause, params). The clause is empty when there are no
+        filters, otherwise it starts with " WHERE ".
+    """
+    conditions = []
+    params: List[Any] = []
+
+    for field in TEXT_FILTER_FIELDS:
+        if filters.get(field):
+            conditions.append(f"{field} ILIKE %s")
+            params.append(f"%{escape_like(filters[field])}%")
+
+    if filters.get("min_value") is not None:
+        conditions.append("value >= %s")
+        params.append(float(filters["min_value"]))
+    if filters.get("max_value") is not None:
+        conditions.append("value <= %s")
+        params.append(float(filters["max_value"]))
+
+    deadline_from = parse_deadline(filters.get("deadline_from"))
+    if deadline_from is not None:
+        conditions.append("deadline >= %s")
+        params.append(deadline_from)
+    deadline_to = parse_deadline(filters.get("deadline_to"))
+    if deadline_to is not None:
+        conditions.append("deadline <= %s")
+        params.append(deadline_to)
+
+    if after is not None:
+        conditions.append("(deadline, tender_id) > (%s, %s)")
+        params.extend(after)
+
+    if not conditions:
+        return "", params
+    return " WHERE " + " AND ".join(conditions), params
@@ -0,0 +1,133 @@
+"""
+Sorted secondary indexes for range filters on the in-memory tender store.
+
+MockCollection keeps one TenderRangeIndex next to its documents. Deadlines
+and values are held in sorted (key, row) lists, so a deadline_from /
+deadline_to or min_value / max_value filter is a pair of bisects returning a
+slice of row numbers. Slices of different fields are intersected and only
+the surviving rows are checked against the remaining (text) filters.
+
+Range matching follows the database query builders: bounds are inclusive,
+unparseable filter deadlines are ignored, and tenders without a parseable
+deadline or a numeric value never match a range on that field. Deadlines are
+keyed as UTC epoch microseconds (naive ones taken as UTC, like the tender
+frame), so naive and offset-aware values can share one index.
+"""
+import bisect
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from db.query import epoch_micros, parse_deadline
+
+RANGE_FILTERS = ("min_value", "max_value", "deadline_from", "deadline_to")
+
+# Batches larger than this are merged by re-sorting instead of insorting one by one
+MERGE_THRESHOLD = 64
+
+def _value_key(tender: Dict[str, Any]) -> Optional[float]:
+    value = tender.get("value")
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value):
+        return float(value)
+    return None
+
+def _epoch_key(value: Any) -> Optional[int]:
+    deadline = parse_deadline(value)
+    return epoch_micros(deadline) if deadline is not None else None
+
+def _deadline_key(tender: Dict[str, Any]) -> Optional[int]:
+    return _epoch_key(tender.get("deadline"))
+
+class SortedIndex:
+    """(key, row) pairs kept in key order."""
+
+    def __init__(self, key_of: Callable[[Dict[str, Any]], Any]):
+        self.key_of = key_of
+        self._entries: List[Tuple[Any, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_many(self, tenders: Iterable[Tuple[int, Dict[str, Any]]]):
+        """
+        Index tenders by row number.
+
+        Args:
+            tenders: (row, tender) pairs
+        """
+        entries = [(key, row) for row, tender in tenders for key in (self.key_of(tender),) if key is not None]
+        if len(entries) > MERGE_THRESHOLD:
+            # Timsort merges the two sorted runs in linear time
+            self._entries.extend(entries)
+            self._entries.sort()
+        else:
+            for entry in entries:
+                bisect.insort(self._entries, entry)
+
+    def clear(self):
+        self._entries = []
+
+    def range(self, lower: Any = None, upper: Any = None) -> List[int]:
+        """
+        Rows whose key lies within the inclusive bounds.
+
+        Args:
+            lower: Smallest key, or None for no lower bound
+            upper: Largest key, or None for no upper bound
+
+        Returns:
+            Row numbers in key order
+        """
+        start = bisect.bisect_left(self._entries, (lower,)) if lower is not None else 0
+        end = len(self._entries)
+        if upper is not None:
+            # (upper, inf) sorts after every (upper, row) pair
+            end = bisect.bisect_right(self._entries, (upper, math.inf))
+        return [row for _, row in self._entries[start:end]]
+
+class TenderRangeIndex:
+    """Deadline and value indexes over the rows of one collection."""
+
+    FILTERS = RANGE_FILTERS
+
+    def __init__(self):
+        self.deadline = SortedIndex(_deadline_key)
+        self.value = SortedIndex(_value_key)
+
+    def add_many(self, tenders: Iterable[Tuple[int, Dict[str, Any]]]):
+        """Index newly inserted tenders, given as (row, tender) pairs."""
+        tenders = list(tenders)
+        self.deadline.add_many(tenders)
+        self.value.add_many(tenders)
+
+    def clear(self):
+        self.deadline.clear()
+        self.value.clear()
+
+    def candidate_rows(self, filters: Dict[str, Any]) -> Optional[List[int]]:
+        """
+        Rows satisfying every range filter.
+
+        Args:
+            filters: Search filters (same keys as filter_tenders)
+
+        Returns:
+            Row numbers in ascending order, or None when no range filter applies
+        """
+        slices = []
+        min_value, max_value = filters.get("min_value"), filters.get("max_value")
+        if min_value is not None or max_value is not None:
+            slices.append(self.value.range(float(min_value) if min_value is not None else None,
+                                           float(max_value) if max_value is not None else None))
+        deadline_from = _epoch_key(filters.get("deadline_from"))
+        deadline_to = _epoch_key(filters.get("deadline_to"))
+        if deadline_from is not None or deadline_to is not None:
+            slices.append(self.deadline.range(deadline_from, deadline_to))
+        if not slices:
+            return None
+
+        # Start from the narrowest slice
+        slices.sort(key=len)
+        rows = set(slices[0])
+        for other in slices[1:]:
+            rows.intersection_update(other)
+        return sorted(rows)
@@ -0,0 +1,101 @@
+"""
+Trigram index for substring filters on the in-memory tender store.
+
+The organization, category and location filters are case-insensitive
+substring matches, which a sorted index cannot answer. TrigramIndex maps
+every three-character sequence of a field's distinct lowercased values to
+the values containing it. A needle's trigrams are intersected (rarest
+first) to a few candidate values, the candidates are checked with a real
+substring test, and the rows of the values that match are returned. Needles
+shorter than three characters are checked against every distinct value,
+which is still far fewer than the rows.
+
+PostgreSQL gets the same effect from pg_trgm GIN indexes (see
+db.indexes.ensure_indexes).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from db.query import TEXT_FILTER_FIELDS
+
+def trigrams(text: str) -> Set[str]:
+    """All three-character substrings of the text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class _FieldIndex:
+    """Distinct values of one field, their rows and trigram postings."""
+
+    def __init__(self):
+        self.value_ids: Dict[str, int] = {}
+        self.values: List[str] = []
+        self.rows: List[List[int]] = []
+        self.postings: Dict[str, Set[int]] = {}
+
+    def add(self, row: int, value: str):
+        value_id = self.value_ids.get(value)
+        if value_id is None:
+            value_id = self.value_ids[value] = len(self.values)
+            self.values.append(value)
+            self.rows.append([])
+            for gram in trigrams(value):
+                self.postings.setdefault(gram, set()).add(value_id)
+        self.rows[value_id].append(row)
+
+    def match(self, needle: str) -> List[int]:
+        grams = trigrams(needle)
+        if grams:
+            postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings[0] else set()
+        else:
+            candidates = range(len(self.values))
+        rows = []
+        for value_id in candidates:
+            if needle in self.values[value_id]:
+                rows.extend(self.rows[value_id])
+        rows.sort()
+        return rows
+
+class TrigramIndex:
+    """Trigram indexes over the text filter fields of one collection."""
+
+    FILTERS = TEXT_FILTER_FIELDS
+
+    def __init__(self):
+        self.clear()
+
+    def add_many(self, tenders: Iterable[Tuple[int, Dict[str, Any]]]):
+        """Index newly inserted tenders, given as (row, tender) pairs in row order."""
+        for row, tender in tenders:
+            for field in self.FILTERS:
+                self._fields[field].add(row, str(tender.get(field) or "").lower())
+
+    def clear(self):
+        self._fields = {field: _FieldIndex() for field in self.FILTERS}
+
+    def distinct_values(self, field: str) -> int:
+        """Number of distinct (lowercased) values of a field."""
+        return len(self._fields[field].values)
+
+    def candidate_rows(self, filters: Dict[str, Any]) -> Optional[List[int]]:
+        """
+        Rows matching every text filter.
+
+        Args:
+            filters: Search filters (same keys as filter_tenders)
+
+        Returns:
+            Row numbers in ascending order, or None when no text filter applies
+        """
+        result = None
+        for field in self.FILTERS:
+            needle = filters.get(field)
+            if not needle:
+                continue
+            rows = self._fields[field].match(str(needle).lower())
+            if result is None:
+                result = rows
+            else:
+                keep = set(rows)
+                result = [row for row in result if row in keep]
+            if not result:
+                break
+        return result
@@ -2,10 +2,10 @@
 Module for exporting tender data to JSON and Excel formats.
 """
 import json
-import pandas as pd
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 import os
+import tempfile
 
 def export_to_json(tenders: List[Dict], filename: Optional[str] = None) -> str:
     """
@@ -33,9 +33,17 @@ def export_to_json(tenders: List[Dict], filename: Optional[str] = None) -> str:
     
     filepath = os.path.join(exports_dir, filename)
     
-    # Write to JSON file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(tenders, f, indent=2, default=str)
+    # Write to a temporary file and swap it in, so concurrent exports of the
+    # same name never serve a half-written file
+    fd, temp_path = tempfile.mkstemp(dir=exports_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(tenders, f, indent=2, default=str)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
     
     return filepath
 
@@ -50,6 +58,9 @@ def export_to_excel(tenders: List[Dict], filename: Optional[str] = None) -> str:
     Returns:
         Path to the exported file
     """
+    # pandas takes most of this module's import time; only Excel needs it
+    import pandas as pd
+
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"tenders_{timestamp}.xlsx"
@@ -115,10 +126,14 @@ def export_tenders(tenders: List[Dict], formats: Optional[List[str]] = None) ->
     
     return exported_files
 
-def get_all_tenders_from_db() -> List[Dict]:
+def get_all_tenders_from_db(db: Any = None) -> List[Dict]:
     """
     Retrieve all tenders from the database.
-    This function connects directly to the database to fetch all tenders.
+    This function connects directly to the database to fetch all tenders
+    unless a database handle is passed in.
+    
+    Args:
+        db: Optional database handle (e.g. checked out from the shared pool)
     
     Returns:
         List of tender dictionaries
@@ -128,10 +143,11 @@ def get_all_tenders_from_db() -> List[Dict]:
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/..")
     
-    from db.connection import get_db, MockMongoDB
+    from db.connection import get_db, MockMongoDB, fetch_dicts
     
     try:
-        db = get_db()
+        if db is None:
+            db = get_db()
         if db is None:
             print("Failed to connect to database")
             return []
@@ -153,8 +169,7 @@ def get_all_tenders_from_db() -> List[Dict]:
             try:
                 with db.cursor() as cursor:
                     cursor.execute("SELECT * FROM tenders")
-                    columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                    tenders = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                    tenders = fetch_dicts(cursor)
             except Exception as e:
                 print(f"Error querying PostgreSQL database: {e}")
                 return []
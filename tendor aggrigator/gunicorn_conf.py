@@ -0,0 +1,115 @@
+"""
+Gunicorn configuration for running the Tender Aggregator API in production.
+
+Usage:
+    python run_production.py
+    # or: gunicorn -c gunicorn_conf.py api.server:app
+
+The app is imported once in the master (preload_app) and forked into
+WEB_CONCURRENCY uvicorn workers. Each worker runs the API lifespan (database
+pools, index check, cache warmup) before it accepts connections. Workers are
+recycled after MAX_REQUESTS requests or once their resident memory passes
+WORKER_MAX_MEMORY_MB; `kill -HUP <master pid>` restarts all workers gracefully.
+Workers merge their metrics through METRICS_MULTIPROC_DIR (a temporary
+directory unless set).
+"""
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+from typing import Optional
+
+# Run from the project root so `api.server` and the exports/ directory resolve
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+bind = os.getenv("BIND", f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8001')}")
+# Each worker holds its own search cache, tender frame and keyword index, so
+# memory scales with this; DELETE /admin/cache only clears the worker serving it
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app (and its heavy modules) once, shared copy-on-write by workers.
+# Database clients are opened per worker in the lifespan, after the fork.
+preload_app = True
+
+# Worker recycling; jitter keeps workers from restarting all at once
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "1000"))
+
+# Seconds a worker may be silent before it is killed, and the drain time on restart
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Resident memory cap per worker (0 disables) and how often it is checked
+WORKER_MAX_MEMORY_MB = int(os.getenv("WORKER_MAX_MEMORY_MB", "1024"))
+MEMORY_CHECK_INTERVAL = float(os.getenv("MEMORY_CHECK_INTERVAL", "10"))
+
+accesslog = os.getenv("ACCESS_LOG", "-")
+errorlog = "-"
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Current resident set size of this process in MB, from Linux /proc or,
+    elsewhere, the optional `psutil` package. None when neither is available;
+    peak RSS (getrusage) never shrinks, so it cannot drive recycling.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+def watch_memory(worker):
+    """Ask the worker to exit gracefully once it grows past the memory cap."""
+    while True:
+        time.sleep(MEMORY_CHECK_INTERVAL)
+        rss = current_rss_mb()
+        if rss is not None and rss > WORKER_MAX_MEMORY_MB:
+            worker.log.info("Worker %s using %.0f MB (cap %d MB); restarting", worker.pid, rss,
+                            WORKER_MAX_MEMORY_MB)
+            # Uvicorn finishes in-flight requests; the master starts a replacement
+            os.kill(worker.pid, signal.SIGTERM)
+            return
+
+def post_worker_init(worker):
+    from metrics import start_snapshot_writer
+    start_snapshot_writer()
+    if WORKER_MAX_MEMORY_MB > 0:
+        if current_rss_mb() is None:
+            worker.log.warning("Cannot read resident memory (no /proc, psutil not installed); "
+                               "WORKER_MAX_MEMORY_MB is not enforced")
+            return
+        threading.Thread(target=watch_memory, args=(worker,), name="memory-watchdog", daemon=True).start()
+
+def worker_exit(server, worker):
+    # Keep the final counts of a recycled worker in the merged /metrics
+    from metrics import REGISTRY, multiprocess_dir
+    if multiprocess_dir():
+        REGISTRY.write_snapshot(multiprocess_dir())
+
+def on_starting(server):
+    # Workers share metric snapshots here so /metrics reports all of them;
+    # snapshots of a previous run are dropped
+    directory = os.environ.setdefault(
+        "METRICS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), f"tender-aggregator-metrics-{os.getpid()}"))
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith((".json", ".tmp")):
+            os.remove(os.path.join(directory, name))
+
+    # Loaded before the fork so workers share the model's memory
+    if os.getenv("WARMUP_NLP", "0").lower() in ("1", "true", "yes"):
+        from nlp.extract import get_nlp
+        get_nlp()
+
+def when_ready(server):
+    server.log.info("Tender Aggregator API ready with %d workers on %s", workers, bind)
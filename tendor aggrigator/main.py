@@ -5,9 +5,9 @@ from agents.etenders import scrape_etenders
 from agents.gem import scrape_gem
 from nlp.extract import process_tenders
 from db.connection import get_db, MockMongoDB
+from db.generation import bump_generation
 from nlp.extract import Tender
 from typing import Any, Union
-import psycopg2
 
 def main():
     print("Starting Tender Aggregator...")
@@ -52,6 +52,8 @@ def main():
                 print(f"Stored {len(processed_tenders)} tenders in database")
             else:
                 print("No tenders to store")
+            version = bump_generation(db)
+            print(f"Dataset generation is now {version.generation}")
         elif hasattr(db, 'tenders') and db.tenders is not None:
             # Real MongoDB
             collection = db.tenders
@@ -63,6 +65,8 @@ def main():
                 print(f"Stored {len(processed_tenders)} tenders in database")
             else:
                 print("No tenders to store")
+            version = bump_generation(db)
+            print(f"Dataset generation is now {version.generation}")
         elif hasattr(db, 'cursor') and callable(getattr(db, 'cursor')):
             # PostgreSQL
             with db.cursor() as cursor:
@@ -85,10 +89,14 @@ def main():
                             tender.description,
                             tender.link
                         ))
-                    db.commit()
                     print(f"Stored {len(processed_tenders)} tenders in database")
                 else:
                     print("No tenders to store")
+                
+                # Bump the generation in the same transaction as the data
+                version = bump_generation(db)
+                db.commit()
+                print(f"Dataset generation is now {version.generation}")
         else:
             print("Unsupported database type. Data will not be stored.")
     except Exception as e:
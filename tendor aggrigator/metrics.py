@@ -0,0 +1,339 @@
+"""
+In-process metrics, rendered in the Prometheus text format (served by the API
+at /metrics).
+
+Counters, gauges and histograms are plain Python objects guarded by a lock,
+so recording a sample costs a dictionary lookup and a few additions. The
+module has no web dependencies, so the batch exporters record into it too.
+
+Values are per process. With several workers, set METRICS_MULTIPROC_DIR (the
+gunicorn config does): every worker then writes a snapshot of its values to
+that directory every METRICS_FLUSH_INTERVAL seconds, and rendering merges the
+snapshots, so any worker answers a scrape with totals for all of them.
+Counters and histograms of exited workers are kept so totals never go
+backwards; gauges only count live workers.
+"""
+import abc
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def dump(self) -> Dict[Tuple[str, ...], Any]:
+        """Copy of the current values by label values."""
+
+    @abc.abstractmethod
+    def combine(self, value: Any, other: Any) -> Any:
+        """Add up the values of one label set from two processes."""
+
+    @abc.abstractmethod
+    def format_samples(self, values: Dict[Tuple[str, ...], Any]) -> List[str]:
+        """Sample lines for the given values."""
+
+    def samples(self) -> List[str]:
+        return self.format_samples(self.dump())
+
+    def render(self, values: Optional[Dict[Tuple[str, ...], Any]] = None) -> List[str]:
+        if values is None:
+            values = self.dump()
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + \
+            self.format_samples(values)
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def dump(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def combine(self, value: float, other: float) -> float:
+        return value + other
+
+    def format_samples(self, values: Dict[Tuple[str, ...], float]) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the with-block (also across awaits)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels: str):
+        """Decorator form of time() for synchronous functions."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def dump(self) -> Dict[Tuple[str, ...], list]:
+        with self._lock:
+            return {key: [list(entry[0]), entry[1], entry[2]] for key, entry in self._values.items()}
+
+    def combine(self, value: list, other: list) -> list:
+        return [[a + b for a, b in zip(value[0], other[0])], value[1] + other[1], value[2] + other[2]]
+
+    def format_samples(self, values: Dict[Tuple[str, ...], list]) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def snapshot(self) -> Dict[str, List[list]]:
+        """Current values of every metric, as JSON-serializable [labels, value] pairs."""
+        return {metric.name: [[list(key), value] for key, value in metric.dump().items()]
+                for metric in self._metrics}
+
+    def merge(self, snapshots: Sequence[Tuple[Dict[str, List[list]], bool]]) -> Dict[str, Dict[Tuple[str, ...], Any]]:
+        """
+        Add up snapshots of several processes.
+
+        Args:
+            snapshots: (snapshot, process alive) pairs; gauges of exited
+                processes are skipped
+
+        Returns:
+            Merged values per metric name
+        """
+        merged: Dict[str, Dict[Tuple[str, ...], Any]] = {metric.name: {} for metric in self._metrics}
+        for metric in self._metrics:
+            values = merged[metric.name]
+            for snapshot, alive in snapshots:
+                if metric.kind == "gauge" and not alive:
+                    continue
+                for key, value in snapshot.get(metric.name, []):
+                    key = tuple(key)
+                    values[key] = metric.combine(values[key], value) if key in values else value
+        return merged
+
+    def render(self, values: Optional[Dict[str, Dict[Tuple[str, ...], Any]]] = None) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(values.get(metric.name, {}) if values is not None else None))
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, directory: str):
+        """Write this process's values to <directory>/<pid>.json."""
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, path)
+
+    def read_snapshots(self, directory: str) -> List[Tuple[Dict[str, List[list]], bool]]:
+        """All process snapshots in a directory, with whether their process is alive."""
+        snapshots = []
+        for name in os.listdir(directory):
+            pid, _, extension = name.partition(".")
+            if extension != "json" or not pid.isdigit():
+                continue
+            try:
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    snapshots.append((json.load(f), _pid_alive(int(pid))))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route, method and status code.", ("route", "method", "status")))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route, including streamed bodies.", ("route", "method")))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."))
+
+DB_CALL_DURATION = REGISTRY.register(Histogram(
+    "db_call_duration_seconds", "Database call latency by operation.", ("operation",)))
+DB_CALL_ERRORS = REGISTRY.register(Counter(
+    "db_call_errors_total", "Database calls that raised, by operation.", ("operation",)))
+
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "tender_stage_duration_seconds", "Time spent in request stages (filter, rank, encode).", ("stage",)))
+
+SEARCH_ROWS_SCANNED = REGISTRY.register(Counter(
+    "search_rows_scanned_total", "Rows examined by /tenders/search (read from the database, or every tender frame row)."))
+SEARCH_ROWS_RETURNED = REGISTRY.register(Counter(
+    "search_rows_returned_total", "Rows returned to clients by /tenders/search."))
+
+EXPORT_BYTES = REGISTRY.register(Counter(
+    "export_bytes_total", "Bytes written by BigDataProcessor exports.", ("format",)))
+EXPORT_RECORDS = REGISTRY.register(Counter(
+    "export_records_total", "Tenders written by BigDataProcessor exports.", ("format",)))
+
+ADMISSION_ACTIVE = REGISTRY.register(Gauge(
+    "admission_active_requests", "Requests admitted and running, by route class.", ("route_class",)))
+ADMISSION_QUEUED = REGISTRY.register(Gauge(
+    "admission_queued_requests", "Requests waiting for a slot, by route class.", ("route_class",)))
+ADMISSION_LIMIT = REGISTRY.register(Gauge(
+    "admission_concurrency_limit", "Configured concurrent requests per route class.", ("route_class",)))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "admission_rejected_total", "Requests turned away by admission control.", ("route_class", "reason")))
+ADMISSION_WAIT = REGISTRY.register(Histogram(
+    "admission_wait_seconds", "Time admitted requests spent queued, by route class.", ("route_class",)))
+
+@contextmanager
+def db_call(operation: str) -> Iterator[None]:
+    """Time a database call and count it as an error if it raises."""
+    try:
+        with DB_CALL_DURATION.time(operation=operation):
+            yield
+    except Exception:
+        DB_CALL_ERRORS.inc(operation=operation)
+        raise
+
+def multiprocess_dir() -> str:
+    """Shared snapshot directory, or "" when metrics are per process."""
+    return os.getenv("METRICS_MULTIPROC_DIR", "")
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format, merged across workers if configured."""
+    directory = multiprocess_dir()
+    if not directory:
+        return REGISTRY.render()
+    os.makedirs(directory, exist_ok=True)
+    REGISTRY.write_snapshot(directory)
+    return REGISTRY.render(REGISTRY.merge(REGISTRY.read_snapshots(directory)))
+
+def start_snapshot_writer(interval: float = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))):
+    """Write this process's snapshot every `interval` seconds in a daemon thread."""
+    directory = multiprocess_dir()
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                REGISTRY.write_snapshot(directory)
+            except OSError as e:
+                print(f"Error writing metrics snapshot: {e}")
+
+    threading.Thread(target=run, name="metrics-snapshot", daemon=True).start()
@@ -1,18 +1,54 @@
 """
 NLP processing for tender data extraction and normalization.
 """
+import os
 import re
 from datetime import datetime
-from typing import List, Dict
-import spacy
+from typing import List, Dict, Optional, Tuple
 from dateutil import parser
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Warning: spaCy model 'en_core_web_sm' not found. Please install it with: python -m spacy download en_core_web_sm")
-    nlp = None
+# Texts per nlp.pipe batch and worker processes used by process_tenders
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "256"))
+NLP_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))
+
+# Only named entities are used; these components are switched off
+NLP_UNUSED_COMPONENTS = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter")
+
+# spaCy model, loaded on first use by get_nlp(); False means loading failed
+_nlp = None
+
+def unused_components(nlp) -> List[str]:
+    """
+    Components to disable for entity extraction: NLP_UNUSED_COMPONENTS, plus
+    the shared tok2vec unless the entity recognizer listens to it (in
+    en_core_web_sm NER has its own embedding layer, so it does not).
+    """
+    unused = [name for name in NLP_UNUSED_COMPONENTS if name in nlp.pipe_names]
+    if "tok2vec" in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+        if "ner" not in listeners:
+            unused.append("tok2vec")
+    return unused
+
+def get_nlp():
+    """
+    Load the spaCy model on first use. Importing spaCy and loading the
+    model takes seconds, so it is deferred until text actually needs parsing.
+    Components other than the entity recognizer are disabled.
+    
+    Returns:
+        The spaCy pipeline, or None if spaCy or the model is not installed
+    """
+    global _nlp
+    if _nlp is None:
+        try:
+            import spacy
+            _nlp = spacy.load("en_core_web_sm")
+            _nlp.select_pipes(disable=unused_components(_nlp))
+        except (ImportError, OSError):
+            print("Warning: spaCy model 'en_core_web_sm' not found. Please install it with: python -m spacy download en_core_web_sm")
+            _nlp = False
+    return _nlp or None
 
 class Tender:
     def __init__(self, tender_id: str, organization: str, category: str, location: str, 
@@ -90,6 +126,7 @@ def extract_deadline(text: str) -> datetime:
 
 def extract_organization(text: str) -> str:
     """Extract organization using spaCy NER."""
+    nlp = get_nlp()
     if not nlp:
         return text[:100]  # Return first 100 characters as fallback
     
@@ -103,6 +140,7 @@ def extract_organization(text: str) -> str:
 
 def extract_location(text: str) -> str:
     """Extract location using spaCy NER."""
+    nlp = get_nlp()
     if not nlp:
         # Simple extraction of common Indian cities as fallback
         cities = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad", 
@@ -122,16 +160,82 @@ def extract_location(text: str) -> str:
     
     return "India"
 
-def process_tenders(raw_tenders: List[Dict]) -> List[Tender]:
-    """Process raw tender data and normalize it."""
+def entity_text(organization: str, location: str, description: str) -> Tuple[str, int, int]:
+    """
+    Join a tender's fields into the single text parsed for its entities.
+    
+    Returns:
+        (text, start of the location part, start of the description part)
+    """
+    location_start = len(organization) + 1
+    description_start = location_start + len(location) + 1
+    return f"{organization} {location} {description}", location_start, description_start
+
+def extract_entities(doc, location_start: int, description_start: int) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Pick the organization and location from one parsed entity_text.
+    
+    The organization is the first ORG outside the location part, and the
+    location the first GPE outside the organization part, which are the
+    candidates the separate extract_organization / extract_location calls
+    would see.
+    
+    Returns:
+        (organization, location); None where no entity was found
+    """
+    organization = location = None
+    for ent in doc.ents:
+        in_location = location_start <= ent.start_char < description_start
+        if organization is None and ent.label_ == "ORG" and not in_location:
+            organization = ent.text
+        elif location is None and ent.label_ == "GPE" and ent.start_char >= location_start:
+            location = ent.text
+        if organization is not None and location is not None:
+            break
+    return organization, location
+
+def process_tenders(raw_tenders: List[Dict], batch_size: Optional[int] = None,
+                    n_process: Optional[int] = None) -> List[Tender]:
+    """
+    Process raw tender data and normalize it.
+    
+    Each tender is parsed once; the texts go through spaCy in batches with
+    nlp.pipe, and both the organization (ORG) and the location (GPE) are
+    read from that one Doc.
+    
+    Args:
+        raw_tenders: Scraped tender dictionaries
+        batch_size: Texts per spaCy batch (default NLP_BATCH_SIZE)
+        n_process: spaCy worker processes (default NLP_N_PROCESS)
+        
+    Returns:
+        List of Tender objects
+    """
     processed_tenders = []
     
-    for tender in raw_tenders:
+    texts = [entity_text(tender.get("organization", ""), tender.get("location", ""), tender.get("description", ""))
+             for tender in raw_tenders]
+    nlp = get_nlp()
+    if nlp:
+        docs = nlp.pipe((text for text, _, _ in texts), batch_size=batch_size or NLP_BATCH_SIZE,
+                        n_process=n_process or NLP_N_PROCESS)
+    else:
+        docs = (None for _ in raw_tenders)
+    
+    for tender, (_, location_start, description_start), doc in zip(raw_tenders, texts, docs):
+        organization_text = tender.get("organization", "") + " " + tender.get("description", "")
+        location_text = tender.get("location", "") + " " + tender.get("description", "")
+        if doc is not None:
+            organization, location = extract_entities(doc, location_start, description_start)
+            organization = organization or organization_text[:100]
+            location = location or "India"
+        else:
+            organization = extract_organization(organization_text)
+            location = extract_location(location_text)
+        
         # Extract and normalize fields
         tender_id = extract_tender_id(tender.get("tender_id", "") + " " + tender.get("description", ""))
-        organization = extract_organization(tender.get("organization", "") + " " + tender.get("description", ""))
         category = tender.get("category", "General")
-        location = extract_location(tender.get("location", "") + " " + tender.get("description", ""))
         value = extract_value(tender.get("value", "0"))
         deadline = extract_deadline(tender.get("deadline", "2025-12-31"))
         description = tender.get("description", "")
@@ -9,6 +9,7 @@ from api.server import app
 import uvicorn
 
 if __name__ == "__main__":
+    # Development server with auto-reload; use run_production.py in production
     print("Starting Tender Aggregator Backend Server...")
     print("Server will be available at http://127.0.0.1:8001")
     print("Press CTRL+C to stop the server")
@@ -0,0 +1,37 @@
+"""
+Production entry point for the Tender Aggregator API.
+
+Runs several worker processes through gunicorn with the settings in
+gunicorn_conf.py (preloading, worker recycling, memory cap, graceful
+restarts). run_server.py remains the single-process development server with
+auto-reload.
+
+Gunicorn does not run on Windows; there the API is started with uvicorn's
+own multi-process mode, which recycles workers after MAX_REQUESTS but has no
+preloading or memory cap.
+"""
+import sys
+import os
+
+# Add the project root to the Python path
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PROJECT_ROOT)
+
+def main():
+    try:
+        from gunicorn.app.wsgiapp import run
+    except ImportError:
+        import uvicorn
+        import gunicorn_conf
+        host, _, port = gunicorn_conf.bind.rpartition(":")
+        print(f"gunicorn not available; starting {gunicorn_conf.workers} uvicorn workers on {gunicorn_conf.bind}")
+        uvicorn.run("api.server:app", host=host, port=int(port), workers=gunicorn_conf.workers,
+                    limit_max_requests=gunicorn_conf.max_requests,
+                    timeout_graceful_shutdown=gunicorn_conf.graceful_timeout)
+        return
+
+    sys.argv = ["gunicorn", "-c", os.path.join(PROJECT_ROOT, "gunicorn_conf.py"), "api.server:app"]
+    run()
+
+if __name__ == "__main__":
+    main()
@@ -6,4 +6,5 @@ from api.server import app
 import uvicorn
 
 if __name__ == "__main__":
+    # Development server with auto-reload; use run_production.py in production
     uvicorn.run("run_server:app", host="127.0.0.1", port=8001, reload=True)
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+Tests for the admin token check.
+"""
+import pytest
+from api.admin import admin_authorized
+
+def test_admin_authorized():
+    """Test that only the exact, configured token is accepted."""
+    assert admin_authorized("secret", "secret")
+    assert not admin_authorized("secrets", "secret")
+    assert not admin_authorized(None, "secret")
+    # No configured token locks the endpoints
+    assert not admin_authorized("", "")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
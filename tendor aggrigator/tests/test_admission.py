@@ -0,0 +1,57 @@
+"""
+Tests for per-route-class admission control.
+"""
+import asyncio
+import pytest
+from api.admission import AdmissionLimiter, AdmissionMiddleware, classify
+
+def test_classify_routes():
+    """Test that routes map to the expected classes."""
+    assert classify("GET", "/tenders/search") == "interactive"
+    assert classify("GET", "/tenders/T1") == "interactive"
+    assert classify("GET", "/tenders/facets") == "stats"
+    assert classify("GET", "/export/big") == "export"
+    assert classify("GET", "/export/jobs/abc/download") == "export"
+    assert classify("GET", "/export/jobs/abc") is None
+    assert classify("GET", "/metrics") is None
+
+def test_limiter_rejects_when_full():
+    """Test queue-full and queue-timeout rejections."""
+    async def scenario():
+        limiter = AdmissionLimiter("export", limit=1, queue_size=1, queue_timeout=0.05, retry_after=30)
+        assert await limiter.acquire() is None
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert await limiter.acquire() == "queue_full"
+        assert await waiter == "timeout"
+        limiter.release()
+        assert await limiter.acquire() is None
+        limiter.release()
+    asyncio.run(scenario())
+
+def test_middleware_sends_retry_after():
+    """Test that a rejected request gets 429 with Retry-After and never reaches the app."""
+    async def scenario():
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope["path"])
+
+        limiter = AdmissionLimiter("export", limit=0, queue_size=0, queue_timeout=0.01, retry_after=30)
+        middleware = AdmissionMiddleware(app, {"export": limiter})
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        await middleware({"type": "http", "method": "GET", "path": "/export/big"}, None, send)
+        await middleware({"type": "http", "method": "GET", "path": "/metrics"}, None, send)
+        return calls, messages
+
+    calls, messages = asyncio.run(scenario())
+    assert calls == ["/metrics"]
+    assert messages[0]["status"] == 429
+    assert (b"retry-after", b"30") in messages[0]["headers"]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
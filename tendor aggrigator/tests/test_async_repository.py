@@ -0,0 +1,84 @@
+"""
+Tests for the async data-access layer (MockMongoDB fallback).
+"""
+import asyncio
+import pytest
+from db.async_repository import MockAsyncRepository
+from db.connection import MockMongoDB
+
+@pytest.fixture
+def repository():
+    """Async repository over an in-memory database with sample tenders."""
+    db = MockMongoDB()
+    db.tenders.insert_many([
+        {"tender_id": "T1", "organization": "Ministry of Electronics", "category": "IT Services",
+         "location": "Delhi", "value": 100000.0, "deadline": "2025-10-15T00:00:00"},
+        {"tender_id": "T2", "organization": "Department of Roads", "category": "Construction",
+         "location": "Mumbai", "value": 500000.0, "deadline": "2025-09-30T00:00:00"},
+        {"tender_id": "T3", "organization": "Health Ministry", "category": "Medical Equipment",
+         "location": "Delhi", "value": 250000.0, "deadline": "2025-10-15T00:00:00"},
+    ])
+    return MockAsyncRepository(db)
+
+def test_search_with_filters(repository):
+    """Test that filters apply on the mock fallback."""
+    tenders = asyncio.run(repository.search({"location": "delhi"}))
+    assert sorted(t["tender_id"] for t in tenders) == ["T1", "T3"]
+
+def test_search_keyset_pages(repository):
+    """Test that pages follow the (deadline, tender_id) order."""
+    first = asyncio.run(repository.search({}, limit=2))
+    assert [t["tender_id"] for t in first] == ["T2", "T1"]
+    from db.query import keyset_key
+    second = asyncio.run(repository.search({}, limit=2, after=keyset_key(first[-1])))
+    assert [t["tender_id"] for t in second] == ["T3"]
+
+def test_get_and_iterate(repository):
+    """Test single lookups and cursor iteration."""
+    assert asyncio.run(repository.get("T2"))["location"] == "Mumbai"
+    assert asyncio.run(repository.get("missing")) is None
+
+    async def collect():
+        return [t["tender_id"] async for t in repository.iter_search({"min_value": 200000})]
+
+    assert sorted(asyncio.run(collect())) == ["T2", "T3"]
+
+def test_fields_projection(repository):
+    """Test that only the requested fields are returned."""
+    tenders = asyncio.run(repository.search({"location": "mumbai"}, fields=["tender_id", "value"]))
+    assert tenders == [{"tender_id": "T2", "value": 500000.0}]
+    assert asyncio.run(repository.get("T1", fields=["location"])) == {"location": "Delhi"}
+
+def test_get_many(repository):
+    """Test batch lookups by ID."""
+    tenders = asyncio.run(repository.get_many(["T3", "T9", "T1"], fields=["tender_id"]))
+    assert sorted(t["tender_id"] for t in tenders) == ["T1", "T3"]
+
+def test_facets(repository):
+    """Test facet counts under a filter."""
+    facets = asyncio.run(repository.facets({"location": "delhi"}, limit=10))
+    assert facets["location"] == [{"value": "Delhi", "count": 2}]
+    assert sum(bucket["count"] for bucket in facets["value"]) == 2
+
+def test_failed_connect_is_retried_after_backoff(monkeypatch):
+    """Test that requests fail fast for DB_RETRY_INTERVAL after a failed connect."""
+    from db import async_repository
+    attempts = []
+
+    async def unreachable():
+        attempts.append(1)
+        return None
+
+    monkeypatch.setattr(async_repository, "open_repository", unreachable)
+    monkeypatch.setattr(async_repository, "_repository", None)
+    monkeypatch.setattr(async_repository, "_retry_at", 0.0)
+    assert asyncio.run(async_repository.get_repository()) is None
+    assert asyncio.run(async_repository.get_repository()) is None
+    assert len(attempts) == 1
+
+    monkeypatch.setattr(async_repository, "_retry_at", 0.0)
+    assert asyncio.run(async_repository.get_repository()) is None
+    assert len(attempts) == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__])
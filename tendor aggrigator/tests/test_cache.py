@@ -0,0 +1,61 @@
+"""
+Tests for the search result cache.
+"""
+import pytest
+from api.cache import ResultCache, make_search_key
+
+def test_hit_and_miss():
+    """Test basic lookups and counters."""
+    cache = ResultCache(max_bytes=10_000, ttl=60)
+    assert cache.get("k", generation=1) is None
+    cache.put("k", [{"tender_id": "T1"}], generation=1)
+    assert cache.get("k", generation=1) == [{"tender_id": "T1"}]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_generation_change_invalidates():
+    """Test that a new ingest generation drops every entry."""
+    cache = ResultCache(max_bytes=10_000, ttl=60)
+    cache.put("k", ["old"], generation=1)
+    assert cache.get("k", generation=2) is None
+    assert cache.stats()["invalidations"] == 1
+    # Results computed from the previous generation are not stored
+    cache.put("k", ["stale"], generation=1)
+    assert cache.get("k", generation=2) is None
+
+def test_lru_eviction_by_bytes():
+    """Test that the least recently used entry is evicted past the byte cap."""
+    cache = ResultCache(max_bytes=30, ttl=60)
+    cache.put("a", "x" * 10, generation=1)
+    cache.put("b", "y" * 10, generation=1)
+    cache.get("a", generation=1)
+    cache.put("c", "z" * 10, generation=1)
+    assert cache.get("b", generation=1) is None
+    assert cache.get("a", generation=1) is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_explicit_size_for_encoded_bodies():
+    """Test that callers caching encoded bytes can pass the exact size."""
+    cache = ResultCache(max_bytes=100, ttl=60)
+    cache.put("k", (b"[]", None), generation=1, size=2)
+    assert cache.stats()["bytes"] == 2
+    cache.put("big", (b"x", None), generation=1, size=101)
+    assert cache.get("big", generation=1) is None
+
+def test_ttl_expiry():
+    """Test that expired entries are not served."""
+    cache = ResultCache(max_bytes=10_000, ttl=0)
+    cache.put("k", "v", generation=1)
+    assert cache.get("k", generation=1) is None
+    assert cache.stats()["expirations"] == 1
+
+def test_search_key_normalization():
+    """Test that equivalent searches share a key."""
+    first = make_search_key({"location": "Delhi", "min_value": 100}, "Medical  Devices")
+    second = make_search_key({"min_value": 100.0, "location": "delhi", "category": ""}, "medical devices")
+    assert first == second
+    assert make_search_key({"location": "Delhi"}, limit=10) != make_search_key({"location": "Delhi"}, limit=20)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,50 @@
+"""
+Tests for response compression and pre-compressed exports.
+"""
+import gzip
+import os
+import pytest
+from api import compression
+from api.compression import Encoder, choose_encoding, ensure_precompressed, remove_export
+
+def test_choose_encoding_honours_q_values(monkeypatch):
+    """Test Accept-Encoding negotiation."""
+    monkeypatch.setattr(compression, "available_encodings", lambda: ["br", "zstd", "gzip"])
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("") is None
+
+def test_gzip_encoder_streams():
+    """Test that flushed chunks form one valid gzip stream."""
+    encoder = Encoder("gzip", 6)
+    data = encoder.compress(b'{"tender_id": "T1"}\n', flush=True)
+    assert data
+    data += encoder.compress(b'{"tender_id": "T2"}\n') + encoder.finish()
+    assert gzip.decompress(data) == b'{"tender_id": "T1"}\n{"tender_id": "T2"}\n'
+
+def test_precompressed_once(tmp_path):
+    """Test that exports are compressed once and rebuilt only when newer."""
+    source = tmp_path / "export.json"
+    source.write_bytes(b"[" + b'{"value": 1},' * 1000 + b"{}]")
+    target = ensure_precompressed(str(source), "gzip")
+    assert target == str(source) + ".gz"
+    assert gzip.decompress(open(target, "rb").read()) == source.read_bytes()
+
+    first_mtime = os.path.getmtime(target)
+    assert ensure_precompressed(str(source), "gzip") == target
+    assert os.path.getmtime(target) == first_mtime
+
+def test_precompressed_atomic_and_removed(tmp_path):
+    """Test that no temp files are left behind and remove_export deletes every copy."""
+    source = tmp_path / "export.json"
+    source.write_bytes(b"[]" * 1000)
+    ensure_precompressed(str(source), "gzip")
+    assert sorted(os.listdir(tmp_path)) == ["export.json", "export.json.gz"]
+
+    remove_export(str(source))
+    assert os.listdir(tmp_path) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,57 @@
+"""
+Tests for ingest-generation tracking and conditional responses.
+"""
+import pytest
+from datetime import datetime, timezone
+from fastapi import Request
+from api.conditional import is_not_modified, validator_headers
+from db.connection import MockMongoDB
+from db.generation import DatasetVersion, bump_generation, get_generation
+
+def make_request(headers):
+    """Build a bare GET request with the given headers."""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/tenders",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope)
+
+@pytest.fixture
+def version():
+    return DatasetVersion(3, datetime(2025, 9, 12, 12, 0, 0, 500000, tzinfo=timezone.utc))
+
+def test_bump_generation_mock():
+    """Test that each write bumps the generation."""
+    db = MockMongoDB()
+    assert get_generation(db).generation == 0
+    bump_generation(db)
+    version = bump_generation(db)
+    assert version.generation == 2
+    assert get_generation(db) == version
+
+def test_validator_headers(version):
+    """Test ETag and Last-Modified headers."""
+    headers = validator_headers(version)
+    assert headers["ETag"] == 'W/"tenders-3"'
+    assert headers["Last-Modified"] == "Fri, 12 Sep 2025 12:00:00 GMT"
+
+def test_if_none_match(version):
+    """Test ETag revalidation."""
+    assert is_not_modified(make_request({"If-None-Match": '"tenders-3"'}), version)
+    assert is_not_modified(make_request({"If-None-Match": 'W/"tenders-1", W/"tenders-3"'}), version)
+    assert not is_not_modified(make_request({"If-None-Match": 'W/"tenders-2"'}), version)
+
+def test_if_modified_since(version):
+    """Test Last-Modified revalidation."""
+    assert is_not_modified(make_request({"If-Modified-Since": "Fri, 12 Sep 2025 12:00:00 GMT"}), version)
+    assert not is_not_modified(make_request({"If-Modified-Since": "Fri, 12 Sep 2025 11:59:59 GMT"}), version)
+    # If-None-Match takes precedence
+    assert not is_not_modified(make_request({
+        "If-None-Match": 'W/"tenders-2"',
+        "If-Modified-Since": "Fri, 12 Sep 2025 12:00:00 GMT",
+    }), version)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,64 @@
+"""
+Tests for background export jobs.
+"""
+import json
+import os
+import time
+import pytest
+from big_data import export_jobs
+from big_data.export_jobs import ExportJob, ExportJobLimitError, ExportJobManager
+
+def test_status_reports_progress_and_eta(tmp_path, monkeypatch):
+    """Test that a running job's status is read from its progress file."""
+    monkeypatch.setattr(export_jobs, "EXPORT_JOBS_DIR", str(tmp_path))
+    job = ExportJob(id="abc", format="json", batch_size=100, status="running")
+    (tmp_path / "abc.progress.json").write_text(json.dumps({
+        "records": 250, "bytes": 4096, "total": 1000, "started_at": time.time() - 10,
+    }))
+    status = job.to_dict()
+    assert status["records_processed"] == 250
+    assert status["bytes_written"] == 4096
+    assert status["percent"] == 25.0
+    assert 25 <= status["eta_seconds"] <= 35
+
+@pytest.fixture
+def jobs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_jobs, "EXPORT_JOBS_DIR", str(tmp_path))
+    return tmp_path
+
+def test_create_validates_format_and_limit(jobs_dir):
+    """Test that unknown formats and jobs beyond the cap are rejected."""
+    manager = ExportJobManager(max_jobs=0)
+    with pytest.raises(ValueError):
+        manager.create("csv", 1000)
+    with pytest.raises(ExportJobLimitError):
+        manager.create("json", 1000)
+    assert manager.list() == []
+
+def test_jobs_are_shared_through_job_files(jobs_dir):
+    """Test that any manager (API worker) sees, cancels and reaps jobs from the job files."""
+    running = ExportJob(id="run", format="json", batch_size=100, status="running", pid=os.getpid())
+    running.save()
+    orphaned = ExportJob(id="orphan", format="json", batch_size=100, status="running", pid=2 ** 22 + 1)
+    orphaned.save()
+
+    manager = ExportJobManager(max_jobs=2)
+    assert sorted(job.id for job in manager.list()) == ["orphan", "run"]
+    assert manager.get("orphan").status == "failed"
+    assert manager.cancel("run").status == "cancelling"
+    assert (jobs_dir / "run.cancel").exists()
+    assert ExportJobManager().get("run").status == "cancelling"
+
+def test_finished_jobs_are_purged(jobs_dir):
+    """Test that jobs past the TTL are removed with their files."""
+    output = jobs_dir / "export_job_old.json"
+    output.write_text("[]")
+    ExportJob(id="old", format="json", batch_size=100, status="completed", filepath=str(output),
+              finished_at=time.time() - 100).save()
+    manager = ExportJobManager(job_ttl=10)
+    assert manager.get("old") is None
+    assert not output.exists()
+    assert not (jobs_dir / "old.job.json").exists()
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,56 @@
+"""
+Tests for entity extraction from a single parse per tender.
+"""
+import pytest
+from types import SimpleNamespace
+
+pytest.importorskip("dateutil")
+
+from nlp.extract import entity_text, extract_entities, get_nlp, process_tenders, unused_components
+
+def make_doc(text, *entities):
+    """Doc-like object with the given (text, label) entities located in the text."""
+    ents = [SimpleNamespace(text=value, label_=label, start_char=text.index(value)) for value, label in entities]
+    return SimpleNamespace(ents=sorted(ents, key=lambda ent: ent.start_char))
+
+def test_entity_text_offsets():
+    """Test that the offsets point at the location and description parts."""
+    text, location_start, description_start = entity_text("Health Ministry", "Pune", "Supply of beds")
+    assert text[location_start:description_start - 1] == "Pune"
+    assert text[description_start:] == "Supply of beds"
+
+def test_entities_come_from_their_own_fields():
+    """Test that ORG skips the location part and GPE skips the organization part."""
+    text, location_start, description_start = entity_text("Delhi Jal Board", "Mumbai Suburban", "Works for BMC")
+    doc = make_doc(text, ("Delhi", "GPE"), ("Mumbai Suburban", "ORG"), ("BMC", "ORG"))
+    assert extract_entities(doc, location_start, description_start) == ("BMC", None)
+
+    doc = make_doc(text, ("Delhi Jal Board", "ORG"), ("Mumbai", "GPE"))
+    assert extract_entities(doc, location_start, description_start) == ("Delhi Jal Board", "Mumbai")
+
+def make_pipeline(tok2vec_listeners):
+    """Pipeline-like object whose shared tok2vec feeds the given components."""
+    pipes = {"tok2vec": SimpleNamespace(listening_components=tok2vec_listeners),
+             "tagger": None, "parser": None, "ner": None}
+    return SimpleNamespace(pipe_names=list(pipes), get_pipe=pipes.__getitem__)
+
+def test_tok2vec_disabled_unless_ner_listens():
+    """Test that the shared tok2vec only stays on when NER uses it."""
+    assert unused_components(make_pipeline(["tagger", "parser"])) == ["tagger", "parser", "tok2vec"]
+    assert unused_components(make_pipeline(["tagger", "parser", "ner"])) == ["tagger", "parser"]
+
+def test_process_tenders_single_pipe():
+    """Test batched processing end to end when the spaCy model is installed."""
+    if get_nlp() is None:
+        pytest.skip("spaCy model not installed")
+    tenders = process_tenders([
+        {"tender_id": "ET-2025-001", "organization": "Indian Railways", "location": "Chennai",
+         "description": "Supply of signalling equipment", "value": "₹1,000", "deadline": "31/12/2025"},
+    ] * 3, batch_size=2)
+    assert len(tenders) == 3
+    assert tenders[0].tender_id == "ET-2025-001"
+    assert tenders[0].value == 1000.0
+    assert "parser" not in get_nlp().pipe_names
+
+if __name__ == "__main__":
+    pytest.main([__file__])
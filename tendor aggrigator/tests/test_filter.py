@@ -2,7 +2,7 @@
 Tests for filter and ranking functionality.
 """
 import pytest
-from api.filter import filter_tenders, rank_tenders
+from api.filter import filter_tenders, rank_tenders, ranking_key, top_k
 from datetime import datetime, timedelta
 
 @pytest.fixture
@@ -71,6 +71,26 @@ def test_filter_by_value_range(sample_tenders):
     assert len(filtered) == 1
     assert filtered[0]["tender_id"] == "T3"
 
+def test_filter_by_deadline_window(sample_tenders):
+    """Test that both deadline bounds apply together and preserve input order."""
+    filters = {
+        "location": "delhi",
+        "deadline_from": (datetime.now() + timedelta(days=20)).isoformat(),
+        "deadline_to": (datetime.now() + timedelta(days=60)).isoformat(),
+    }
+    filtered = filter_tenders(sample_tenders, filters)
+    assert [t["tender_id"] for t in filtered] == ["T1", "T3"]
+
+def test_unparseable_tender_deadline_skips_deadline_filters(sample_tenders):
+    """Test that a bad deadline on a matching tender disables the deadline filters."""
+    sample_tenders[1]["deadline"] = "soon"
+    deadline_to = (datetime.now() + timedelta(days=20)).isoformat()
+    filtered = filter_tenders(sample_tenders, {"deadline_to": deadline_to})
+    assert len(filtered) == 3
+    # A tender excluded by another filter is never checked
+    filtered = filter_tenders(sample_tenders, {"location": "Delhi", "deadline_to": deadline_to})
+    assert filtered == []
+
 def test_ranking_by_deadline(sample_tenders):
     """Test ranking by deadline."""
     ranked = rank_tenders(sample_tenders)
@@ -83,5 +103,24 @@ def test_ranking_with_query(sample_tenders):
     # T3 should come first as it matches the query
     assert ranked[0]["tender_id"] == "T3"
 
+def test_ranking_matches_whole_words(sample_tenders):
+    """Test that keywords match whole words, not substrings."""
+    ranked = rank_tenders(sample_tenders, "oad")
+    # No tender contains the word "oad", so the order falls back to deadlines
+    assert [t["tender_id"] for t in ranked] == ["T2", "T1", "T3"]
+
+def test_ranking_with_limit_matches_full_sort(sample_tenders):
+    """Test that top-k ranking returns the head of the full ranking."""
+    for query in ("", "ministry", "medical delhi"):
+        full = rank_tenders(sample_tenders, query)
+        for limit in (1, 2, 5):
+            assert rank_tenders(sample_tenders, query, limit=limit) == full[:limit]
+
+def test_top_k_after_cursor(sample_tenders):
+    """Test that top_k resumes strictly after a keyset cursor."""
+    ranked = top_k(sample_tenders, ranking_key)
+    page = top_k(sample_tenders, ranking_key, limit=1, after=ranking_key(ranked[0]))
+    assert page == [ranked[1]]
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Tests for the columnar tender frame.
+"""
+import pytest
+from datetime import datetime
+
+pytest.importorskip("numpy")
+
+from api.frame import TenderFrame
+from db.query import keyset_key
+
+@pytest.fixture
+def frame():
+    """Frame over a few tenders, one without a parseable deadline or value."""
+    return TenderFrame([
+        {"tender_id": "T1", "organization": "Ministry of Electronics", "category": "IT Services",
+         "location": "Delhi", "value": 100000.0, "deadline": "2025-03-01T00:00:00"},
+        {"tender_id": "T2", "organization": "Department of Roads", "category": "Construction",
+         "location": "Mumbai", "value": 500000.0, "deadline": "2025-02-01T00:00:00"},
+        {"tender_id": "T3", "organization": "Health Ministry", "category": "Medical Equipment",
+         "location": "Delhi", "value": 250000.0, "deadline": datetime(2025, 4, 1)},
+        {"tender_id": "T4", "organization": "Health Ministry", "category": "Medical Equipment",
+         "location": "Chennai", "value": None, "deadline": "soon"},
+    ])
+
+def ids(tenders):
+    return [t["tender_id"] for t in tenders]
+
+def test_rows_in_keyset_order(frame):
+    """Test that results come back in (deadline, tender_id) order."""
+    assert ids(frame.search({})) == ["T4", "T2", "T1", "T3"]
+
+def test_substring_filters_use_dictionary(frame):
+    """Test case-insensitive substring matching through the dictionary codes."""
+    assert frame.dictionaries["organization"] == ["Department of Roads", "Health Ministry", "Ministry of Electronics"]
+    assert ids(frame.search({"organization": "ministry", "location": "DEL"})) == ["T1", "T3"]
+
+def test_range_filters(frame):
+    """Test inclusive value and deadline bounds; missing values and deadlines never match."""
+    assert ids(frame.search({"min_value": 100000, "max_value": 250000})) == ["T1", "T3"]
+    assert ids(frame.search({"deadline_from": "2025-02-01", "deadline_to": "2025-03-01"})) == ["T2", "T1"]
+    # Unparseable filter deadlines are ignored
+    assert len(frame.search({"deadline_from": "not a date"})) == 4
+
+def test_keyset_pagination(frame):
+    """Test limit and after like repository.search."""
+    first = frame.search({}, limit=2)
+    rest = frame.search({}, after=keyset_key(first[-1]), fields=["tender_id"])
+    assert ids(first) == ["T4", "T2"]
+    assert rest == [{"tender_id": "T1"}, {"tender_id": "T3"}]
+
+def test_stats(frame):
+    """Test statistics computed from the columns."""
+    stats = frame.stats()
+    assert stats["total_records"] == 4
+    assert stats["unique_organizations"] == 3
+    assert stats["unique_locations"] == 3
+    assert stats["max_tender_value"] == 500000.0
+    assert stats["min_tender_value"] == 100000.0
+    assert stats["fields"][0] == "tender_id"
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,53 @@
+"""
+Tests that heavy dependencies are loaded lazily. Wall-clock import budgets are
+checked by benchmarks/bench_importtime.py, not here.
+"""
+import os
+import subprocess
+import sys
+import pytest
+from benchmarks.bench_importtime import PROJECT_ROOT, budget_ms, parse_importtime
+
+HEAVY_MODULES = ("pymongo", "psycopg2", "pandas", "spacy")
+
+def imported_heavy_modules(module: str):
+    """Import a module in a fresh interpreter and list the heavy modules it loaded."""
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        pytest.skip(f"{module} cannot be imported here: {result.stderr.strip().splitlines()[-1]}")
+    return [name for name in result.stdout.strip().split(",") if name]
+
+@pytest.mark.parametrize("module", ["db.connection", "db.pool", "nlp.extract",
+                                    "export.data_exporter", "big_data.data_processor"])
+def test_heavy_dependencies_are_not_imported_eagerly(module):
+    """Test that importing a module does not load database drivers, pandas or spaCy."""
+    assert imported_heavy_modules(module) == []
+
+@pytest.mark.parametrize("module", ["big_data.data_processor", "big_data.export_jobs", "process_big_data"])
+def test_batch_layer_does_not_import_api(module):
+    """Test that the batch / CLI modules do not depend on the web API package."""
+    code = f"import sys, {module}; print('api' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        pytest.skip(f"{module} cannot be imported here: {result.stderr.strip().splitlines()[-1]}")
+    assert result.stdout.strip() == "False"
+
+def test_parse_importtime():
+    """Test parsing of `-X importtime` lines, including nesting depth."""
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |     _io\n"
+              "import time:        80 |        300 |   encodings\n"
+              "import time:       500 |       1900 | json\n")
+    rows = parse_importtime(stderr)
+    assert rows[0] == ("_io", 120, 120, 2)
+    assert rows[-1] == ("json", 500, 1900, 0)
+
+def test_budget_override(monkeypatch):
+    """Test that budgets can be overridden per entry point."""
+    monkeypatch.setenv("IMPORT_BUDGET_API_SERVER_MS", "42")
+    assert budget_ms("api.server") == 42
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,76 @@
+"""
+Tests for the in-process metrics.
+"""
+import pytest
+from metrics import Counter, Gauge, Histogram, MetricsRegistry, db_call, DB_CALL_ERRORS
+
+def test_counter_and_gauge_render():
+    """Test the Prometheus text format for labelled counters and gauges."""
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("requests_total", "Requests.", ("route",)))
+    gauge = registry.register(Gauge("in_flight", "In flight."))
+    counter.inc(route="/tenders")
+    counter.inc(2, route='/a"b')
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/tenders"} 1' in text
+    assert 'requests_total{route="/a\\"b"} 2' in text
+    assert "in_flight 1" in text
+
+def test_histogram_buckets_are_cumulative():
+    """Test bucket placement, sum and count."""
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/x")
+    histogram.observe(0.1, route="/x")
+    histogram.observe(3.0, route="/x")
+    lines = histogram.samples()
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/x",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/x"} 3' in lines
+    assert histogram.count(route="/x") == 3
+
+def test_labels_must_match():
+    """Test that a missing label is rejected instead of silently mislabelled."""
+    counter = Counter("c_total", "C.", ("route",))
+    with pytest.raises(ValueError):
+        counter.inc()
+
+def test_db_call_counts_errors():
+    """Test that failing database calls are counted."""
+    before = DB_CALL_ERRORS.value(operation="test")
+    with pytest.raises(RuntimeError):
+        with db_call("test"):
+            raise RuntimeError("boom")
+    assert DB_CALL_ERRORS.value(operation="test") == before + 1
+
+def test_snapshots_merge_across_processes(tmp_path):
+    """Test that worker snapshots add up, skipping gauges of exited workers."""
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("requests_total", "Requests.", ("route",)))
+    gauge = registry.register(Gauge("in_flight", "In flight."))
+    histogram = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1,)))
+    counter.inc(2, route="/tenders")
+    gauge.inc(3)
+    histogram.observe(0.05)
+    registry.write_snapshot(str(tmp_path))
+    snapshot = registry.read_snapshots(str(tmp_path))[0][0]
+
+    merged = registry.merge([(snapshot, True), (snapshot, False)])
+    text = registry.render(merged)
+    assert 'requests_total{route="/tenders"} 4' in text
+    assert "in_flight 3" in text
+    assert 'latency_seconds_bucket{le="0.1"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+def test_metric_base_is_abstract():
+    """Test that metric types must implement the sample methods."""
+    from metrics import _Metric
+    with pytest.raises(TypeError):
+        _Metric("m", "M.")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
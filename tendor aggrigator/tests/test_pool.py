@@ -0,0 +1,47 @@
+"""
+Tests for the shared database connection manager.
+"""
+import pytest
+from db.connection import MockMongoDB
+from db.pool import ConnectionManager, PoolWaitStats
+
+@pytest.fixture
+def mock_manager(monkeypatch):
+    """Connection manager that falls back to MockMongoDB quickly."""
+    monkeypatch.setenv("MONGO_URI", "mongodb://127.0.0.1:1/tender_aggregator")
+    monkeypatch.setenv("MONGO_TIMEOUT_MS", "100")
+    manager = ConnectionManager(db_type="mongodb", min_size=0, max_size=2)
+    yield manager
+    manager.close()
+
+def test_connection_is_shared(mock_manager):
+    """Test that every checkout returns the same process-wide handle."""
+    with mock_manager.connection() as first:
+        first.tenders.insert_many([{"tender_id": "T1"}])
+    with mock_manager.connection() as second:
+        assert isinstance(second, MockMongoDB)
+        assert second is first
+        assert second.tenders.find_one({"tender_id": "T1"}) is not None
+
+def test_stats_report_backend(mock_manager):
+    """Test that pool statistics are reported."""
+    mock_manager.open()
+    stats = mock_manager.stats()
+    assert stats["backend"] == "mock"
+    assert stats["max_size"] == 2
+    assert "avg_wait_seconds" in stats
+
+def test_wait_stats_accounting():
+    """Test checkout wait accounting."""
+    stats = PoolWaitStats()
+    stats.record_checkout(0.5)
+    stats.record_checkout(0.1)
+    stats.record_checkin()
+    result = stats.to_dict()
+    assert result["checkouts"] == 2
+    assert result["in_use"] == 1
+    assert result["max_wait_seconds"] == 0.5
+    assert result["avg_wait_seconds"] == pytest.approx(0.3)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
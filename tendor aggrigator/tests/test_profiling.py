@@ -0,0 +1,38 @@
+"""
+Tests for the opt-in request profiler.
+"""
+import time
+import pytest
+from api.profiling import StackSampler, profile_requested
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+def test_sampler_collects_folded_stacks():
+    """Test that busy frames show up in collapsed-stack output."""
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    busy_loop(0.1)
+    sampler.stop()
+    folded = sampler.folded()
+    assert sampler.samples > 0
+    assert "busy_loop (test_profiling.py:" in folded
+    line = folded.splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert int(count) > 0
+    assert ";" in stack
+
+def test_profile_requested_checks_token():
+    """Test the header and query flag against the admin token."""
+    assert profile_requested({"headers": [(b"x-profile", b"secret")]}, "secret")
+    assert profile_requested({"headers": [], "query_string": b"profile=secret"}, "secret")
+    assert not profile_requested({"headers": [(b"x-profile", b"wrong")]}, "secret")
+    assert not profile_requested({"headers": [(b"x-profile", b"")]}, "")
+    # Non-ASCII input is rejected, not a TypeError
+    assert not profile_requested({"headers": [(b"x-profile", b"\xe9")]}, "secret")
+    assert not profile_requested({"headers": [], "query_string": b"profile=%C3%A9"}, "secret")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
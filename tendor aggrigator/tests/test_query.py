@@ -0,0 +1,130 @@
+"""
+Tests for database query builders.
+"""
+import pytest
+from datetime import datetime
+from db.query import (
+    build_mongo_filter, build_mongo_projection, build_sql_columns, build_sql_where,
+    build_sql_facets, count_facets, decode_cursor, encode_cursor, format_facets, order_by_ids,
+    parse_fields, project_tender, value_bucket
+)
+
+def test_mongo_filter_text_and_ranges():
+    """Test that filters become a Mongo filter document."""
+    query = build_mongo_filter({
+        "organization": "Ministry (IT)",
+        "min_value": 1000,
+        "max_value": 5000,
+        "deadline_from": "2025-01-01",
+    })
+    assert query["organization"] == {"$regex": r"Ministry\ \(IT\)", "$options": "i"}
+    assert query["value"] == {"$gte": 1000.0, "$lte": 5000.0}
+    assert query["deadline"] == {"$gte": datetime(2025, 1, 1)}
+
+def test_mongo_filter_skips_invalid_deadline():
+    """Test that an invalid deadline is ignored like filter_tenders does."""
+    assert build_mongo_filter({"deadline_to": "not-a-date"}) == {}
+
+def test_sql_where_is_parameterized():
+    """Test that filters become a parameterized WHERE clause."""
+    where, params = build_sql_where({
+        "category": "100%_IT",
+        "location": "Delhi",
+        "max_value": 300000,
+        "deadline_to": "2025-12-31",
+    })
+    assert where == " WHERE category ILIKE %s AND location ILIKE %s AND value <= %s AND deadline <= %s"
+    assert params == ["%100\\%\\_IT%", "%Delhi%", 300000.0, datetime(2025, 12, 31)]
+
+def test_sql_where_empty():
+    """Test that no filters produce no WHERE clause."""
+    assert build_sql_where({}) == ("", [])
+
+def test_cursor_round_trip():
+    """Test that cursors decode back to the encoded sort key."""
+    key = (datetime(2025, 10, 15, 12, 30), "ET-2025-001")
+    cursor = encode_cursor(key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == key
+    assert decode_cursor(encode_cursor((-2,) + key), length=3) == (-2,) + key
+
+def test_cursor_rejects_garbage():
+    """Test that malformed or mismatched cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor((datetime(2025, 1, 1), "T1")), length=3)
+
+@pytest.mark.parametrize("key", [(1, 2), ("T1", datetime(2025, 1, 1)), ("2025-01-01", "T1"),
+                                 ("high", datetime(2025, 1, 1), "T1"), (True, datetime(2025, 1, 1), "T1")])
+def test_cursor_rejects_wrong_types(key):
+    """Test that well-formed cursors with values of the wrong type raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(key), length=len(key))
+
+def test_keyset_conditions():
+    """Test that the after key becomes a range condition."""
+    after = (datetime(2025, 1, 1), "T1")
+    query = build_mongo_filter({"location": "Delhi"}, after)
+    assert query["$and"][1] == {"$or": [
+        {"deadline": {"$gt": after[0]}},
+        {"deadline": after[0], "tender_id": {"$gt": "T1"}},
+    ]}
+    where, params = build_sql_where({}, after)
+    assert where == " WHERE (deadline, tender_id) > (%s, %s)"
+    assert params == [after[0], "T1"]
+
+def test_parse_fields():
+    """Test parsing and validation of the fields parameter."""
+    assert parse_fields(None) is None
+    assert parse_fields("") is None
+    assert parse_fields("tender_id, deadline,tender_id") == ["tender_id", "deadline"]
+    with pytest.raises(ValueError):
+        parse_fields("tender_id,password")
+
+def test_projection_builders():
+    """Test that projections map to Mongo, SQL and in-memory forms."""
+    fields = ["tender_id", "value"]
+    assert build_mongo_projection(fields) == {"tender_id": 1, "value": 1, "_id": 0}
+    assert build_mongo_projection(None) is None
+    assert build_sql_columns(fields) == "tender_id, value"
+    assert build_sql_columns(None) == "*"
+    tender = {"tender_id": "T1", "value": 10.0, "description": "long text"}
+    assert project_tender(tender, fields) == {"tender_id": "T1", "value": 10.0}
+    assert project_tender(tender, None) is tender
+
+def test_order_by_ids_keeps_request_order():
+    """Test that batch results follow the requested order and report missing IDs."""
+    rows = [{"tender_id": "T3"}, {"tender_id": "T1"}]
+    found, missing = order_by_ids(rows, ["T1", "T2", "T3", "T1"])
+    assert [t["tender_id"] for t in found] == ["T1", "T3"]
+    assert missing == ["T2"]
+
+def test_facet_counts_and_value_buckets():
+    """Test facet counting, ordering and value ranges."""
+    assert value_bucket(50000) == 0
+    assert value_bucket(100000) == 1
+    assert value_bucket(20000000) == 5
+    assert value_bucket(None) is None
+    tenders = [
+        {"organization": "A", "category": "IT", "location": "Delhi", "value": 50000.0},
+        {"organization": "B", "category": "IT", "location": "Delhi", "value": 750000.0},
+        {"organization": "B", "category": "Roads", "location": "Pune", "value": None},
+    ]
+    facets = format_facets(count_facets(tenders), limit=1)
+    assert facets["organization"] == [{"value": "B", "count": 2}]
+    assert facets["location"] == [{"value": "Delhi", "count": 2}]
+    assert facets["value"] == [
+        {"min": None, "max": 100000, "count": 1},
+        {"min": 500000, "max": 1000000, "count": 1},
+    ]
+
+def test_sql_facets_single_query():
+    """Test that every facet is counted by one grouped query."""
+    sql, params = build_sql_facets({"location": "delhi"})
+    assert "GROUPING SETS" in sql
+    assert "location ILIKE %s" in sql
+    assert params == [[100000, 500000, 1000000, 5000000, 10000000], "%delhi%"]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,68 @@
+"""
+Tests for the sorted deadline / value indexes of the in-memory store.
+"""
+import pytest
+from datetime import datetime
+from api.filter import filter_tenders
+from db.connection import MockCollection
+from db.range_index import MERGE_THRESHOLD
+
+def make_tender(tender_id, value, deadline, location="Delhi"):
+    return {"tender_id": tender_id, "organization": "Ministry", "category": "Works",
+            "location": location, "value": value, "deadline": deadline}
+
+@pytest.fixture
+def collection():
+    collection = MockCollection()
+    collection.insert_many([
+        make_tender("T1", 100000.0, "2025-03-01T00:00:00"),
+        make_tender("T2", 500000.0, "2025-02-01T00:00:00", location="Mumbai"),
+        make_tender("T3", 250000.0, datetime(2025, 4, 1)),
+        make_tender("T4", None, "soon"),
+    ])
+    return collection
+
+def ids(tenders):
+    return [t["tender_id"] for t in tenders]
+
+def test_range_slices_are_intersected(collection):
+    """Test that value and deadline ranges combine, keeping insertion order."""
+    index = collection.range_index
+    assert index.candidate_rows({"location": "Delhi"}) is None
+    assert index.candidate_rows({"min_value": 100000, "max_value": 250000}) == [0, 2]
+    assert index.candidate_rows({"min_value": 200000, "deadline_to": "2025-03-31"}) == [1]
+
+def test_filter_with_index_matches_scan(collection):
+    """Test that indexed filtering agrees with the scan on well-formed tenders."""
+    filters = {"location": "del", "min_value": 100000, "deadline_from": "2025-02-15"}
+    tenders = collection.find()
+    assert ids(filter_tenders(tenders, filters, indexes=collection.indexes)) == ["T1", "T3"]
+    assert ids(filter_tenders(tenders[:3], filters)) == ["T1", "T3"]
+
+def test_unparseable_deadline_never_matches_range(collection):
+    """Test that tenders without a parseable deadline or a value are outside every range."""
+    tenders = filter_tenders(collection.find(), {"deadline_to": "2030-01-01"}, indexes=[collection.range_index])
+    assert ids(tenders) == ["T1", "T2", "T3"]
+    # An unparseable filter deadline is ignored
+    assert len(filter_tenders(collection.find(), {"deadline_to": "never"}, indexes=[collection.range_index])) == 4
+
+def test_naive_and_aware_deadlines_share_the_index(collection):
+    """Test that mixing naive and offset-aware deadlines neither fails nor misorders."""
+    collection.insert_many([make_tender("T5", 1.0, "2025-02-15T00:00:00+05:30")])
+    collection.insert_many([make_tender(f"B{i}", 1.0, "2025-02-20T00:00:00+00:00")
+                            for i in range(MERGE_THRESHOLD + 1)])
+    rows = collection.range_index.candidate_rows({"deadline_from": "2025-02-14T18:30:00",
+                                                  "deadline_to": "2025-02-15T00:00:00+05:30"})
+    assert rows == [4]
+
+def test_index_maintained_on_insert_and_delete(collection):
+    """Test incremental maintenance for small and bulk inserts, and reset on delete."""
+    collection.insert_many([make_tender("T5", 300000.0, "2025-01-01")])
+    assert collection.range_index.candidate_rows({"max_value": 300000, "min_value": 300000}) == [4]
+    collection.insert_many([make_tender(f"B{i}", float(i), "2026-01-01") for i in range(MERGE_THRESHOLD + 1)])
+    assert collection.range_index.candidate_rows({"max_value": 1.0}) == [5, 6]
+    collection.delete_many({})
+    assert collection.range_index.candidate_rows({"min_value": 0}) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
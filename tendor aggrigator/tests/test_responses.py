@@ -0,0 +1,42 @@
+"""
+Tests for API response helpers.
+"""
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from api.responses import TenderJSONResponse, dumps, ndjson_lines
+
+def test_ndjson_one_tender_per_line():
+    """Test that each tender is serialized on its own line."""
+    tenders = [
+        {"tender_id": "T1", "deadline": datetime(2025, 10, 15)},
+        {"tender_id": "T2", "deadline": "2025-11-20T00:00:00"},
+    ]
+    lines = list(ndjson_lines(iter(tenders)))
+    assert len(lines) == 2
+    assert all(line.endswith(b"\n") for line in lines)
+    assert json.loads(lines[0]) == {"tender_id": "T1", "deadline": "2025-10-15T00:00:00"}
+    assert json.loads(lines[1])["tender_id"] == "T2"
+
+def test_dumps_handles_database_types():
+    """Test that datetimes, ObjectId-like values and Decimals encode without preprocessing."""
+    class FakeObjectId:
+        def __str__(self):
+            return "65a1f0c2e4b0a1b2c3d4e5f6"
+
+    tender = {"_id": FakeObjectId(), "deadline": datetime(2025, 10, 15, 9, 30), "value": Decimal("1250.50")}
+    assert json.loads(dumps(tender)) == {
+        "_id": "65a1f0c2e4b0a1b2c3d4e5f6",
+        "deadline": "2025-10-15T09:30:00",
+        "value": 1250.5,
+    }
+
+def test_response_body_is_compact_json():
+    """Test that the response class renders with orjson."""
+    response = TenderJSONResponse([{"tender_id": "T1", "deadline": datetime(2025, 1, 1)}])
+    assert response.body == b'[{"tender_id":"T1","deadline":"2025-01-01T00:00:00"}]'
+    assert response.media_type == "application/json"
+
+if __name__ == "__main__":
+    pytest.main([__file__])
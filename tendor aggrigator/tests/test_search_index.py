@@ -0,0 +1,74 @@
+"""
+Tests for the BM25 keyword search index.
+"""
+import pytest
+from api.search_index import InvertedIndex, tokenize
+
+def make_tender(tender_id, description, organization="Ministry", category="Services", location="Delhi"):
+    return {"tender_id": tender_id, "organization": organization, "category": category,
+            "location": location, "description": description}
+
+def test_tokenize_whole_words():
+    """Test that tokens are lowercase words without punctuation."""
+    assert tokenize("Rail-track, TRAIL & 2025") == ["rail", "track", "trail", "2025"]
+
+def test_matches_whole_words_only():
+    """Test that "rail" does not match "trail"."""
+    index = InvertedIndex.build([
+        make_tender("T1", "Hiking trail maintenance"),
+        make_tender("T2", "Rail track renewal"),
+    ])
+    assert set(index.scores("rail")) == {"T2"}
+
+def test_rarer_terms_score_higher():
+    """Test that BM25 weights rare terms above common ones."""
+    index = InvertedIndex.build([
+        make_tender("T1", "road construction"),
+        make_tender("T2", "road repair"),
+        make_tender("T3", "bridge construction"),
+        make_tender("T4", "road bridge"),
+    ])
+    scores = index.scores("road repair")
+    assert max(scores, key=scores.get) == "T2"
+    assert "T3" not in scores
+
+def test_sync_is_incremental():
+    """Test that sync re-indexes only changed tenders and drops removed ones."""
+    index = InvertedIndex()
+    assert index.sync([make_tender("T1", "medical devices"), make_tender("T2", "software")], generation=1) == (2, 0)
+    added, removed = index.sync([make_tender("T1", "medical devices"), make_tender("T3", "rail signalling")],
+                                generation=2)
+    assert (added, removed) == (1, 1)
+    assert index.generation == 2
+    assert "T2" not in index
+    assert set(index.scores("software rail")) == {"T3"}
+
+def test_re_adding_replaces_postings():
+    """Test that adding a tender again replaces its earlier text."""
+    index = InvertedIndex()
+    index.add(make_tender("T1", "medical devices"))
+    index.add(make_tender("T1", "office furniture"))
+    assert index.scores("medical") == {}
+    assert index.stats()["documents"] == 1
+
+def test_failed_sync_backs_off(monkeypatch):
+    """Test that a failed sync keeps the stale index and is not retried at once."""
+    import asyncio
+    from api import search_index
+    from db import async_repository
+    attempts = []
+
+    async def unreachable():
+        attempts.append(1)
+        return None
+
+    monkeypatch.setattr(async_repository, "get_repository", unreachable)
+    monkeypatch.setattr(search_index, "_retry_at", 0.0)
+    stale_generation = search_index.search_index.generation
+    for _ in range(3):
+        index = asyncio.run(search_index.current_search_index(-1))
+    assert index.generation == stale_generation
+    assert len(attempts) == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
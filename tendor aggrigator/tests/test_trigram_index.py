@@ -0,0 +1,77 @@
+"""
+Tests for trigram-backed substring filtering.
+"""
+import pytest
+from api.filter import filter_tenders
+from db.connection import MockCollection
+from db.indexes import ensure_trigram_indexes
+from db.trigram_index import TrigramIndex
+
+TENDERS = [
+    {"tender_id": "T1", "organization": "Ministry of Railways", "category": "Works", "location": "New Delhi"},
+    {"tender_id": "T2", "organization": "Trail Authority", "category": "Works", "location": "Delhi"},
+    {"tender_id": "T3", "organization": "Ministry of Health", "category": "Medical", "location": "Mumbai"},
+    {"tender_id": "T4", "organization": None, "category": "Medical", "location": "Delhi"},
+]
+
+@pytest.fixture
+def index():
+    index = TrigramIndex()
+    index.add_many(enumerate(TENDERS))
+    return index
+
+def test_substring_matches_are_verified(index):
+    """Test that trigram candidates are checked with a real substring test."""
+    assert index.candidate_rows({"organization": "RAIL"}) == [0, 1]
+    assert index.candidate_rows({"organization": "ministry of r"}) == [0]
+    assert index.candidate_rows({"organization": "lia"}) == []
+
+def test_short_needles_and_intersection(index):
+    """Test needles under three characters and several text filters at once."""
+    assert index.candidate_rows({"location": "de", "category": "works"}) == [0, 1]
+    assert index.candidate_rows({"category": ""}) is None
+    assert index.distinct_values("location") == 3
+
+def test_indexed_filter_matches_scan():
+    """Test that the indexed path returns what the scan returns."""
+    collection = MockCollection()
+    collection.insert_many([dict(t, organization=t["organization"] or "") for t in TENDERS])
+    for filters in ({"organization": "ministry"}, {"location": "delhi", "category": "med"}, {"location": "xyz"}):
+        assert filter_tenders(collection.find(), filters, indexes=collection.indexes) == \
+            filter_tenders(collection.find(), filters)
+
+class RecordingConnection:
+    """Stand-in for a psycopg2 connection that records executed SQL."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                connection.statements.append(sql)
+
+        return Cursor()
+
+    def commit(self):
+        self.commits += 1
+
+def test_postgres_trigram_indexes():
+    """Test that each text filter column gets a pg_trgm GIN index."""
+    db = RecordingConnection()
+    ensure_trigram_indexes(db)
+    assert db.statements[0] == "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    assert "ON tenders USING GIN (organization gin_trgm_ops)" in db.statements[1]
+    assert len(db.statements) == 4 and db.commits == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
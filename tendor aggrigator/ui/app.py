@@ -6,6 +6,7 @@ import requests
 import pandas as pd
 from datetime import datetime, date
 import io
+import time
 
 # API base URL - assuming the FastAPI server is running on localhost:8001
 API_BASE_URL = "http://localhost:8001"
@@ -47,7 +48,9 @@ def show_home_page():
     
     # Display some statistics
     try:
-        response = requests.get(f"{API_BASE_URL}/tenders")
+        # Select key columns to display; only these are fetched from the API
+        display_columns = ["tender_id", "organization", "category", "location", "value", "deadline"]
+        response = requests.get(f"{API_BASE_URL}/tenders", params={"fields": ",".join(display_columns)})
         if response.status_code == 200:
             tenders = response.json()
             st.subheader(f"Total Tenders in Database: {len(tenders)}")
@@ -56,8 +59,6 @@ def show_home_page():
             if tenders:
                 st.subheader("Recent Tenders")
                 df = pd.DataFrame(tenders)
-                # Select key columns to display
-                display_columns = ["tender_id", "organization", "category", "location", "value", "deadline"]
                 df_display = df[display_columns].head(10)
                 st.dataframe(df_display)
         else:
@@ -67,20 +68,70 @@ def show_home_page():
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
 
+@st.cache_data(ttl=60)
+def get_facets(organization: str = "", category: str = "", location: str = ""):
+    """Fetch facet counts for the current selection (None if the API is unavailable)."""
+    params = {k: v for k, v in {"organization": organization, "category": category, "location": location}.items() if v}
+    try:
+        response = requests.get(f"{API_BASE_URL}/tenders/facets", params=params)
+    except requests.exceptions.RequestException:
+        return None
+    return response.json() if response.status_code == 200 else None
+
+# Selectbox entry that switches a facet to free-text (substring) matching
+OTHER_OPTION = "__other__"
+
+def facet_value(key: str) -> str:
+    """Current filter value of a facet: the selected value or the typed text."""
+    # Without facets only the text input exists
+    value = st.session_state.get(key, OTHER_OPTION)
+    if value == OTHER_OPTION:
+        return st.session_state.get(f"{key}_text", "")
+    return value
+
+def facet_select(label: str, key: str, facets):
+    """
+    Drop-down of facet values with counts, plus "Other…" for any text (matched
+    as a substring, like the API). Falls back to free text without facets.
+    """
+    if not facets:
+        return st.text_input(label, key=f"{key}_text")
+    counts = {item["value"]: item["count"] for item in facets[key]}
+    options = [""] + list(counts)
+    current = st.session_state.get(key, "")
+    if current and current != OTHER_OPTION and current not in counts:
+        options.append(current)
+    options.append(OTHER_OPTION)
+    
+    def format_option(value):
+        if not value:
+            return "Any"
+        if value == OTHER_OPTION:
+            return "Other…"
+        return f"{value} ({counts.get(value, 0)})"
+    
+    selected = st.selectbox(label, options, key=key, format_func=format_option)
+    if selected == OTHER_OPTION:
+        return st.text_input(f"{label} contains", key=f"{key}_text")
+    return selected
+
 def show_search_page():
     st.header("Search Tenders")
     
     # Search filters
     st.subheader("Filter Options")
     
+    # Options narrow down with the current selection
+    facets = get_facets(facet_value("organization"), facet_value("category"), facet_value("location"))
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        organization = st.text_input("Organization")
-        location = st.text_input("Location")
+        organization = facet_select("Organization", "organization", facets)
+        location = facet_select("Location", "location", facets)
         
     with col2:
-        category = st.text_input("Category")
+        category = facet_select("Category", "category", facets)
         min_value = st.number_input("Minimum Value", min_value=0, value=0)
         
     with col3:
@@ -265,6 +316,43 @@ def show_export_page():
     
     st.info("Note: Export functionality requires the FastAPI server to be running.")
 
+def run_export_job(format: str, batch_size: int):
+    """
+    Start a background export job, show its progress and return the finished file.
+    
+    Returns:
+        File content, or None if the job failed (the error is shown)
+    """
+    response = requests.post(f"{API_BASE_URL}/export/jobs", params={"format": format, "batch_size": batch_size})
+    if response.status_code == 429:
+        st.warning("Too many exports are running. Please try again in a moment.")
+        return None
+    if response.status_code != 202:
+        st.error(f"Error starting export: {response.status_code}")
+        return None
+    job = response.json()
+    
+    progress_bar = st.progress(0.0)
+    status_text = st.empty()
+    while job["status"] in ("queued", "running", "cancelling"):
+        time.sleep(1)
+        job = requests.get(f"{API_BASE_URL}/export/jobs/{job['id']}").json()
+        if job.get("percent") is not None:
+            progress_bar.progress(min(job["percent"], 100.0) / 100.0)
+        eta = f", about {job['eta_seconds']:.0f}s left" if job.get("eta_seconds") is not None else ""
+        status_text.text(f"{job['status'].capitalize()}: {job['records_processed']} records{eta}")
+    
+    if job["status"] != "completed":
+        st.error(f"Export {job['status']}: {job.get('error') or ''}")
+        return None
+    progress_bar.progress(1.0)
+    status_text.text(f"Completed: {job['records_processed']} records")
+    download = requests.get(f"{API_BASE_URL}/export/jobs/{job['id']}/download")
+    if download.status_code != 200:
+        st.error(f"Error downloading export: {download.status_code}")
+        return None
+    return download.content
+
 def show_big_data_page():
     st.header("Big Data Processing")
     st.markdown("""
@@ -310,19 +398,16 @@ def show_big_data_page():
         st.subheader("Export to JSON (Large Dataset)")
         if st.button("Export Large Dataset to JSON"):
             try:
-                with st.spinner("Processing large dataset... This may take a while."):
-                    response = requests.get(f"{API_BASE_URL}/export/big?format=json&batch_size={batch_size}")
-                    if response.status_code == 200:
-                        # Create download button for JSON
-                        st.download_button(
-                            label="Download Large JSON File",
-                            data=response.content,
-                            file_name=f"large_tenders_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                            mime="application/json"
-                        )
-                        st.success("Large JSON export successful! Click the download button to save the file.")
-                    else:
-                        st.error(f"Error exporting large dataset to JSON: {response.status_code}")
+                content = run_export_job("json", batch_size)
+                if content is not None:
+                    # Create download button for JSON
+                    st.download_button(
+                        label="Download Large JSON File",
+                        data=content,
+                        file_name=f"large_tenders_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                        mime="application/json"
+                    )
+                    st.success("Large JSON export successful! Click the download button to save the file.")
             except requests.exceptions.ConnectionError:
                 st.error("Could not connect to the API. Please make sure the FastAPI server is running on port 8001.")
             except Exception as e:
@@ -332,19 +417,16 @@ def show_big_data_page():
         st.subheader("Export to Excel (Large Dataset)")
         if st.button("Export Large Dataset to Excel"):
             try:
-                with st.spinner("Processing large dataset... This may take a while."):
-                    response = requests.get(f"{API_BASE_URL}/export/big?format=excel&batch_size={batch_size}")
-                    if response.status_code == 200:
-                        # Create download button for Excel
-                        st.download_button(
-                            label="Download Large Excel File",
-                            data=response.content,
-                            file_name=f"large_tenders_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
-                        st.success("Large Excel export successful! Click the download button to save the file.")
-                    else:
-                        st.error(f"Error exporting large dataset to Excel: {response.status_code}")
+                content = run_export_job("excel", batch_size)
+                if content is not None:
+                    # Create download button for Excel
+                    st.download_button(
+                        label="Download Large Excel File",
+                        data=content,
+                        file_name=f"large_tenders_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                    st.success("Large Excel export successful! Click the download button to save the file.")
             except requests.exceptions.ConnectionError:
                 st.error("Could not connect to the API. Please make sure the FastAPI server is running on port 8001.")
             except Exception as e: